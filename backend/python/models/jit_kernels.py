@@ -0,0 +1,95 @@
+"""
+Lazily compiled numba kernels for the quick models
+==================================================
+
+Scoring kernels are written in the subset of Python numba compiles and
+declared with @kernel(...) (same options as numba.njit). They run as plain
+Python until compile_kernels() is called for their module, which imports
+numba and swaps in compiled versions (loaded from numba's on-disk cache
+after the first run). A one-shot CLI prediction therefore never pays for
+importing numba; batch paths and long-running servers compile once.
+"""
+
+import os
+import sys
+import types
+
+# numba.prange in compiled kernels; a plain range when they run as Python
+prange = range
+
+# compile_kernels() result for every module it has been called for, by __name__
+_compiled_modules = {}
+
+
+class Kernel:
+    """Scoring function that runs its compiled version once compile_kernels() has been called"""
+    
+    __slots__ = ('py_func', 'options', 'impl')
+    
+    def __init__(self, py_func, options):
+        self.py_func = py_func
+        self.options = options
+        self.impl = py_func
+    
+    def __call__(self, *args):
+        return self.impl(*args)
+
+
+def kernel(**options):
+    """Declare a scoring kernel; options are passed to numba.njit on compilation"""
+    def decorate(func):
+        return Kernel(func, options)
+    return decorate
+
+
+def compile_kernels(namespace):
+    """
+    Compile every @kernel function of a module with numba
+    
+    Kernels call each other through their module globals, so each one is
+    compiled against a copy of the namespace in which kernel names refer to
+    the compiled dispatchers (and prange to numba.prange). Calling this
+    again is cheap.
+    
+    numba names its cache files after the source file only, so entries
+    written while a model runs as a script (__main__) cannot be loaded
+    under a package import and vice versa. Script runs therefore cache
+    into a "cli" subdirectory of their own, as long as numba has not been
+    imported yet.
+    
+    Args:
+        namespace: globals() of the module declaring the kernels
+    
+    Returns:
+        False when numba is not installed (kernels keep running as Python)
+    """
+    module_name = namespace['__name__']
+    if module_name in _compiled_modules:
+        return _compiled_modules[module_name]
+    
+    if module_name == '__main__' and 'numba' not in sys.modules:
+        cache_root = os.environ.get('NUMBA_CACHE_DIR') or os.path.join(
+            os.path.dirname(os.path.abspath(namespace['__file__'])), '__pycache__')
+        os.environ['NUMBA_CACHE_DIR'] = os.path.join(cache_root, 'cli')
+    
+    try:
+        import numba
+    except ImportError:
+        _compiled_modules[module_name] = False
+        return False
+    
+    kernels = {name: value for name, value in namespace.items() if isinstance(value, Kernel)}
+    kernel_globals = dict(namespace, prange=numba.prange)
+    for name, declared in kernels.items():
+        py_func = declared.py_func
+        func = types.FunctionType(py_func.__code__, kernel_globals, py_func.__name__,
+                                  py_func.__defaults__, py_func.__closure__)
+        func.__qualname__ = py_func.__qualname__
+        func.__doc__ = py_func.__doc__
+        kernel_globals[name] = numba.njit(**declared.options)(func)
+    
+    # Swap in only once every dispatcher exists: they compile on first call
+    for name, declared in kernels.items():
+        declared.impl = kernel_globals[name]
+    _compiled_modules[module_name] = True
+    return True
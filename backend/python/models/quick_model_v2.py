@@ -21,7 +21,13 @@ import sys
 import json
 import os
 import argparse
+import hashlib
+import importlib.util
+import math
 import pickle
+import stat
+import time
+from collections import OrderedDict
 import numpy as np
 from datetime import datetime
 from pathlib import Path
@@ -30,14 +36,290 @@ from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+# LightGBM / scikit-learn are imported lazily on the train and load paths
+# (see QuickModelV2._ml_libs); only check that they are installed here
+HAS_ML_LIBS = all(importlib.util.find_spec(m) is not None for m in ('lightgbm', 'sklearn'))
+if not HAS_ML_LIBS:
+    print("Warning: ML libraries not installed. Install with: pip install lightgbm scikit-learn", file=sys.stderr)
+
 try:
-    import lightgbm as lgb
-    from sklearn.preprocessing import StandardScaler
-    from sklearn.model_selection import train_test_split
-    HAS_ML_LIBS = True
+    from .jit_kernels import kernel, compile_kernels, prange
 except ImportError:
-    HAS_ML_LIBS = False
-    print("Warning: ML libraries not installed. Install with: pip install lightgbm scikit-learn", file=sys.stderr)
+    # Run as a script: the models directory is on sys.path
+    from jit_kernels import kernel, compile_kernels, prange
+
+
+# Correction warnings: HIGH severity above these RSI / Bollinger z-score
+# levels; volume ratio that counts as a spike (plain module globals, so the
+# compiled kernels read them as constants)
+_SEVERITY_RSI_HIGH = 85.0
+_SEVERITY_ZSCORE_HIGH = 2.5
+_VOLUME_SPIKE_RATIO = 2.0
+
+# Last formatted timestamp: [epoch second, ISO string]
+_ts_cache = [0, '']
+
+
+def _timestamp():
+    """ISO timestamp at second resolution, reformatted at most once per second"""
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache[0] = now
+        _ts_cache[1] = datetime.fromtimestamp(now).isoformat()
+    return _ts_cache[1]
+
+
+def _copy_result(result, **fields):
+    """
+    Copy of a cached prediction dict that the caller may modify freely
+    
+    correction_warning (with the lists and dicts it holds) and top_reasons
+    are copied as well; the other values are immutable.
+    """
+    result = dict(result, **fields)
+    warning = result.get('correction_warning')
+    if warning is not None:
+        result['correction_warning'] = {
+            key: value.copy() if isinstance(value, (list, dict)) else value
+            for key, value in warning.items()
+        }
+    reasons = result.get('top_reasons')
+    if reasons is not None:
+        result['top_reasons'] = list(reasons)
+    return result
+
+
+def _as_float(value, default):
+    """float(value), or default for None and other non-numeric values"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _round_column(column, ndigits):
+    """
+    Round a float64 column to a list of Python floats, exactly like round()
+    
+    np.round scales, rounds and unscales, which can land on the other side
+    of a decimal tie than Python's correctly rounded round(); the few
+    values close to a tie are re-rounded with round() itself.
+    """
+    values = np.round(column, ndigits).tolist()
+    scaled = column * 10.0 ** ndigits
+    for i in np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6).tolist():
+        values[i] = round(float(column[i]), ndigits)
+    return values
+
+
+# ---------------------------------------------------------------------------
+# Scoring kernels (compiled with numba on first batch use, see jit_kernels)
+# ---------------------------------------------------------------------------
+
+@kernel(cache=True)
+def _sigmoid_scalar(x):
+    """Sigmoid of a single float, clipped to avoid overflow"""
+    x = min(max(x, -500.0), 500.0)
+    return 1.0 / (1.0 + math.exp(-x))
+
+
+@kernel(cache=True)
+def _rebound_score(price_change_1d, price_change_3d, price_change_7d,
+                   news_sentiment, rsi, volume_ratio):
+    """Rebound strength from -1 to +1 (see QuickModelV2._detect_rebound_pattern)"""
+    score = 0.0
+    
+    # Pattern 1: Strong positive news after recent decline (PRIMARY REBOUND SIGNAL)
+    if news_sentiment > 0.3 and price_change_7d < 0:
+        # Stock was down but has positive news - this alone is a strong rebound signal
+        strength = min(abs(price_change_7d) / 15, 0.6)  # More decline = stronger rebound potential
+        score += 0.5 + strength  # Increased base score
+        
+        # Additional boost if already showing recovery
+        if price_change_1d > 0 or price_change_3d > 0:
+            score += 0.2  # Extra boost for confirmed recovery
+    
+    # Pattern 2: V-shape recovery (was down 7d but up recent days)
+    if price_change_7d < -3 and price_change_3d > 1 and price_change_1d > 0:
+        # Clear V-shape
+        recovery_strength = (price_change_1d + price_change_3d) / 2
+        score += min(max(recovery_strength / 10, 0.0), 0.4)
+    
+    # Pattern 3: Oversold RSI with positive momentum and news
+    if rsi < 40 and news_sentiment > 0.2:
+        if price_change_1d > 0.5:
+            # Oversold bouncing with positive news
+            score += 0.3
+    
+    # Pattern 4: Significant positive 1-day change with positive news (key rebound signal)
+    if price_change_1d > 2 and news_sentiment > 0.2:
+        # Strong bounce with positive news - likely rebound
+        score += 0.5
+    
+    # Pattern 5: Recovery from oversold with volume
+    if rsi < 35 and volume_ratio > 1.3 and price_change_1d > 0:
+        # Oversold, high volume, positive day - strong rebound signal
+        score += 0.35
+    
+    return min(max(score, -1.0), 1.0)
+
+
+@kernel(cache=True)
+def _fallback_score(price_change_1d, price_change_3d, price_change_7d,
+                    news_sentiment, rsi, volume_ratio, macd_hist):
+    """Rule-based score from -1 to +1 (see QuickModelV2._fallback_prediction)"""
+    score = 0.0
+    
+    # CRITICAL: Detect rebound pattern (most important)
+    rebound_score = _rebound_score(price_change_1d, price_change_3d, price_change_7d,
+                                   news_sentiment, rsi, volume_ratio)
+    if rebound_score != 0:
+        # Rebound patterns get highest priority
+        score += rebound_score * 0.6
+    
+    # News sentiment (increased weight for rebounds)
+    if abs(news_sentiment) > 0:
+        # If news is positive and we have rebound, amplify it
+        if rebound_score > 0 and news_sentiment > 0:
+            score += min(max(news_sentiment * 0.5, 0.0), 0.5)  # Increased from 0.2
+        else:
+            score += min(max(news_sentiment * 0.3, -0.3), 0.3)  # Increased from 0.2
+    
+    # RSI contribution (adjusted for rebounds)
+    if rsi > 70:
+        # Don't penalize as much if there's strong positive news/rebound
+        if news_sentiment > 0.3 or rebound_score > 0.3:
+            score -= 0.1  # Reduced from 0.3
+        else:
+            score -= 0.25
+    elif rsi < 30:
+        score += 0.3
+    
+    # MACD contribution (reduced weight)
+    score += min(max(macd_hist / 10, -0.2), 0.2)  # Reduced from 0.3
+    
+    # Price momentum (short-term prioritized, recent momentum is more important)
+    score += min(max(price_change_1d / 50, -0.2), 0.2)
+    score += min(max(price_change_3d / 150, -0.15), 0.15)
+    
+    return min(max(score, -1.0), 1.0)
+
+
+@kernel(cache=True)
+def _correction_checks(price_change_7d, rsi, bb_pct, bb_width, bb_middle, close,
+                       volume_ratio, pct_threshold, rsi_threshold, bb_zscore_threshold):
+    """
+    Numeric part of the correction checks
+    
+    Returns (rsi_confidence, bb_confidence, volume_confidence, z_score);
+    a confidence of -1.0 means the check did not fire.
+    """
+    rsi_confidence = -1.0
+    bb_confidence = -1.0
+    volume_confidence = -1.0
+    z_score = 0.0
+    
+    # Check 1: Price surge + overbought RSI
+    if price_change_7d > pct_threshold and rsi > rsi_threshold:
+        rsi_confidence = min(0.9, 0.5 + (rsi - 70) / 50)
+    
+    # Check 2: Bollinger z-score
+    if bb_pct > 1.0 and bb_width > 0:
+        z_score = (close - bb_middle) / (bb_width / 2)
+        if z_score > bb_zscore_threshold:
+            bb_confidence = min(0.85, z_score / 3.0)
+    
+    # Check 3: Volume spike with price spike
+    if volume_ratio > _VOLUME_SPIKE_RATIO and price_change_7d > pct_threshold:
+        volume_confidence = 0.65
+    
+    return rsi_confidence, bb_confidence, volume_confidence, z_score
+
+
+@kernel(cache=True, parallel=True)
+def _score_columns(price_change_1d, price_change_3d, price_change_7d, news_sentiment,
+                   rsi, volume_ratio, macd_hist, bb_pct, bb_width, bb_middle, close,
+                   pct_threshold, rsi_threshold, bb_zscore_threshold,
+                   out_fallback, out_rebound, out_checks):
+    """
+    Batch head: fallback score, rebound score and correction checks for
+    every row, written into preallocated output arrays in one pass
+    
+    out_checks is (N, 4), one _correction_checks result per row.
+    """
+    for i in prange(price_change_1d.shape[0]):
+        out_fallback[i] = _fallback_score(
+            price_change_1d[i], price_change_3d[i], price_change_7d[i],
+            news_sentiment[i], rsi[i], volume_ratio[i], macd_hist[i]
+        )
+        out_rebound[i] = _rebound_score(
+            price_change_1d[i], price_change_3d[i], price_change_7d[i],
+            news_sentiment[i], rsi[i], volume_ratio[i]
+        )
+        checks = _correction_checks(
+            price_change_7d[i], rsi[i], bb_pct[i], bb_width[i], bb_middle[i], close[i],
+            volume_ratio[i], pct_threshold, rsi_threshold, bb_zscore_threshold
+        )
+        for j in range(4):
+            out_checks[i, j] = checks[j]
+
+
+@kernel(cache=True)
+def _expected_move(final_score, atr, cal_keys, cal_vals):
+    """Unrounded expected % move (see QuickModelV2._calculate_expected_move)"""
+    # Base move from score magnitude, on the calibration curve
+    base_move = np.interp(abs(final_score), cal_keys, cal_vals)
+    
+    # Volatility adjustment
+    volatility_factor = 1 + (atr / 10.0) if atr > 0 else 1.0
+    
+    # Apply direction
+    direction = 1.0 if final_score > 0 else -1.0 if final_score < 0 else 0.0
+    return base_move * volatility_factor * direction
+
+
+@kernel(cache=True)
+def _ensemble(base_score, rebound_boost, asian_score, atr, asian_max, cal_keys, cal_vals):
+    """
+    Scoring tail for one row: rebound boost, Asian ensemble, sigmoid and
+    expected move
+    
+    Returns (boosted base score, Asian impact, final score, probability,
+    unrounded expected move).
+    """
+    # CRITICAL: Strong rebound detected - apply boost to base score
+    if rebound_boost > 0.3:
+        base_score = min(max(base_score + rebound_boost * 0.4, -1.0), 1.0)
+    
+    # Ensemble scoring
+    impact = min(abs(asian_score) * asian_max, asian_max)
+    score = (1 - impact) * base_score + impact * asian_score  # sign(x) * |x| == x
+    
+    return (base_score, impact, score, _sigmoid_scalar(score * 5),
+            _expected_move(score, atr, cal_keys, cal_vals))
+
+
+@kernel(cache=True, parallel=True)
+def _finalize(base_score, rebound_boost, asian_score, atr, asian_max, cal_keys, cal_vals,
+              out_base, out_impact, out_score, out_prob, out_move, out_label):
+    """
+    Fused batch tail: _ensemble over every row, written into preallocated
+    output arrays in one pass
+    
+    Labels are int8 (1 = BULLISH, 0 = BEARISH).
+    """
+    for i in prange(base_score.shape[0]):
+        base, impact, score, prob, move = _ensemble(
+            base_score[i], rebound_boost[i], asian_score[i], atr[i],
+            asian_max, cal_keys, cal_vals
+        )
+        out_base[i] = base
+        out_impact[i] = impact
+        out_score[i] = score
+        out_prob[i] = prob
+        out_move[i] = move
+        out_label[i] = 1 if score > 0 else 0
+
 
 
 class QuickModelV2:
@@ -45,20 +327,87 @@ class QuickModelV2:
     Quick Model V2 - Enhanced prediction model with Asian market signals
     """
     
+    __slots__ = (
+        'base_model', 'scaler', 'model_path',
+        'asian_influence_max', 'asian_influence_scale', 'pred_early_stop_margin',
+        'gpu_min_batch', 'n_estimators', 'num_leaves', 'max_depth',
+        '_correction_pct_threshold', '_correction_rsi_threshold', '_correction_bb_zscore',
+        'base_features', 'asian_features', 'all_features',
+        '_compiled', '_fil', '_scaler_stats', '_mu', '_inv_scale',
+        '_feat_names', '_feat_defaults', '_feat_index', '_buf', '_row', '_batch_buf',
+        'predict_cache_size', '_predict_cache'
+    )
+    
+    # Expected-move calibration curve: |final_score| -> base % move
+    _CAL_KEYS = np.array([0.1, 0.3, 0.5, 0.7, 1.0])
+    _CAL_VALS = np.array([0.5, 1.2, 2.0, 3.0, 4.0])
+    
+    # Reason / warning text templates (printf-style: cheaper than f-strings
+    # with format specs, and kept in one place)
+    _TMPL_CORRECTION_RSI = 'Price up %.1f%% in 7 days + RSI %.0f'
+    _TMPL_CORRECTION_BB = 'Bollinger z-score %.1f (overbought)'
+    _TMPL_CORRECTION_VOLUME = 'Unusual volume (%.1fx avg) with price spike'
+    _TMPL_REBOUND_CONFIRMED = "🚀 Strong rebound confirmed: Positive news (%+.2f) + recovery from %.1f%% decline"
+    _TMPL_REBOUND_SETUP = "🚀 Major rebound setup: Bullish news (%+.2f) after %.1f%% decline - recovery likely"
+    _TMPL_V_SHAPE = "📈 V-shaped recovery pattern: Down %.1f%% (7d) but up %.1f%% (3d)"
+    _TMPL_BOUNCE = "⚡ Significant bounce: Up %.1f%% today with positive news"
+    _TMPL_NEWS = "News sentiment %s %s (%+.2f)"
+    _TMPL_ASIAN = "Asian markets show %s %s influence (%+.2f)"
+    _TMPL_RSI_ELEVATED = "RSI elevated at %.0f, but supported by strong positive catalysts"
+    _TMPL_RSI_OVERBOUGHT = "RSI overbought at %.0f (caution advised)"
+    _TMPL_RSI_OVERSOLD = "RSI oversold at %.0f (strong bounce potential)"
+    _TMPL_RSI_RECOVERY = "RSI at %.0f (recovery zone, watch for bounce)"
+    _TMPL_TREND = "Strong %s trend: %+.1f%% over 7 days"
+    _TMPL_MACD = "MACD showing %s momentum"
+    _TMPL_VOLUME_REBOUND = "Strong volume surge (%.1fx) confirms rebound"
+    _TMPL_VOLUME = "Elevated volume activity (%.1fx average)"
+    _TMPL_GREED = "Market greed at %s (caution on entries)"
+    _TMPL_FEAR = "Market fear at %s (contrarian opportunity)"
+    
+    # Batch label codes from _finalize -> label strings
+    _LABELS = ('BEARISH', 'BULLISH')
+    
+    # Initial row capacity of the reusable batch input buffer
+    _MAX_BATCH = 1024
+    
+    # Lazily imported ML modules, shared by all instances
+    _lgb = None
+    _StandardScaler = None
+    
     def __init__(self, model_path=None):
         """
         Initialize the model
         
         Args:
-            model_path: Path to saved model file (optional)
+            model_path: Path to saved model file (optional). A .pkl path
+                from earlier versions is read if no booster text file has
+                been saved next to it yet; saves go to the .txt path.
         """
         self.base_model = None
-        self.scaler = StandardScaler()
+        self.scaler = None  # Fitted on train; inference uses the cached stats below
+        self._compiled = None  # Native treelite predictor (optional)
+        self._fil = None  # cuML GPU forest, loaded on first large batch (optional)
         self.model_path = model_path or self._get_default_model_path()
+        if self.model_path.endswith('.pkl'):
+            # Saves use the booster text format; load_model falls back to the pickle
+            self.model_path = str(Path(self.model_path).with_suffix('.txt'))
         
         # Configuration from environment or defaults
         self.asian_influence_max = float(os.getenv('ASIAN_INFLUENCE_MAX', '0.5'))
         self.asian_influence_scale = float(os.getenv('ASIAN_INFLUENCE_SCALE', '2.0'))
+        self.pred_early_stop_margin = float(os.getenv('PRED_EARLY_STOP_MARGIN', '10.0'))
+        self.gpu_min_batch = int(os.getenv('QM_GPU_MIN_BATCH', '10000'))
+        
+        # Correction warning thresholds
+        self._correction_pct_threshold = float(os.getenv('CORRECTION_PCT_7D', '10'))
+        self._correction_rsi_threshold = float(os.getenv('CORRECTION_RSI_THRESHOLD', '80'))
+        self._correction_bb_zscore = float(os.getenv('CORRECTION_BB_ZSCORE', '2.0'))
+        
+        # Forest size - lean defaults favor real-time latency; raise these
+        # (e.g. 200 trees / 31 leaves) when training a wider model for daily jobs
+        self.n_estimators = int(os.getenv('QM_N_ESTIMATORS', '100'))
+        self.num_leaves = int(os.getenv('QM_NUM_LEAVES', '15'))
+        self.max_depth = int(os.getenv('QM_MAX_DEPTH', '6'))
         
         # Feature names for validation
         self.base_features = [
@@ -79,16 +428,49 @@ class QuickModelV2:
         
         self.all_features = self.base_features + self.asian_features
         
-        # Load model if exists
-        if os.path.exists(self.model_path):
+        # Scaler statistics (as fitted, for save_model) and reusable input
+        # row for the predict hot path
+        self._scaler_stats = None
+        self._mu = None
+        self._inv_scale = None
+        self._feat_names = tuple(self.all_features)
+        self._feat_defaults = dict.fromkeys(self._feat_names, 0.0)
+        self._buf = np.zeros((1, len(self._feat_names)), dtype=np.float32)
+        self._row = self._buf[0]
+        self._feat_index = {f: i for i, f in enumerate(self._feat_names)}
+        self._batch_buf = np.empty((self._MAX_BATCH, len(self._feat_names)), dtype=np.float32, order='C')
+        
+        # LRU cache of predict() results keyed on the feature items
+        # (0 disables it)
+        self.predict_cache_size = int(os.getenv('QM_PREDICT_CACHE_SIZE', '1024'))
+        self._predict_cache = OrderedDict()
+        
+        # Load model if exists (or a pickle saved by earlier versions)
+        if os.path.exists(self.model_path) or os.path.exists(self._legacy_model_path()):
             self.load_model()
     
+    @classmethod
+    def _ml_libs(cls):
+        """Import LightGBM on first use; returns the lightgbm module"""
+        if cls._lgb is None:
+            import lightgbm
+            cls._lgb = lightgbm
+        return cls._lgb
+    
+    @classmethod
+    def _get_scaler(cls):
+        """Create a fresh StandardScaler, importing scikit-learn on first use"""
+        if cls._StandardScaler is None:
+            from sklearn.preprocessing import StandardScaler
+            cls._StandardScaler = StandardScaler
+        return cls._StandardScaler()
+    
     def _get_default_model_path(self):
         """Get default model save path"""
         base_dir = Path(__file__).parent.parent
         models_dir = base_dir / 'saved_models'
         models_dir.mkdir(exist_ok=True)
-        return str(models_dir / 'quick_model_v2.pkl')
+        return str(models_dir / 'quick_model_v2.txt')
     
     def train(self, X_train, y_train, X_val=None, y_val=None):
         """
@@ -102,26 +484,33 @@ class QuickModelV2:
         """
         if not HAS_ML_LIBS:
             raise ImportError("ML libraries required for training")
+        lgb = self._ml_libs()
         
-        # Prepare data
+        # Prepare data (dicts hold whole columns here, so build a fresh array
+        # rather than going through the single-row predict buffer)
         if isinstance(X_train, dict):
-            X_train = self._dict_to_array(X_train)
+            X_train = np.array([X_train.get(f, 0.0) for f in self._feat_names])
         
         # Fit scaler
+        self.scaler = self._get_scaler()
         self.scaler.fit(X_train)
+        self._cache_scaler_stats(self.scaler.mean_, self.scaler.scale_)
         X_train_scaled = self.scaler.transform(X_train)
         
         # Create and train model
-        self.base_model = lgb.LGBMClassifier(
+        classifier = lgb.LGBMClassifier(
             objective='binary',
-            n_estimators=200,
-            max_depth=6,
+            n_estimators=self.n_estimators,
+            max_depth=self.max_depth,
             learning_rate=0.05,
-            num_leaves=31,
+            num_leaves=self.num_leaves,
             min_child_samples=20,
             subsample=0.8,
             colsample_bytree=0.8,
             random_state=42,
+            force_row_wise=True,
+            use_missing=False,
+            zero_as_missing=False,
             verbose=-1
         )
         
@@ -129,32 +518,86 @@ class QuickModelV2:
         eval_set = None
         if X_val is not None and y_val is not None:
             if isinstance(X_val, dict):
-                X_val = self._dict_to_array(X_val)
+                X_val = np.array([X_val.get(f, 0.0) for f in self._feat_names])
             X_val_scaled = self.scaler.transform(X_val)
             eval_set = [(X_val_scaled, y_val)]
         
-        self.base_model.fit(
+        classifier.fit(
             X_train_scaled, y_train,
             eval_set=eval_set,
             eval_metric='auc',
             callbacks=[lgb.early_stopping(stopping_rounds=20, verbose=False)]
         )
         
-        # Save model
+        # Only the raw booster is needed for inference and persistence
+        self.base_model = classifier.booster_
+        
+        # Save model, then drop the predictors built from the previous booster
         self.save_model()
+        self._compiled = self._compile_booster()
+        self._fil = None
+        self.clear_prediction_cache()
         
         return self
     
-    def predict(self, features):
+    def warm_up(self):
+        """
+        Compile the scoring kernels (or load them from the numba cache)
+        
+        Until then single predictions run the kernels as plain Python, so a
+        one-shot CLI call never imports numba. Batch predictions compile on
+        first use; serve() calls this at startup so the first request does
+        not pay for it.
+        """
+        compile_kernels(globals())
+        _sigmoid_scalar(0.0)
+        _fallback_score(0.0, 0.0, 0.0, 0.0, 50.0, 1.0, 0.0)
+        _correction_checks(0.0, 50.0, 0.0, 1.0, 1.0, 1.0, 1.0, 10.0, 80.0, 2.0)
+        _ensemble(0.0, 0.0, 0.0, 0.0, 0.5, self._CAL_KEYS, self._CAL_VALS)
+    
+    def predict(self, features, want_reasons=True):
         """
         Make prediction with Asian market influence
         
+        Repeated calls with equal feature dicts are answered from an LRU cache
+        with a fresh timestamp. Every call returns its own copy, so changing
+        a result (nested values included) does not affect later calls.
+        Features holding unhashable values (lists, dicts) are never cached.
+        
         Args:
             features: Dict of feature values
+            want_reasons: Build human-readable top_reasons (None when False)
             
         Returns:
             Dict with prediction results
         """
+        if self.predict_cache_size <= 0:
+            return self._predict_uncached(features, want_reasons)
+        
+        try:
+            key = (want_reasons,) + tuple(sorted(features.items()))
+            hash(key)
+        except (TypeError, AttributeError):
+            return self._predict_uncached(features, want_reasons)
+        
+        cache = self._predict_cache
+        result = cache.get(key)
+        if result is not None:
+            cache.move_to_end(key)
+            return _copy_result(result, timestamp=_timestamp())
+        
+        result = self._predict_uncached(features, want_reasons)
+        cache[key] = result
+        if len(cache) > self.predict_cache_size:
+            cache.popitem(last=False)
+        return _copy_result(result)
+    
+    def clear_prediction_cache(self):
+        """Drop all memoized predict() results"""
+        self._predict_cache.clear()
+    
+    def _predict_uncached(self, features, want_reasons=True):
+        """Run the full prediction pipeline for one feature dict"""
         # Validate features
         features = self._validate_features(features)
         
@@ -168,50 +611,291 @@ class QuickModelV2:
             base_score = self._fallback_prediction(features)
         else:
             # ML model prediction
-            X = self._dict_to_array(features)
-            X_scaled = self.scaler.transform(X.reshape(1, -1))
-            base_prob = self.base_model.predict_proba(X_scaled)[0, 1]
+            base_prob = self._predict_proba(self._vec(features))[0]
             base_score = (base_prob - 0.5) * 2  # Convert to -1..+1
         
-        # CRITICAL: Check for rebound patterns and boost signal
-        rebound_boost = self._detect_rebound_pattern(features)
-        if rebound_boost > 0.3:
-            # Strong rebound detected - apply boost to base score
-            base_score = base_score + (rebound_boost * 0.4)
-            base_score = np.clip(base_score, -1, 1)
-        
-        # Calculate Asian impact
-        asian_impact_pct = min(
-            abs(asian_influence_score) * self.asian_influence_max,
-            self.asian_influence_max
+        # CRITICAL: Check for rebound patterns, then boost the base score,
+        # blend in the Asian influence and convert to probability and
+        # expected move in one compiled call
+        base_score, asian_impact_pct, final_score, probability, expected_pct_move = _ensemble(
+            float(base_score),
+            self._detect_rebound_pattern(features),
+            float(asian_influence_score),
+            float(features.get('atr_14', 0)),
+            self.asian_influence_max, self._CAL_KEYS, self._CAL_VALS
         )
+        expected_pct_move = round(float(expected_pct_move), 2)
+        
+        # Determine label
+        label = 'BULLISH' if final_score > 0 else 'BEARISH'
         
-        # Ensemble scoring
-        final_score = (
-            (1 - asian_impact_pct) * base_score +
-            asian_impact_pct * np.sign(asian_influence_score) * abs(asian_influence_score)
+        return self._build_result(
+            features, label, base_score, final_score, probability, expected_pct_move,
+            asian_influence_score, asian_impact_pct, want_reasons
         )
+    
+    def predict_batch(self, features_list, want_reasons=True):
+        """
+        Make predictions for many feature dicts with a single model call
         
-        # Convert to probability
-        probability = self._sigmoid(final_score * 5)
+        Args:
+            features_list: List of feature dicts (e.g. one per symbol)
+            want_reasons: Build human-readable top_reasons (None when False)
+            
+        Returns:
+            List of prediction dicts, same shape as predict()
+        """
+        validated = [self._validate_features(f) for f in features_list]
+        if not validated:
+            return []
+        
+        # Stack into an (N, n_features) matrix
+        X = np.empty((len(validated), len(self._feat_names)), dtype=np.float64)
+        for r, features in enumerate(validated):
+            row = X[r]
+            for i, f in enumerate(self._feat_names):
+                row[i] = features[f]
+        
+        return self._predict_matrix(X, validated, want_reasons)
+    
+    def predict_batch_columnar(self, feat_cols, want_reasons=True):
+        """
+        Make predictions from column-oriented features
         
-        # Determine label
-        label = 'BULLISH' if final_score > 0 else 'BEARISH'
+        Each feature is copied into the batch matrix with one vectorized
+        assignment instead of N dict lookups.
+        
+        Args:
+            feat_cols: Dict of feature name -> 1-D array (one value per symbol),
+                       or a pandas / Polars DataFrame with one column per
+                       feature; missing features default to 0.0
+            want_reasons: Build human-readable top_reasons (None when False)
+            
+        Returns:
+            List of prediction dicts, same shape as predict()
+        """
+        is_frame = hasattr(feat_cols, 'columns')
+        if is_frame:
+            # Column arrays straight from the frame, without importing its library
+            n = len(feat_cols)
+            present = set(feat_cols.columns)
+            feat_cols = {f: feat_cols[f].to_numpy() for f in self._feat_names if f in present}
+        else:
+            n = len(next(iter(feat_cols.values()))) if feat_cols else 0
+        if n == 0:
+            return []
+        
+        X = np.empty((n, len(self._feat_names)), dtype=np.float64)
+        for i, f in enumerate(self._feat_names):
+            col = feat_cols.get(f)
+            X[:, i] = col if col is not None else 0.0
+        if is_frame:
+            # Empty cells count as missing features, as in V4's predict_batch
+            X[np.isnan(X)] = 0.0
+        
+        rows = [dict(zip(self._feat_names, values)) for values in X.tolist()]
+        return self._predict_matrix(X, rows, want_reasons)
+    
+    def predict_raw(self, x, out=None):
+        """
+        Numeric-only predictions straight from feature vectors, no dicts
+        
+        For callers that keep features in arrays (backtests, bulk scoring):
+        skips the per-row dict validation, warning text and reasons. Meant
+        for many rows per call; a single row still pays the parallel kernel
+        launches and is slower than predict().
+        
+        Args:
+            x: (n_features,) or (N, n_features) array of raw feature values
+               in self.all_features order
+            out: Optional float64 array of shape (5,) or (N, 5) to fill
+            
+        Returns:
+            out, holding per row [final_score, probability,
+            asian_impact_percent, expected_pct_move, severity_code], where
+            severity_code is 0 (no correction warning), 1 (MEDIUM) or 2 (HIGH)
+        """
+        X = np.asarray(x, dtype=np.float64)
+        single = X.ndim == 1
+        X = X.reshape(1, -1) if single else X
+        if out is None:
+            out = np.empty(5) if single else np.empty((len(X), 5))
+        if len(X) == 0:
+            return out
+        
+        _, impact, score, prob, move, _, _, checks = self._score_matrix(X)
+        
+        # A check fired when its confidence is >= 0; HIGH as in _detect_correction_warning
+        fired = checks[:, :3] >= 0
+        high = ((fired[:, 0] & (X[:, self._feat_index['rsi_14']] > _SEVERITY_RSI_HIGH)) |
+                (fired[:, 1] & (checks[:, 3] > _SEVERITY_ZSCORE_HIGH)))
+        severity = np.where(high, 2.0, np.where(fired.any(axis=1), 1.0, 0.0))
+        
+        rows = out.reshape(-1, 5)
+        rows[:, 0] = score
+        rows[:, 1] = prob
+        rows[:, 2] = impact
+        rows[:, 3] = _round_column(move, 2)
+        rows[:, 4] = severity
+        return out
+    
+    def _predict_matrix(self, X, rows, want_reasons=True):
+        """
+        Shared batch scoring over a raw (N, n_features) matrix
+        
+        Args:
+            X: Unscaled feature matrix in self._feat_names column order
+            rows: Matching per-row feature dicts (used for warnings and reasons)
+            want_reasons: Build human-readable top_reasons (None when False)
+        """
+        (boosted_score, asian_impact_pct, final_score, probability, expected_pct_move,
+         label_code, asian_score, checks) = self._score_matrix(X)
+        
+        timestamp = _timestamp()
+        checks = checks.tolist()
+        expected_pct_move = _round_column(expected_pct_move, 2)
+        return [
+            self._build_result(
+                features, self._LABELS[label_code[r]], boosted_score[r], final_score[r],
+                probability[r], expected_pct_move[r], asian_score[r], asian_impact_pct[r],
+                want_reasons, timestamp, checks[r]
+            )
+            for r, features in enumerate(rows)
+        ]
+    
+    def _score_matrix(self, X):
+        """
+        Numeric batch scoring over a raw (N, n_features) float64 matrix
         
-        # Calculate expected move
-        expected_pct_move = self._calculate_expected_move(
-            final_score,
-            features.get('atr_14', 0),
-            features.get('bb_width', 0)
+        Returns arrays of the boosted base score, Asian impact, final score,
+        probability, unrounded expected move, label code (1 = BULLISH), Asian score and
+        the (N, 4) _correction_checks results.
+        """
+        compile_kernels(globals())
+        col = self._feat_index
+        n = len(X)
+        
+        # Fallback score, rebound score and correction checks in one fused pass
+        def column(feature):
+            return np.ascontiguousarray(X[:, col[feature]])
+        
+        fallback_score = np.empty(n)
+        rebound_score = np.empty(n)
+        checks = np.empty((n, 4))
+        _score_columns(
+            column('price_change_1d'), column('price_change_3d'), column('price_change_7d'),
+            column('news_sentiment_score'), column('rsi_14'), column('volume_sma_ratio'),
+            column('macd_hist'), column('bb_pct'), column('bb_width'), column('bb_middle'),
+            column('close'), self._correction_pct_threshold, self._correction_rsi_threshold,
+            self._correction_bb_zscore, fallback_score, rebound_score, checks
         )
         
-        # Detect correction warning
-        correction_warning = self._detect_correction_warning(features)
+        # Base model prediction
+        if self.base_model is None:
+            base_score = fallback_score
+        else:
+            X_scaled = self._batch_rows(len(X))
+            X_scaled[:] = X
+            X_scaled -= self._mu
+            X_scaled *= self._inv_scale
+            base_score = (self._predict_proba(X_scaled) - 0.5) * 2
+        
+        # Rebound boost, Asian ensemble, probability and expected move in one fused pass
+        asian_score = column('asian_influence_score')
+        boosted_score = np.empty(n)
+        asian_impact_pct = np.empty(n)
+        final_score = np.empty(n)
+        probability = np.empty(n)
+        expected_pct_move = np.empty(n)
+        label_code = np.empty(n, dtype=np.int8)
+        _finalize(
+            np.ascontiguousarray(base_score, dtype=np.float64),
+            rebound_score,
+            asian_score,
+            column('atr_14'),
+            self.asian_influence_max, self._CAL_KEYS, self._CAL_VALS,
+            boosted_score, asian_impact_pct, final_score, probability,
+            expected_pct_move, label_code
+        )
+        
+        return (boosted_score, asian_impact_pct, final_score, probability, expected_pct_move,
+                label_code, asian_score, checks)
+    
+    def predict_batch_gpu(self, X_scaled):
+        """
+        Bullish probabilities from RAPIDS cuML FIL on the GPU
+        
+        Only worth it for large batches (see QM_GPU_MIN_BATCH) where the
+        host/device transfer is amortized, e.g. nightly bulk scoring.
+        
+        Args:
+            X_scaled: Scaled (N, n_features) float32 matrix
+            
+        Returns:
+            1-D array of probabilities, or None if cuML/CUDA is unavailable
+        """
+        if self._fil is None:
+            self._fil = False
+            try:
+                from cuml import ForestInference
+                self._fil = ForestInference.load(
+                    self.model_path, output_class=True, model_type='lightgbm'
+                )
+            except ImportError:
+                pass
+            except Exception as e:
+                print(f"GPU forest load failed, using CPU: {e}", file=sys.stderr)
+        
+        if self._fil is False:
+            return None
+        return np.asarray(self._fil.predict_proba(X_scaled))[:, 1]
+    
+    def _batch_rows(self, n):
+        """
+        Return a C-contiguous float32 (n, n_features) view of the batch buffer
         
-        # Generate top reasons
-        top_reasons = self._generate_reasons(
-            features, final_score, asian_influence_score, base_score
+        The buffer is reused across calls and grown when a batch exceeds it.
+        """
+        if n > len(self._batch_buf):
+            self._batch_buf = np.empty((n, len(self._feat_names)), dtype=np.float32, order='C')
+        return self._batch_buf[:n]
+    
+    def _predict_proba(self, X_scaled):
+        """Bullish probability for each row of a scaled feature matrix"""
+        if len(X_scaled) >= self.gpu_min_batch:
+            probs = self.predict_batch_gpu(X_scaled)
+            if probs is not None:
+                return probs
+        
+        if self._compiled is not None:
+            import tl2cgen
+            return np.ravel(self._compiled.predict(tl2cgen.DMatrix(X_scaled)))
+        # Booster API with prediction early stopping: stop walking trees
+        # once the margin is confidently past pred_early_stop_margin
+        return self.base_model.predict(
+            X_scaled,
+            pred_early_stop=True,
+            pred_early_stop_freq=10,
+            pred_early_stop_margin=self.pred_early_stop_margin
         )
+    
+    def _build_result(self, features, label, base_score, final_score, probability,
+                      expected_pct_move, asian_influence_score, asian_impact_pct,
+                      want_reasons=True, timestamp=None, checks=None):
+        """
+        Assemble the prediction dict (warnings, reasons) for one row
+        
+        checks, when given, is this row's precomputed _correction_checks result.
+        """
+        # Detect correction warning
+        correction_warning = self._detect_correction_warning(features, checks)
+        
+        # Generate top reasons (skipped for machine consumers)
+        top_reasons = None
+        if want_reasons:
+            top_reasons = self._generate_reasons(
+                features, final_score, asian_influence_score, base_score
+            )
         
         return {
             'label': label,
@@ -224,74 +908,66 @@ class QuickModelV2:
             'correction_warning': correction_warning,
             'top_reasons': top_reasons,
             'model_version': 'quick_model_v2',
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp or _timestamp()
         }
     
     def _validate_features(self, features):
-        """Validate and fill missing features"""
-        validated = {}
-        
-        # Fill base features
-        for feature in self.base_features:
-            validated[feature] = features.get(feature, 0.0)
+        """Validate and fill missing features (base, then Asian)"""
+        defaults = self._feat_defaults
+        if features.keys() <= defaults.keys():
+            # Known features only: overlay them on the defaults in one merge
+            return {**defaults, **features}
+        return {f: features.get(f, 0.0) for f in self._feat_names}
+    
+    def _dict_to_array(self, features):
+        """
+        Write feature dict into the preallocated float32 row
         
-        # Fill Asian features
-        for feature in self.asian_features:
-            validated[feature] = features.get(feature, 0.0)
+        Returns the shared row buffer; use row.reshape(1, -1) for a 2-D view.
+        """
+        row = self._row
+        names = self._feat_names
+        row[:] = list(map(features.get, names, self._feat_defaults.values()))
+        return row
+    
+    def _cache_scaler_stats(self, mean, scale):
+        """
+        Cache scaler mean and inverse scale so predict() skips sklearn validation
         
-        return validated
+        The float64 statistics are kept as well, so save_model works after
+        load_model without a StandardScaler.
+        """
+        self._scaler_stats = (np.asarray(mean, dtype=np.float64), np.asarray(scale, dtype=np.float64))
+        self._mu = np.asarray(mean, dtype=np.float32)
+        self._inv_scale = (1.0 / np.asarray(scale, dtype=np.float64)).astype(np.float32)
     
-    def _dict_to_array(self, features):
-        """Convert feature dict to numpy array"""
-        return np.array([features.get(f, 0.0) for f in self.all_features])
+    def _vec(self, features):
+        """
+        Build the scaled (1, n_features) input row in place
+        
+        Returns a view of a buffer that is reused across calls.
+        """
+        self._dict_to_array(features)
+        buf = self._buf
+        buf -= self._mu
+        buf *= self._inv_scale
+        return buf
     
     def _sigmoid(self, x):
         """Sigmoid activation"""
-        return 1 / (1 + np.exp(-np.clip(x, -500, 500)))
+        return _sigmoid_scalar(x)
     
     def _fallback_prediction(self, features):
         """Simple rule-based fallback when model not available"""
-        score = 0
-        
-        # CRITICAL: Detect rebound pattern (most important)
-        rebound_score = self._detect_rebound_pattern(features)
-        if rebound_score != 0:
-            # Rebound patterns get highest priority
-            score += rebound_score * 0.6
-        
-        # News sentiment (increased weight for rebounds)
-        news_sentiment = features.get('news_sentiment_score', 0)
-        if abs(news_sentiment) > 0:
-            # If news is positive and we have rebound, amplify it
-            if rebound_score > 0 and news_sentiment > 0:
-                score += np.clip(news_sentiment * 0.5, 0, 0.5)  # Increased from 0.2
-            else:
-                score += np.clip(news_sentiment * 0.3, -0.3, 0.3)  # Increased from 0.2
-        
-        # RSI contribution (adjusted for rebounds)
-        rsi = features.get('rsi_14', 50)
-        if rsi > 70:
-            # Don't penalize as much if there's strong positive news/rebound
-            if news_sentiment > 0.3 or rebound_score > 0.3:
-                score -= 0.1  # Reduced from 0.3
-            else:
-                score -= 0.25
-        elif rsi < 30:
-            score += 0.3
-        
-        # MACD contribution (reduced weight)
-        macd_hist = features.get('macd_hist', 0)
-        score += np.clip(macd_hist / 10, -0.2, 0.2)  # Reduced from 0.3
-        
-        # Price momentum (short-term prioritized)
-        price_change_1d = features.get('price_change_1d', 0)
-        price_change_3d = features.get('price_change_3d', 0)
-        
-        # Recent momentum is more important
-        score += np.clip(price_change_1d / 50, -0.2, 0.2)
-        score += np.clip(price_change_3d / 150, -0.15, 0.15)
-        
-        return np.clip(score, -1, 1)
+        return _fallback_score(
+            float(features.get('price_change_1d', 0)),
+            float(features.get('price_change_3d', 0)),
+            float(features.get('price_change_7d', 0)),
+            float(features.get('news_sentiment_score', 0)),
+            float(features.get('rsi_14', 50)),
+            float(features.get('volume_sma_ratio', 1.0)),
+            float(features.get('macd_hist', 0))
+        )
     
     def _detect_rebound_pattern(self, features):
         """
@@ -300,48 +976,14 @@ class QuickModelV2:
         
         Returns: score from -1 to +1 indicating rebound strength
         """
-        score = 0
-        
-        price_change_1d = features.get('price_change_1d', 0)
-        price_change_3d = features.get('price_change_3d', 0)
-        price_change_7d = features.get('price_change_7d', 0)
-        news_sentiment = features.get('news_sentiment_score', 0)
-        rsi = features.get('rsi_14', 50)
-        
-        # Pattern 1: Strong positive news after recent decline (PRIMARY REBOUND SIGNAL)
-        if news_sentiment > 0.3 and price_change_7d < 0:
-            # Stock was down but has positive news - this alone is a strong rebound signal
-            strength = min(abs(price_change_7d) / 15, 0.6)  # More decline = stronger rebound potential
-            score += 0.5 + strength  # Increased base score
-            
-            # Additional boost if already showing recovery
-            if price_change_1d > 0 or price_change_3d > 0:
-                score += 0.2  # Extra boost for confirmed recovery
-        
-        # Pattern 2: V-shape recovery (was down 7d but up recent days)
-        if price_change_7d < -3 and price_change_3d > 1 and price_change_1d > 0:
-            # Clear V-shape
-            recovery_strength = (price_change_1d + price_change_3d) / 2
-            score += np.clip(recovery_strength / 10, 0, 0.4)
-        
-        # Pattern 3: Oversold RSI with positive momentum and news
-        if rsi < 40 and news_sentiment > 0.2:
-            if price_change_1d > 0.5:
-                # Oversold bouncing with positive news
-                score += 0.3
-        
-        # Pattern 4: Significant positive 1-day change with positive news (key rebound signal)
-        if price_change_1d > 2 and news_sentiment > 0.2:
-            # Strong bounce with positive news - likely rebound
-            score += 0.5
-        
-        # Pattern 5: Recovery from oversold with volume
-        volume_ratio = features.get('volume_sma_ratio', 1.0)
-        if rsi < 35 and volume_ratio > 1.3 and price_change_1d > 0:
-            # Oversold, high volume, positive day - strong rebound signal
-            score += 0.35
-        
-        return np.clip(score, -1, 1)
+        return _rebound_score(
+            float(features.get('price_change_1d', 0)),
+            float(features.get('price_change_3d', 0)),
+            float(features.get('price_change_7d', 0)),
+            float(features.get('news_sentiment_score', 0)),
+            float(features.get('rsi_14', 50)),
+            float(features.get('volume_sma_ratio', 1.0))
+        )
     
     def _calculate_expected_move(self, final_score, atr, bb_width):
         """
@@ -352,83 +994,64 @@ class QuickModelV2:
             atr: Average True Range
             bb_width: Bollinger Band width
         """
-        # Base move from score magnitude
-        base_magnitude = abs(final_score)
-        
-        # Calibration curve
-        calibration = {
-            0.1: 0.5,
-            0.3: 1.2,
-            0.5: 2.0,
-            0.7: 3.0,
-            1.0: 4.0
-        }
-        
-        keys = list(calibration.keys())
-        values = list(calibration.values())
-        base_move = np.interp(base_magnitude, keys, values)
-        
-        # Volatility adjustment
-        volatility_factor = 1 + (atr / 10.0) if atr > 0 else 1.0
-        expected_magnitude = base_move * volatility_factor
-        
-        # Apply direction
-        expected_move = expected_magnitude * np.sign(final_score)
-        
-        return round(expected_move, 2)
+        return round(float(_expected_move(float(final_score), float(atr), self._CAL_KEYS, self._CAL_VALS)), 2)
     
-    def _detect_correction_warning(self, features):
+    def _detect_correction_warning(self, features, checks=None):
         """
         Detect potential correction scenarios
         
+        Args:
+            features: Dict of feature values
+            checks: Precomputed _correction_checks result for these features
+                (optional, computed here when omitted)
+        
         Returns:
             Dict with warning details or {'warning': False}
         """
         warnings = []
         
-        # Thresholds from environment
-        pct_threshold = float(os.getenv('CORRECTION_PCT_7D', '10'))
-        rsi_threshold = float(os.getenv('CORRECTION_RSI_THRESHOLD', '80'))
-        bb_zscore_threshold = float(os.getenv('CORRECTION_BB_ZSCORE', '2.0'))
-        
-        # Check 1: Price surge + overbought RSI
         price_change_7d = features.get('price_change_7d', 0)
         rsi = features.get('rsi_14', 50)
+        volume_ratio = features.get('volume_sma_ratio', 1.0)
+        
+        if checks is None:
+            checks = _correction_checks(
+                float(price_change_7d),
+                float(rsi),
+                float(features.get('bb_pct', 0)),
+                # Only read when bb_pct > 1; None or non-numeric falls back to the default
+                _as_float(features.get('bb_width'), 1.0),
+                _as_float(features.get('bb_middle'), 1.0),
+                _as_float(features.get('close'), 1.0),
+                float(volume_ratio),
+                self._correction_pct_threshold,
+                self._correction_rsi_threshold,
+                self._correction_bb_zscore
+            )
+        rsi_confidence, bb_confidence, volume_confidence, z_score = checks
         
-        if price_change_7d > pct_threshold and rsi > rsi_threshold:
-            severity = 'HIGH' if rsi > 85 else 'MEDIUM'
-            confidence = min(0.9, 0.5 + (rsi - 70) / 50)
+        # Check 1: Price surge + overbought RSI
+        if rsi_confidence >= 0:
             warnings.append({
-                'reason': f'Price up {price_change_7d:.1f}% in 7 days + RSI {rsi:.0f}',
-                'severity': severity,
-                'confidence': confidence
+                'reason': self._TMPL_CORRECTION_RSI % (price_change_7d, rsi),
+                'severity': 'HIGH' if rsi > _SEVERITY_RSI_HIGH else 'MEDIUM',
+                'confidence': rsi_confidence
             })
         
         # Check 2: Bollinger z-score
-        bb_pct = features.get('bb_pct', 0)
-        if bb_pct > 1.0:
-            bb_width = features.get('bb_width', 1)
-            bb_middle = features.get('bb_middle', 1)
-            close = features.get('close', 1)
-            
-            if bb_width > 0:
-                z_score = (close - bb_middle) / (bb_width / 2)
-                if z_score > bb_zscore_threshold:
-                    severity = 'HIGH' if z_score > 2.5 else 'MEDIUM'
-                    confidence = min(0.85, z_score / 3.0)
-                    warnings.append({
-                        'reason': f'Bollinger z-score {z_score:.1f} (overbought)',
-                        'severity': severity,
-                        'confidence': confidence
-                    })
+        if bb_confidence >= 0:
+            warnings.append({
+                'reason': self._TMPL_CORRECTION_BB % z_score,
+                'severity': 'HIGH' if z_score > _SEVERITY_ZSCORE_HIGH else 'MEDIUM',
+                'confidence': bb_confidence
+            })
         
         # Check 3: Volume spike with price spike
-        volume_ratio = features.get('volume_sma_ratio', 1.0)
-        if volume_ratio > 2.0 and price_change_7d > pct_threshold:
+        if volume_confidence >= 0:
             warnings.append({
-                'reason': f'Unusual volume ({volume_ratio:.1f}x avg) with price spike',
+                'reason': self._TMPL_CORRECTION_VOLUME % volume_ratio,
                 'severity': 'MEDIUM',
-                'confidence': 0.65
+                'confidence': volume_confidence
             })
         
         if not warnings:
@@ -467,113 +1090,255 @@ class QuickModelV2:
         # Pattern 1: Strong positive news after decline (MOST IMPORTANT - even without price recovery yet)
         if news_sentiment > 0.3 and price_change_7d < 0:
             if price_change_1d > 0 or price_change_3d > 0:
-                reasons.append(f"🚀 Strong rebound confirmed: Positive news ({news_sentiment:+.2f}) + recovery from {price_change_7d:.1f}% decline")
+                reasons.append(self._TMPL_REBOUND_CONFIRMED % (news_sentiment, price_change_7d))
             else:
-                reasons.append(f"🚀 Major rebound setup: Bullish news ({news_sentiment:+.2f}) after {price_change_7d:.1f}% decline - recovery likely")
+                reasons.append(self._TMPL_REBOUND_SETUP % (news_sentiment, price_change_7d))
             is_rebounding = True
         elif price_change_7d < -3 and price_change_3d > 1 and price_change_1d > 0:
-            reasons.append(f"📈 V-shaped recovery pattern: Down {price_change_7d:.1f}% (7d) but up {price_change_3d:.1f}% (3d)")
+            reasons.append(self._TMPL_V_SHAPE % (price_change_7d, price_change_3d))
             is_rebounding = True
         elif price_change_1d > 2 and news_sentiment > 0.2:
-            reasons.append(f"⚡ Significant bounce: Up {price_change_1d:.1f}% today with positive news")
+            reasons.append(self._TMPL_BOUNCE % price_change_1d)
             is_rebounding = True
         
         # News sentiment (prioritize if significant)
         if abs(news_sentiment) > 0.3 and not is_rebounding:
             direction = 'bullish' if news_sentiment > 0 else 'bearish'
             strength = 'strongly' if abs(news_sentiment) > 0.5 else 'moderately'
-            reasons.append(f"News sentiment {strength} {direction} ({news_sentiment:+.2f})")
+            reasons.append(self._TMPL_NEWS % (strength, direction, news_sentiment))
         
         # Asian market influence
         if abs(asian_score) > 0.3:
             direction = 'positive' if asian_score > 0 else 'negative'
             strength = 'strong' if abs(asian_score) > 0.6 else 'moderate'
-            reasons.append(
-                f"Asian markets show {strength} {direction} influence ({asian_score:+.2f})"
-            )
+            reasons.append(self._TMPL_ASIAN % (strength, direction, asian_score))
         
         # RSI (context-aware based on rebound)
         if rsi > 70:
             if is_rebounding:
-                reasons.append(f"RSI elevated at {rsi:.0f}, but supported by strong positive catalysts")
+                reasons.append(self._TMPL_RSI_ELEVATED % rsi)
             else:
-                reasons.append(f"RSI overbought at {rsi:.0f} (caution advised)")
+                reasons.append(self._TMPL_RSI_OVERBOUGHT % rsi)
         elif rsi < 30:
-            reasons.append(f"RSI oversold at {rsi:.0f} (strong bounce potential)")
+            reasons.append(self._TMPL_RSI_OVERSOLD % rsi)
         elif rsi < 40:
-            reasons.append(f"RSI at {rsi:.0f} (recovery zone, watch for bounce)")
+            reasons.append(self._TMPL_RSI_RECOVERY % rsi)
         
         # Price trend
         if abs(price_change_7d) > 5 and not is_rebounding:
             direction = 'upward' if price_change_7d > 0 else 'downward'
-            reasons.append(f"Strong {direction} trend: {price_change_7d:+.1f}% over 7 days")
+            reasons.append(self._TMPL_TREND % (direction, price_change_7d))
         
         # MACD
         macd_hist = features.get('macd_hist', 0)
         if abs(macd_hist) > 0.5:
             direction = 'bullish' if macd_hist > 0 else 'bearish'
-            reasons.append(f"MACD showing {direction} momentum")
+            reasons.append(self._TMPL_MACD % direction)
         
         # Volume
         volume_spike = features.get('volume_spike', False)
         volume_ratio = features.get('volume_sma_ratio', 1.0)
         if volume_spike or volume_ratio > 1.5:
             if is_rebounding:
-                reasons.append(f"Strong volume surge ({volume_ratio:.1f}x) confirms rebound")
+                reasons.append(self._TMPL_VOLUME_REBOUND % volume_ratio)
             else:
-                reasons.append(f"Elevated volume activity ({volume_ratio:.1f}x average)")
+                reasons.append(self._TMPL_VOLUME % volume_ratio)
         
         # Fear & Greed
         fear_greed = features.get('fear_greed_index', 50)
         if fear_greed > 75:
-            reasons.append(f"Market greed at {fear_greed} (caution on entries)")
+            reasons.append(self._TMPL_GREED % (fear_greed,))
         elif fear_greed < 25:
-            reasons.append(f"Market fear at {fear_greed} (contrarian opportunity)")
+            reasons.append(self._TMPL_FEAR % (fear_greed,))
         
         # Limit to top 6 reasons (increased from 5 to accommodate rebound info)
         return reasons[:6] if reasons else ["Technical analysis suggests trend continuation"]
     
+    def _scaler_stats_path(self):
+        """
+        JSON sidecar holding scaler statistics next to the booster file
+        
+        Named <model>.scaler.json, so a model path that itself ends in .json
+        is not overwritten.
+        """
+        return str(Path(self.model_path).with_suffix('.scaler.json'))
+    
+    def _legacy_model_path(self):
+        """Pickle of the fitted LGBMClassifier and StandardScaler saved by earlier versions"""
+        return str(Path(self.model_path).with_suffix('.pkl'))
+    
     def save_model(self):
-        """Save model to disk"""
+        """
+        Save model to disk
+        
+        The booster is written in LightGBM's native text format and the
+        scaler statistics to a small JSON sidecar, so loading needs neither
+        pickle nor a StandardScaler object.
+        """
         if self.base_model is None:
             return
         
-        model_data = {
-            'base_model': self.base_model,
-            'scaler': self.scaler,
+        self.base_model.save_model(self.model_path)
+        
+        mean, scale = self._scaler_stats
+        scaler_data = {
+            'mean': mean.tolist(),
+            'scale': scale.tolist(),
             'feature_names': self.all_features,
             'version': '2.0',
             'timestamp': datetime.now().isoformat()
         }
         
-        with open(self.model_path, 'wb') as f:
-            pickle.dump(model_data, f)
+        with open(self._scaler_stats_path(), 'w') as f:
+            json.dump(scaler_data, f)
         
         print(f"Model saved to {self.model_path}")
     
+    def _compile_booster(self):
+        """
+        Compile the LightGBM booster into a native shared library with treelite
+        
+        Each booster version gets its own library next to the model file, named
+        by a hash of the model text: a process keeps using a library it has
+        already loaded even after the file is rebuilt, so a retrained model
+        must not reuse the old path. Libraries of older versions are removed
+        when a new one is built. Returns a single-threaded tl2cgen predictor,
+        or None if treelite is not installed or compilation fails (LightGBM is
+        used instead).
+        """
+        try:
+            import treelite
+            import tl2cgen
+        except ImportError:
+            return None
+        
+        try:
+            digest = hashlib.sha1(self.base_model.model_to_string().encode()).hexdigest()[:16]
+            stem = Path(self.model_path).with_suffix('')
+            libpath = stem.parent / f'{stem.name}.{digest}.so'
+            if not libpath.exists():
+                tl_model = treelite.frontend.from_lightgbm(self.base_model)
+                tl2cgen.export_lib(
+                    tl_model,
+                    toolchain='gcc',
+                    libpath=str(libpath),
+                    params={'parallel_comp': 0, 'quantize': 1}
+                )
+                for old in [stem.parent / f'{stem.name}.so', *stem.parent.glob(f'{stem.name}.*.so')]:
+                    if old != libpath and old.exists():
+                        old.unlink()
+            # Single row per call - no OpenMP thread pool
+            return tl2cgen.Predictor(str(libpath), nthread=1)
+        except Exception as e:
+            print(f"Treelite compilation failed, using LightGBM: {e}", file=sys.stderr)
+            return None
+    
     def load_model(self):
         """Load model from disk"""
         try:
-            with open(self.model_path, 'rb') as f:
-                model_data = pickle.load(f)
-            
-            self.base_model = model_data['base_model']
-            self.scaler = model_data['scaler']
+            lgb = self._ml_libs()
+            if os.path.exists(self.model_path):
+                with open(self._scaler_stats_path()) as f:
+                    scaler_data = json.load(f)
+                self.base_model = lgb.Booster(model_file=self.model_path)
+                self._cache_scaler_stats(scaler_data['mean'], scaler_data['scale'])
+            else:
+                # Not retrained since the booster text format: read the old pickle
+                with open(self._legacy_model_path(), 'rb') as f:
+                    model_data = pickle.load(f)
+                self.base_model = model_data['base_model'].booster_
+                self._cache_scaler_stats(model_data['scaler'].mean_, model_data['scaler'].scale_)
+            self._compiled = self._compile_booster()
+            self.clear_prediction_cache()
             
-            print(f"Model loaded from {self.model_path}")
+            # stderr keeps stdout clean for JSON output (see serve())
+            print(f"Model loaded from {self.model_path}", file=sys.stderr)
             return True
         except Exception as e:
             print(f"Failed to load model: {e}", file=sys.stderr)
             return False
 
 
+def _handle_request_line(model, line):
+    """Answer one line-delimited JSON request; returns the response line"""
+    try:
+        features = json.loads(line)
+        if isinstance(features, list):
+            result = model.predict_batch(features)
+        else:
+            result = model.predict(features)
+    except json.JSONDecodeError as e:
+        result = {'error': f'Invalid JSON: {e}'}
+    except Exception as e:
+        result = {'error': f'Prediction failed: {e}'}
+    return json.dumps(result) + '\n'
+
+
+def _remove_stale_socket(socket_path):
+    """
+    Remove a socket left behind by an earlier server at socket_path
+    
+    Raises FileExistsError if the path exists but is not a socket, so a
+    mistyped --socket never deletes a regular file.
+    """
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{socket_path} exists and is not a socket")
+    os.unlink(socket_path)
+
+
+def serve(model, socket_path=None):
+    """
+    Keep a warm model and answer line-delimited JSON prediction requests
+    
+    Each request line holds a feature object (or an array of them for batch
+    scoring) and gets exactly one JSON response line back.
+    
+    Args:
+        model: Loaded QuickModelV2 instance
+        socket_path: Serve on this UNIX socket instead of stdin/stdout (optional)
+    
+    Raises:
+        FileExistsError: socket_path exists and is not a socket
+    """
+    if socket_path is not None:
+        _remove_stale_socket(socket_path)
+    model.warm_up()
+    
+    if socket_path is None:
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            sys.stdout.write(_handle_request_line(model, line))
+            sys.stdout.flush()
+        return
+    
+    import socketserver
+    
+    class PredictionHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                self.wfile.write(_handle_request_line(model, line).encode())
+                self.wfile.flush()
+    
+    with socketserver.UnixStreamServer(socket_path, PredictionHandler) as server:
+        print(f"Serving predictions on {socket_path}", file=sys.stderr)
+        server.serve_forever()
+
+
 def main():
     """CLI interface"""
     parser = argparse.ArgumentParser(description='Quick Model V2 - Stock Prediction')
-    parser.add_argument('action', choices=['predict', 'train'], help='Action to perform')
+    parser.add_argument('action', choices=['predict', 'train', 'serve'], help='Action to perform')
     parser.add_argument('--symbol', type=str, help='Stock symbol')
-    parser.add_argument('--features', type=str, help='Features as JSON string')
+    parser.add_argument('--features', type=str, help='Features as JSON string (object, or array of objects for batch)')
     parser.add_argument('--model-path', type=str, help='Path to model file')
+    parser.add_argument('--socket', type=str, help='UNIX socket path for serve (default: stdin/stdout)')
     
     args = parser.parse_args()
     
@@ -587,7 +1352,10 @@ def main():
         
         try:
             features = json.loads(args.features)
-            result = model.predict(features)
+            if isinstance(features, list):
+                result = model.predict_batch(features)
+            else:
+                result = model.predict(features)
             print(json.dumps(result, indent=2))
         except json.JSONDecodeError as e:
             print(json.dumps({'error': f'Invalid JSON: {e}'}))
@@ -596,6 +1364,13 @@ def main():
             print(json.dumps({'error': f'Prediction failed: {e}'}))
             sys.exit(1)
     
+    elif args.action == 'serve':
+        try:
+            serve(model, socket_path=args.socket)
+        except FileExistsError as e:
+            print(json.dumps({'error': str(e)}))
+            sys.exit(1)
+    
     elif args.action == 'train':
         print(json.dumps({
             'error': 'Training requires data. Use Python API directly for training.',
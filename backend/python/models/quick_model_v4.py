@@ -33,7 +33,11 @@ import sys
 import json
 import os
 import argparse
-import pickle
+import hashlib
+import importlib.util
+import math
+import time
+from collections import OrderedDict
 import numpy as np
 from datetime import datetime
 from pathlib import Path
@@ -42,14 +46,255 @@ from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+# LightGBM / scikit-learn are imported lazily on the train and load paths
+# (see QuickModelV4._ml_libs); only check that they are installed here
+HAS_ML_LIBS = all(importlib.util.find_spec(m) is not None for m in ('lightgbm', 'sklearn'))
+if not HAS_ML_LIBS:
+    print("Warning: ML libraries not installed. Install with: pip install lightgbm scikit-learn", file=sys.stderr)
+
 try:
-    import lightgbm as lgb
-    from sklearn.preprocessing import StandardScaler
-    from sklearn.model_selection import train_test_split
-    HAS_ML_LIBS = True
+    import orjson
+
+    def _dumps(obj):
+        """Compact JSON via orjson, which also encodes NumPy scalars"""
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
 except ImportError:
-    HAS_ML_LIBS = False
-    print("Warning: ML libraries not installed. Install with: pip install lightgbm scikit-learn", file=sys.stderr)
+    _dumps = json.dumps
+
+try:
+    from .jit_kernels import kernel, compile_kernels
+except ImportError:
+    # Run as a script: the models directory is on sys.path
+    from jit_kernels import kernel, compile_kernels
+
+
+# Correction direction codes used by the scoring kernels
+DIRECTION_CODES = {'DOWN': -1, 'NEUTRAL': 0, 'UP': 1}
+DIRECTION_NAMES = {-1: 'DOWN', 0: 'NEUTRAL', 1: 'UP'}
+
+# Correction pattern descriptions, indexed by bit position in the
+# _correction_njit pattern mask: (printf template, feature it formats or None)
+_PATTERN_TEMPLATES = (
+    ('Overbought RSI-14: %.1f', 'rsi_14'),
+    ('Oversold RSI-14: %.1f', 'rsi_14'),
+    ('Parabolic rise: +%.1f%% (7d)', 'price_change_7d'),
+    ('Extended decline: %.1f%% (7d)', 'price_change_7d'),
+    ('Upper BB breakout + overbought', None),
+    ('Lower BB breakdown + oversold', None),
+    ('Volume exhaustion at highs', None),
+)
+
+# Expected move bands: a signal strength above _MOVE_THRESH[i - 1] (up to
+# and including _MOVE_THRESH[i]) interpolates between _MOVE_LO[i] and
+# _MOVE_HI[i] percent
+_MOVE_THRESH = np.array([0.2, 0.4, 0.6, 0.8])
+_MOVE_LO = np.array([1.2, 1.5, 2.5, 3.5, 5.0])   # Weak ... very strong signal
+_MOVE_HI = np.array([2.0, 3.5, 5.0, 8.0, 12.0])
+
+# Last formatted timestamp: [epoch second, ISO string]
+_ts_cache = [0, '']
+
+
+def _timestamp():
+    """ISO timestamp at second resolution, reformatted at most once per second"""
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache[0] = now
+        _ts_cache[1] = datetime.fromtimestamp(now).isoformat()
+    return _ts_cache[1]
+
+
+def _copy_result(result, **fields):
+    """
+    Copy of a cached prediction dict that the caller may modify freely
+    
+    correction_warning (with the lists and dicts it holds) and top_reasons
+    are copied as well; the other values are immutable.
+    """
+    result = dict(result, **fields)
+    warning = result.get('correction_warning')
+    if warning is not None:
+        result['correction_warning'] = {
+            key: value.copy() if isinstance(value, (list, dict)) else value
+            for key, value in warning.items()
+        }
+    reasons = result.get('top_reasons')
+    if reasons is not None:
+        result['top_reasons'] = list(reasons)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Scoring kernels (compiled with numba on first batch use, see jit_kernels)
+# ---------------------------------------------------------------------------
+
+@kernel(cache=True)
+def _sigmoid_scalar(x):
+    """Sigmoid of a single float, clipped to avoid overflow"""
+    x = min(max(x, -500.0), 500.0)
+    return 1.0 / (1.0 + math.exp(-x))
+
+
+@kernel(cache=True)
+def _expected_move(final_score, volatility_multiplier):
+    """Signed expected % move (see QuickModelV4._calculate_expected_move)"""
+    base_magnitude = abs(final_score)
+    
+    # Interpolate within the band the signal strength falls in and apply the
+    # stock category volatility multiplier
+    band = np.searchsorted(_MOVE_THRESH, base_magnitude)
+    low = _MOVE_LO[band]
+    expected_move = (low + (_MOVE_HI[band] - low) * base_magnitude) * volatility_multiplier
+    
+    # ENFORCE minimum 2% for tech mega-caps (multiplier >= 1.5)
+    expected_move = max(expected_move, 2.0 if volatility_multiplier >= 1.5 else -math.inf)
+    
+    return expected_move * ((final_score >= 0) * 2.0 - 1.0)
+
+
+@kernel(cache=True)
+def _rebound_njit(price_1d, price_3d, price_7d, news, rsi, vol_ratio):
+    """
+    Branchless rebound score from -1 to +1 (see QuickModelV4._detect_rebound_pattern)
+    
+    Each pattern contributes (condition) * value.
+    """
+    score = 0.0
+    
+    # Pattern 1: Strong positive news after recent decline
+    p1 = news > 0.3 and price_7d < 0
+    score += p1 * (0.4 + min(abs(price_7d) / 15, 0.4))
+    score += (p1 and (price_1d > 0 or price_3d > 0)) * 0.2
+    
+    # Pattern 2: V-shape recovery
+    p2 = price_7d < -3 and price_3d > 1 and price_1d > 0
+    score += p2 * min(max((price_1d + price_3d) / 2 / 8, 0.0), 0.5)
+    
+    # Pattern 3: Oversold RSI with positive momentum
+    score += (rsi < 40 and news > 0.2 and price_1d > 0.5) * 0.3
+    
+    # Pattern 4: Significant positive bounce with news
+    score += (price_1d > 2 and news > 0.2) * 0.5
+    
+    # Pattern 5: Recovery from oversold with volume
+    score += (rsi < 35 and vol_ratio > 1.3 and price_1d > 0) * 0.35
+    
+    return min(max(score, -1.0), 1.0)
+
+
+@kernel(cache=True)
+def _correction_njit(rsi14, price_1d, price_3d, price_7d, bb_pct, vol_spike):
+    """
+    Branchless correction pattern scan (see QuickModelV4._detect_correction_warning)
+    
+    Returns:
+        (correction_score, direction_code, pattern_mask) where bit i of the
+        mask marks _PATTERN_TEMPLATES[i] and the direction is that of the
+        last matching pattern
+    """
+    # Pattern conditions and their expected correction direction
+    c1 = rsi14 > 75                                        # Extreme overbought (DOWN)
+    c2 = rsi14 < 25                                        # Extreme oversold (UP)
+    c3 = price_7d > 10 and price_3d > 5 and rsi14 > 70     # Parabolic rise (DOWN)
+    c4 = price_7d < -10 and rsi14 < 35                     # Extended decline (UP)
+    c5 = bb_pct > 0.95 and rsi14 > 65                      # Upper BB breakout (DOWN)
+    c6 = bb_pct < 0.05 and rsi14 < 40                      # Lower BB breakdown (UP)
+    c7 = vol_spike != 0 and rsi14 > 70 and price_1d > 3    # Volume exhaustion (DOWN)
+    
+    correction_score = (
+        c1 * min((rsi14 - 70) * 10, 40.0) +
+        c2 * min((30 - rsi14) * 10, 40.0) +
+        c3 * 30.0 + c4 * 25.0 + c5 * 20.0 + c6 * 20.0 + c7 * 25.0
+    )
+    
+    direction = 0
+    for cond, code in ((c1, -1), (c2, 1), (c3, -1), (c4, 1), (c5, -1), (c6, 1), (c7, -1)):
+        direction = code if cond else direction
+    
+    mask = c1 | (c2 << 1) | (c3 << 2) | (c4 << 3) | (c5 << 4) | (c6 << 5) | (c7 << 6)
+    
+    return min(correction_score, 100.0), direction, mask
+
+
+@kernel(cache=True)
+def _score_core(local_score, rebound_boost, european_score, asian_score,
+                local_weight, european_weight, asian_weight,
+                correction_score, correction_direction, volatility_multiplier):
+    """
+    Numeric core of QuickModelV4.predict
+    
+    Args:
+        correction_direction: DIRECTION_CODES value (-1 DOWN, 0 none, +1 UP)
+    
+    Returns:
+        (local_score, raw_final_score, final_score, probability, expected_move)
+    """
+    # Strong rebound detected - apply stronger boost to local score
+    if rebound_boost > 0.3:
+        local_score = min(max(local_score + rebound_boost * 0.35, -1.0), 1.0)
+    
+    # Ensemble scoring with weighted contributions
+    final_score = (
+        european_score * european_weight +
+        asian_score * asian_weight +
+        local_score * local_weight
+    )
+    
+    # Adjust final score based on correction warnings
+    adjusted_score = final_score
+    if correction_direction < 0 and final_score > 0:
+        # Downward correction expected but model says bullish
+        adjusted_score = final_score * (1 - (correction_score / 100 * 0.5))
+    elif correction_direction > 0 and final_score < 0:
+        # Upward correction expected but model says bearish
+        if correction_score > 60:
+            # Strong oversold - flip to bullish
+            adjusted_score = abs(final_score) * 0.7
+        else:
+            # Moderate oversold - reduce bearish
+            adjusted_score = final_score * (1 - (correction_score / 100 * 0.4))
+    
+    probability = _sigmoid_scalar(adjusted_score * 5)
+    expected_move = _expected_move(adjusted_score, volatility_multiplier)
+    
+    return local_score, final_score, adjusted_score, probability, expected_move
+
+
+@kernel(cache=True)
+def _score_batch(local_score, price_1d, price_3d, price_7d, news, rsi, vol_ratio,
+                 bb_pct, vol_spike, european_score, asian_score,
+                 local_weight, european_weight, asian_weight, volatility_multiplier):
+    """
+    Row-wise rebound, correction and ensemble scoring for QuickModelV4.predict_batch
+    
+    Returns:
+        (scores, correction_direction, correction_mask) where scores rows are
+        local_score, raw_final_score, final_score, probability, expected_move
+        and correction_score
+    """
+    n = local_score.shape[0]
+    scores = np.empty((6, n))
+    correction_direction = np.empty(n, dtype=np.int64)
+    correction_mask = np.empty(n, dtype=np.int64)
+    
+    for i in range(n):
+        rebound = _rebound_njit(price_1d[i], price_3d[i], price_7d[i],
+                                news[i], rsi[i], vol_ratio[i])
+        correction_score, direction, mask = _correction_njit(
+            rsi[i], price_1d[i], price_3d[i], price_7d[i], bb_pct[i], vol_spike[i]
+        )
+        (scores[0, i], scores[1, i], scores[2, i],
+         scores[3, i], scores[4, i]) = _score_core(
+            local_score[i], rebound, european_score[i], asian_score[i],
+            local_weight, european_weight, asian_weight,
+            correction_score, direction, volatility_multiplier[i]
+        )
+        scores[5, i] = correction_score
+        correction_direction[i] = direction
+        correction_mask[i] = mask
+    
+    return scores, correction_direction, correction_mask
+
 
 
 class QuickModelV4:
@@ -57,6 +302,36 @@ class QuickModelV4:
     Quick Model V4 - Advanced prediction model with Local US (50%), European (30%), and Asian (20%) markets
     """
     
+    # Lazily imported ML modules, shared by all instances
+    _lgb = None
+    _StandardScaler = None
+    
+    # Reason text templates (printf-style, formatted only when reasons are wanted)
+    _TMPL_EUROPEAN = 'European markets show %s momentum (%+.2f) with 30%% weight in model'
+    _TMPL_ASIAN = 'Asian markets indicate %s direction (%+.2f) with 20%% weight in model'
+    _TMPL_NEWS = 'News sentiment is %s (%+.2f)'
+    _TMPL_RSI_OVERBOUGHT = 'RSI shows overbought conditions (%.1f)'
+    _TMPL_RSI_OVERSOLD = 'RSI indicates oversold bounce potential (%.1f)'
+    _TMPL_MOMENTUM = 'Strong 1-day momentum %s (%+.1f%%)'
+    _TMPL_CORRECTION = 'Correction warning: %s (%s)'
+    _TMPL_ENSEMBLE = 'Overall ensemble signal is %s (%+.2f)'
+    
+    # LGBMClassifier hyperparameters. num_leaves stays within what max_depth
+    # can reach and max_bin=63 keeps bin indices and histograms small.
+    _LGB_PARAMS = {
+        'objective': 'binary',
+        'n_estimators': 200,
+        'max_depth': 6,
+        'learning_rate': 0.05,
+        'num_leaves': min(31, 2 ** 6 - 1),
+        'min_child_samples': 20,
+        'subsample': 0.8,
+        'colsample_bytree': 0.8,
+        'max_bin': 63,
+        'random_state': 42,
+        'verbose': -1
+    }
+    
     def __init__(self, model_path=None):
         """
         Initialize the model
@@ -65,7 +340,12 @@ class QuickModelV4:
             model_path: Path to saved model file (optional)
         """
         self.base_model = None
-        self.scaler = StandardScaler()
+        self._booster = None
+        self._treelite_predictor = None
+        self.scaler = None  # Created by train()
+        self._scaler_stats = None
+        self._scaler_mean = None
+        self._scaler_inv = None
         self.model_path = model_path or self._get_default_model_path()
         
         # Configuration - Market influence weights
@@ -73,6 +353,14 @@ class QuickModelV4:
         self.european_weight = 0.30  # 30% weight
         self.asian_weight = 0.20     # 20% weight
         
+        # Raw score margin past which LightGBM stops walking further trees
+        self.pred_early_stop_margin = float(os.getenv('PRED_EARLY_STOP_MARGIN', '10.0'))
+        
+        # LRU cache of predict() results keyed on the feature items
+        # (0 disables it)
+        self.predict_cache_size = int(os.getenv('QM_PREDICT_CACHE_SIZE', '1024'))
+        self._predict_cache = OrderedDict()
+        
         # Feature names for validation
         self.base_features = [
             'close', 'high', 'low', 'volume', 'price_change_1d', 'price_change_3d', 'price_change_7d',
@@ -99,10 +387,33 @@ class QuickModelV4:
         
         self.all_features = self.base_features + self.asian_features + self.european_features
         
+        # Feature order, fill-in defaults and reused single-row model input buffers
+        self._all_features_tuple = tuple(self.all_features)
+        self._feature_defaults = {f: 0.0 for f in self._all_features_tuple}
+        self.feature_dtype = np.dtype([(f, np.float32) for f in self._all_features_tuple])
+        self._feature_buf = np.zeros(len(self._all_features_tuple), dtype=np.float32)
+        self._scaled_buf = np.zeros((1, len(self._all_features_tuple)), dtype=np.float32)
+        
         # Load model if exists
         if os.path.exists(self.model_path):
             self.load_model()
     
+    @classmethod
+    def _ml_libs(cls):
+        """Import LightGBM on first use; returns the lightgbm module"""
+        if cls._lgb is None:
+            import lightgbm
+            cls._lgb = lightgbm
+        return cls._lgb
+    
+    @classmethod
+    def _get_scaler(cls):
+        """Create a fresh StandardScaler, importing scikit-learn on first use"""
+        if cls._StandardScaler is None:
+            from sklearn.preprocessing import StandardScaler
+            cls._StandardScaler = StandardScaler
+        return cls._StandardScaler()
+    
     def _get_default_model_path(self):
         """Get default model save path"""
         base_dir = Path(__file__).parent.parent
@@ -122,34 +433,26 @@ class QuickModelV4:
         """
         if not HAS_ML_LIBS:
             raise ImportError("ML libraries required for training")
+        lgb = self._ml_libs()
         
         # Prepare data
         if isinstance(X_train, dict):
-            X_train = self._dict_to_array(X_train)
+            X_train = self._dict_to_array(X_train).copy()
         
         # Fit scaler
+        self.scaler = self._get_scaler()
         self.scaler.fit(X_train)
+        self._cache_scaler_stats(self.scaler.mean_, self.scaler.scale_)
         X_train_scaled = self.scaler.transform(X_train)
         
         # Create and train model
-        self.base_model = lgb.LGBMClassifier(
-            objective='binary',
-            n_estimators=200,
-            max_depth=6,
-            learning_rate=0.05,
-            num_leaves=31,
-            min_child_samples=20,
-            subsample=0.8,
-            colsample_bytree=0.8,
-            random_state=42,
-            verbose=-1
-        )
+        self.base_model = lgb.LGBMClassifier(**self._LGB_PARAMS)
         
         # Training
         eval_set = None
         if X_val is not None and y_val is not None:
             if isinstance(X_val, dict):
-                X_val = self._dict_to_array(X_val)
+                X_val = self._dict_to_array(X_val).copy()
             X_val_scaled = self.scaler.transform(X_val)
             eval_set = [(X_val_scaled, y_val)]
         
@@ -159,30 +462,81 @@ class QuickModelV4:
             eval_metric='auc',
             callbacks=[lgb.early_stopping(stopping_rounds=20, verbose=False)]
         )
+        self._booster = lgb.Booster(model_str=self._float32_model_str(self.base_model.booster_))
         
         # Save model
         self.save_model()
+        self._treelite_predictor = self._compile_booster()
+        self.clear_prediction_cache()
         
         return self
     
-    def predict(self, features):
+    def warm_up(self):
+        """
+        Compile the scoring kernels (or load them from the numba cache)
+        
+        Until then single predictions run the kernels as plain Python, so a
+        one-shot CLI call never imports numba. Batch predictions compile on
+        first use; serve() calls this at startup so the first request does
+        not pay for it.
+        """
+        compile_kernels(globals())
+        _score_core(0.0, 0.0, 0.0, 0.0, 0.5, 0.3, 0.2, 0.0, 0, 1.0)
+        _rebound_njit(0.0, 0.0, 0.0, 0.0, 50.0, 1.0)
+        _correction_njit(50.0, 0.0, 0.0, 0.0, 0.5, 0.0)
+    
+    def predict(self, features, want_reasons=True, timestamp=None):
         """
         Make prediction with local US (50%), European (30%), and Asian (20%) influence
         
+        Repeated calls with equal feature dicts are answered from an LRU cache
+        with a fresh timestamp. Every call returns its own copy, so changing
+        a result (nested values included) does not affect later calls.
+        Features holding unhashable values (lists, dicts) are never cached.
+        
         Args:
             features: Dict of feature values
+            want_reasons: Build human-readable top_reasons and correction
+                patterns (None when False)
+            timestamp: ISO timestamp to stamp the result with (optional,
+                defaults to the current second)
             
         Returns:
             Dict with prediction results
         """
+        if self.predict_cache_size <= 0:
+            return self._predict_uncached(features, want_reasons, timestamp)
+        
+        try:
+            key = (want_reasons,) + tuple(sorted(features.items()))
+            hash(key)
+        except (TypeError, AttributeError):
+            return self._predict_uncached(features, want_reasons, timestamp)
+        
+        cache = self._predict_cache
+        result = cache.get(key)
+        if result is not None:
+            cache.move_to_end(key)
+            return _copy_result(result, timestamp=timestamp or _timestamp())
+        
+        result = self._predict_uncached(features, want_reasons, timestamp)
+        cache[key] = result
+        if len(cache) > self.predict_cache_size:
+            cache.popitem(last=False)
+        return _copy_result(result)
+    
+    def clear_prediction_cache(self):
+        """Drop all memoized predict() results"""
+        self._predict_cache.clear()
+    
+    def _predict_uncached(self, features, want_reasons=True, timestamp=None):
+        """Run the full prediction pipeline for one feature dict"""
         # Validate features
         features = self._validate_features(features)
         
         # Extract market features
         european_influence_score = features.get('european_influence_score', 0)
-        european_avg_change = features.get('european_avg_change', 0)
         asian_influence_score = features.get('asian_influence_score', 0)
-        asian_avg_change = features.get('asian_avg_change', 0)
         
         # CRITICAL: Use pre-calculated local_us_influence_score from backend
         # This score already combines news sentiment, technicals, momentum, and Fear & Greed
@@ -197,126 +551,204 @@ class QuickModelV4:
             local_score = self._fallback_prediction(features)
         else:
             # ML model prediction
+            # float32 end to end; LightGBM accepts it without a copy
             X = self._dict_to_array(features)
-            X_scaled = self.scaler.transform(X.reshape(1, -1))
-            base_prob = self.base_model.predict_proba(X_scaled)[0, 1]
+            X_scaled = self._scaled_buf
+            np.subtract(X, self._scaler_mean, out=X_scaled[0])
+            np.multiply(X_scaled[0], self._scaler_inv, out=X_scaled[0])
+            base_prob = float(self._predict_proba(X_scaled)[0])
             local_score = (base_prob - 0.5) * 2  # Convert to -1..+1
         
-        # CRITICAL: Check for rebound patterns and boost signal
-        rebound_boost = self._detect_rebound_pattern(features)
-        if rebound_boost > 0.3:
-            # Strong rebound detected - apply stronger boost to local score
-            local_score = local_score + (rebound_boost * 0.35)
-            local_score = np.clip(local_score, -1, 1)
-        
-        # Calculate European market contribution (30% weight)
-        european_score = np.sign(european_influence_score) * abs(european_influence_score)
-        european_contribution = european_score * self.european_weight
+        # ADVANCED: Detect correction warning BEFORE finalizing prediction
+        correction_warning = self._detect_correction_warning(features, want_reasons)
         
-        # Calculate Asian market contribution (20% weight)
-        asian_score = np.sign(asian_influence_score) * abs(asian_influence_score)
-        asian_contribution = asian_score * self.asian_weight
+        # CRITICAL: Get volatility multiplier for sector-based predictions
+        volatility_multiplier = float(features.get('volatility_multiplier', 1.0))
         
-        # Calculate local contribution (50% weight)
-        local_contribution = local_score * self.local_weight
+        # Rebound boost, weighted ensemble, correction adjustment, probability
+        # and expected move are computed in one compiled kernel
+        (local_score, final_score, final_score_with_correction,
+         probability, expected_pct_move) = _score_core(
+            float(local_score),
+            float(self._detect_rebound_pattern(features)),
+            float(european_influence_score),
+            float(asian_influence_score),
+            self.local_weight, self.european_weight, self.asian_weight,
+            float(correction_warning['correction_score']),
+            DIRECTION_CODES[correction_warning['direction']],
+            volatility_multiplier
+        )
         
-        # Ensemble scoring with weighted contributions
-        final_score = (
-            european_contribution +
-            asian_contribution +
-            local_contribution
+        return self._build_result(
+            features, local_score, final_score, final_score_with_correction,
+            probability, expected_pct_move, correction_warning, want_reasons, timestamp
         )
+    
+    def predict_batch(self, features_df, want_reasons=True, timestamp=None):
+        """
+        Make predictions for many rows at once
         
-        # ADVANCED: Detect correction warning BEFORE finalizing prediction
-        correction_warning = self._detect_correction_warning(features)
+        The ML model is called once for the whole batch and the rebound,
+        correction and ensemble scoring runs in a single compiled loop.
         
-        # CRITICAL: Adjust final score based on correction warnings
-        correction_adjusted_score = final_score
-        if correction_warning['warning']:
-            correction_score = correction_warning['correction_score']
-            correction_direction = correction_warning['direction']
+        Args:
+            features_df: pandas DataFrame or list of feature dicts
+            want_reasons: Build human-readable top_reasons and correction
+                patterns (None when False)
+            timestamp: ISO timestamp shared by every result (optional)
             
-            # Apply correction adjustment
-            if correction_direction == 'DOWN' and final_score > 0:
-                # Downward correction expected but model says bullish
-                adjustment_factor = correction_score / 100  # 0 to 1
-                correction_adjusted_score = final_score * (1 - (adjustment_factor * 0.5))
-                
-            elif correction_direction == 'UP' and final_score < 0:
-                # Upward correction expected but model says bearish
-                if correction_score > 60:
-                    # Strong oversold - flip to bullish
-                    correction_adjusted_score = abs(final_score) * 0.7
-                else:
-                    # Moderate oversold - reduce bearish
-                    adjustment_factor = correction_score / 100
-                    correction_adjusted_score = final_score * (1 - (adjustment_factor * 0.4))
-        
-        # Use correction-adjusted score for final prediction
-        final_score_with_correction = correction_adjusted_score
-        
-        # Convert to probability
-        probability = self._sigmoid(final_score_with_correction * 5)
+        Returns:
+            List of prediction dicts, in input order
+        """
+        import pandas as pd
+        
+        if isinstance(features_df, pd.DataFrame):
+            frame = features_df
+            # Empty cells count as missing features, like absent dict keys
+            records = [
+                {key: value for key, value in row.items() if pd.notna(value)}
+                for row in features_df.to_dict('records')
+            ]
+        else:
+            records = list(features_df)
+            frame = pd.DataFrame.from_records(records)
         
-        # Determine label
-        label = 'BULLISH' if final_score_with_correction > 0 else 'BEARISH'
+        if not records:
+            return []
         
-        # CRITICAL: Get volatility multiplier for sector-based predictions
-        volatility_multiplier = float(features.get('volatility_multiplier', 1.0))
-        category = features.get('category', 'Unknown')
+        X = frame.reindex(columns=self._all_features_tuple, fill_value=0.0).fillna(0.0).to_numpy(dtype=np.float64)
+        validated = [self._validate_features(features) for features in records]
+        return self._predict_matrix(X, validated, want_reasons, timestamp)
+    
+    def predict_soa(self, arr, volatility_multiplier=1.0, want_reasons=True, timestamp=None):
+        """
+        Make predictions for a structured float32 array of feature rows
         
-        # Calculate expected move with volatility multiplier
-        expected_pct_move = self._calculate_expected_move(
-            final_score_with_correction,
-            features.get('atr_14', 0),
-            features.get('bb_width', 0),
-            volatility_multiplier
+        Args:
+            arr: Array with dtype self.feature_dtype (one float32 field per
+                feature, in all_features order)
+            volatility_multiplier: Stock category multiplier, scalar or one per row
+            want_reasons: Build human-readable top_reasons and correction
+                patterns (None when False)
+            timestamp: ISO timestamp shared by every result (optional)
+            
+        Returns:
+            List of prediction dicts, in input order
+        """
+        if arr.dtype != self.feature_dtype:
+            raise ValueError(f'Expected dtype {self.feature_dtype}, got {arr.dtype}')
+        if len(arr) == 0:
+            return []
+        
+        # Packed float32 fields: the records reinterpret as an (n, F) matrix
+        X = np.ascontiguousarray(arr).view(np.float32).reshape(len(arr), -1).astype(np.float64)
+        multipliers = np.broadcast_to(np.asarray(volatility_multiplier, dtype=np.float64), (len(arr),))
+        validated = [
+            dict(zip(self._all_features_tuple, row), volatility_multiplier=multiplier)
+            for row, multiplier in zip(X.tolist(), multipliers.tolist())
+        ]
+        return self._predict_matrix(X, validated, want_reasons, timestamp)
+    
+    def _predict_matrix(self, X, validated, want_reasons=True, timestamp=None):
+        """
+        Shared tail of predict_batch and predict_soa
+        
+        Args:
+            X: float64 (n, F) feature matrix in all_features order
+            validated: Validated feature dict per row (for the rule-based
+                fallback, volatility multipliers and reasons)
+        """
+        compile_kernels(globals())
+        if self.base_model is None:
+            local_scores = np.array([self._fallback_prediction(features) for features in validated],
+                                    dtype=np.float64)
+        else:
+            X_scaled = (X.astype(np.float32) - self._scaler_mean) * self._scaler_inv
+            base_probs = self._predict_proba(X_scaled)
+            local_scores = (base_probs - 0.5) * 2
+        
+        column = {name: X[:, idx] for idx, name in enumerate(self._all_features_tuple)}
+        volatility_multipliers = np.array(
+            [float(features.get('volatility_multiplier', 1.0)) for features in validated],
+            dtype=np.float64
         )
         
-        # Generate top reasons (include market influences)
-        top_reasons = self._generate_reasons(
-            features, final_score_with_correction, 
-            european_influence_score, asian_influence_score, 
-            local_score, correction_warning
+        scores, directions, masks = _score_batch(
+            local_scores,
+            column['price_change_1d'], column['price_change_3d'], column['price_change_7d'],
+            column['news_sentiment_score'], column['rsi_14'], column['volume_sma_ratio'],
+            column['bb_pct'], (column['volume_spike'] != 0).astype(np.float64),
+            column['european_influence_score'], column['asian_influence_score'],
+            self.local_weight, self.european_weight, self.asian_weight,
+            volatility_multipliers
         )
         
+        timestamp = timestamp or _timestamp()
+        results = []
+        for i, features in enumerate(validated):
+            correction_warning = self._correction_result(
+                scores[5, i], int(directions[i]), int(masks[i]), features, want_reasons
+            )
+            results.append(self._build_result(
+                features, scores[0, i], scores[1, i], scores[2, i],
+                scores[3, i], scores[4, i], correction_warning, want_reasons, timestamp
+            ))
+        
+        return results
+    
+    def _build_result(self, features, local_score, final_score, final_score_with_correction,
+                      probability, expected_pct_move, correction_warning,
+                      want_reasons=True, timestamp=None):
+        """Assemble the prediction dict returned by predict and predict_batch"""
+        european_influence_score = features.get('european_influence_score', 0)
+        asian_influence_score = features.get('asian_influence_score', 0)
+        
+        european_contribution = european_influence_score * self.european_weight
+        asian_contribution = asian_influence_score * self.asian_weight
+        local_contribution = local_score * self.local_weight
+        
+        # Determine label
+        label = 'BULLISH' if final_score_with_correction > 0 else 'BEARISH'
+        
+        # Generate top reasons (include market influences; skipped for machine consumers)
+        top_reasons = None
+        if want_reasons:
+            top_reasons = self._generate_reasons(
+                features, final_score_with_correction, 
+                european_influence_score, asian_influence_score, 
+                local_score, correction_warning
+            )
+        
         return {
             'label': label,
-            'probability': float(probability),
-            'expected_pct_move': float(expected_pct_move),
+            'probability': probability,
+            'expected_pct_move': expected_pct_move,
             'european_influence_score': float(european_influence_score),
-            'european_impact_percent': float(self.european_weight),
-            'european_contribution': float(european_contribution),
+            'european_impact_percent': self.european_weight,
+            'european_contribution': european_contribution,
             'asian_influence_score': float(asian_influence_score),
-            'asian_impact_percent': float(self.asian_weight),
-            'asian_contribution': float(asian_contribution),
-            'local_score': float(local_score),
-            'local_impact_percent': float(self.local_weight),
-            'local_contribution': float(local_contribution),
-            'base_score': float(local_score),
-            'final_score': float(final_score_with_correction),
+            'asian_impact_percent': self.asian_weight,
+            'asian_contribution': asian_contribution,
+            'local_score': local_score,
+            'local_impact_percent': self.local_weight,
+            'local_contribution': local_contribution,
+            'base_score': local_score,
+            'final_score': final_score_with_correction,
             'correction_warning': correction_warning,
-            'correction_adjusted': bool(correction_adjusted_score != final_score),
+            'correction_adjusted': bool(final_score_with_correction != final_score),
             'top_reasons': top_reasons,
             'model_version': 'quick_model_v4',
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp or _timestamp()
         }
     
     def _validate_features(self, features):
         """Validate and fill missing features"""
-        validated = {}
-        
-        # Fill base features
-        for feature in self.base_features:
-            validated[feature] = features.get(feature, 0.0)
-        
-        # Fill Asian features
-        for feature in self.asian_features:
-            validated[feature] = features.get(feature, 0.0)
-        
-        # Fill European features
-        for feature in self.european_features:
-            validated[feature] = features.get(feature, 0.0)
+        # Base, Asian and European features in one C-level pass, missing ones
+        # taken from the precomputed defaults
+        validated = dict(zip(
+            self._all_features_tuple,
+            map(features.get, self._all_features_tuple, self._feature_defaults.values())
+        ))
         
         # CRITICAL: Preserve non-feature metadata like volatility_multiplier and category
         # These are used for sector-aware predictions but are NOT training features
@@ -329,13 +761,66 @@ class QuickModelV4:
         
         return validated
     
+    def _predict_proba(self, X_scaled):
+        """
+        Bullish probability per row from the raw LightGBM booster
+        
+        Uses the treelite-compiled library when available. Otherwise bypasses
+        the sklearn wrapper's input checks and uses prediction early stopping,
+        which stops walking trees once the raw margin is confidently past
+        pred_early_stop_margin.
+        """
+        if self._treelite_predictor is not None:
+            import tl2cgen
+            return np.ravel(self._treelite_predictor.predict(tl2cgen.DMatrix(X_scaled)))
+        return self._booster.predict(
+            X_scaled,
+            num_iteration=self._booster.best_iteration,
+            pred_early_stop=True,
+            pred_early_stop_freq=10,
+            pred_early_stop_margin=self.pred_early_stop_margin
+        )
+    
+    @staticmethod
+    def _float32_model_str(booster):
+        """
+        LightGBM text model with leaf values rounded to float32 precision
+        
+        Keeps only the trees up to the best iteration. The shorter leaf
+        literals make the saved text model smaller and faster to parse.
+        """
+        lines = []
+        for line in booster.model_to_string(num_iteration=booster.best_iteration).split('\n'):
+            if line.startswith('leaf_value='):
+                values = np.array(line[len('leaf_value='):].split(), dtype=np.float32)
+                line = 'leaf_value=' + ' '.join(map(str, values))
+            elif line.startswith('tree_sizes='):
+                # Byte offsets of the original tree blocks; LightGBM parses
+                # the trees sequentially without them
+                continue
+            lines.append(line)
+        return '\n'.join(lines)
+    
+    def _cache_scaler_stats(self, mean, scale):
+        """Cache scaler mean and inverse scale so predict() skips sklearn validation"""
+        self._scaler_stats = (np.array(mean, dtype=np.float64), np.array(scale, dtype=np.float64))
+        self._scaler_mean = np.asarray(mean, dtype=np.float32)
+        self._scaler_inv = (1.0 / np.asarray(scale, dtype=np.float64)).astype(np.float32)
+    
     def _dict_to_array(self, features):
-        """Convert feature dict to numpy array"""
-        return np.array([features.get(f, 0.0) for f in self.all_features])
+        """
+        Fill the reused float32 feature buffer from a feature dict
+        
+        The returned array is overwritten by the next call; copy it to keep it.
+        """
+        buf = self._feature_buf
+        for i, name in enumerate(self._all_features_tuple):
+            buf[i] = features.get(name, 0.0)
+        return buf
     
     def _sigmoid(self, x):
         """Sigmoid activation"""
-        return 1 / (1 + np.exp(-np.clip(x, -500, 500)))
+        return _sigmoid_scalar(x)
     
     def _fallback_prediction(self, features):
         """
@@ -359,8 +844,8 @@ class QuickModelV4:
         price_change_3d = features.get('price_change_3d', 0)
         
         # Reduced dampening for stronger signals
-        momentum_score = np.tanh(price_change_1d / 3) * 0.20  # 1-day: 20%
-        momentum_score += np.tanh(price_change_3d / 8) * 0.10  # 3-day: 10%
+        momentum_score = math.tanh(price_change_1d / 3) * 0.20  # 1-day: 20%
+        momentum_score += math.tanh(price_change_3d / 8) * 0.10  # 3-day: 10%
         
         # BOOST: Strong moves (>1%) get extra amplification
         if abs(price_change_1d) > 1.0:
@@ -375,7 +860,7 @@ class QuickModelV4:
         # Simplified: Just use absolute momentum since we may not have SPY data
         # In production, would compare to SPY change
         relative_strength = price_change_1d * 0.15  # Approximate
-        score += np.clip(relative_strength, -0.15, 0.15)
+        score += min(max(relative_strength, -0.15), 0.15)
         
         # ================================================================
         # 3. INTRADAY POSITION (10% weight)
@@ -431,7 +916,7 @@ class QuickModelV4:
         score += rsi_score * 0.05
         
         # MACD: 5% weight
-        score += np.clip(macd_hist / 10, -0.05, 0.05)
+        score += min(max(macd_hist / 10, -0.05), 0.05)
         
         # ================================================================
         # 7. OVERALL NEWS SENTIMENT (5% weight)
@@ -447,7 +932,7 @@ class QuickModelV4:
             # Strong rebound detected - boost signal
             score += rebound_score * 0.2
         
-        return np.clip(score, -1, 1)
+        return min(max(score, -1.0), 1.0)
     
     def _detect_rebound_pattern(self, features):
         """
@@ -456,118 +941,54 @@ class QuickModelV4:
         
         Returns: score from -1 to +1 indicating rebound strength
         """
-        score = 0
-        
-        price_change_1d = features.get('price_change_1d', 0)
-        price_change_3d = features.get('price_change_3d', 0)
-        price_change_7d = features.get('price_change_7d', 0)
-        news_sentiment = features.get('news_sentiment_score', 0)
-        rsi = features.get('rsi_14', 50)
-        
-        # Pattern 1: Strong positive news after recent decline
-        if news_sentiment > 0.3 and price_change_7d < 0:
-            strength = min(abs(price_change_7d) / 15, 0.4)
-            score += 0.4 + strength
-            
-            if price_change_1d > 0 or price_change_3d > 0:
-                score += 0.2
-        
-        # Pattern 2: V-shape recovery
-        if price_change_7d < -3 and price_change_3d > 1 and price_change_1d > 0:
-            recovery_strength = (price_change_1d + price_change_3d) / 2
-            score += np.clip(recovery_strength / 8, 0, 0.5)
-        
-        # Pattern 3: Oversold RSI with positive momentum
-        if rsi < 40 and news_sentiment > 0.2:
-            if price_change_1d > 0.5:
-                score += 0.3
-        
-        # Pattern 4: Significant positive bounce with news
-        if price_change_1d > 2 and news_sentiment > 0.2:
-            score += 0.5
-        
-        # Pattern 5: Recovery from oversold with volume
-        volume_ratio = features.get('volume_sma_ratio', 1.0)
-        if rsi < 35 and volume_ratio > 1.3 and price_change_1d > 0:
-            score += 0.35
-        
-        return np.clip(score, -1, 1)
+        return _rebound_njit(
+            float(features.get('price_change_1d', 0)),
+            float(features.get('price_change_3d', 0)),
+            float(features.get('price_change_7d', 0)),
+            float(features.get('news_sentiment_score', 0)),
+            float(features.get('rsi_14', 50)),
+            float(features.get('volume_sma_ratio', 1.0))
+        )
     
-    def _detect_correction_warning(self, features):
+    def _detect_correction_warning(self, features, want_patterns=True):
         """
         Detect potential market correction scenarios
         
         Returns: Dict with correction warning info
         """
-        warning = False
-        correction_score = 0
-        direction = 'NEUTRAL'
-        patterns = []
+        correction_score, direction_code, mask = _correction_njit(
+            float(features.get('rsi_14', 50)),
+            float(features.get('price_change_1d', 0)),
+            float(features.get('price_change_3d', 0)),
+            float(features.get('price_change_7d', 0)),
+            float(features.get('bb_pct', 0.5)),
+            1.0 if features.get('volume_spike', False) else 0.0
+        )
         
-        rsi_14 = features.get('rsi_14', 50)
-        rsi_7 = features.get('rsi_7', 50)
-        price_change_7d = features.get('price_change_7d', 0)
-        price_change_3d = features.get('price_change_3d', 0)
-        bb_pct = features.get('bb_pct', 0.5)
-        volume_spike = features.get('volume_spike', False)
-        
-        # Pattern 1: Extreme overbought (correction DOWN expected)
-        if rsi_14 > 75:
-            warning = True
-            direction = 'DOWN'
-            severity = min((rsi_14 - 70) * 10, 40)
-            correction_score += severity
-            patterns.append(f'Overbought RSI-14: {rsi_14:.1f}')
-        
-        # Pattern 2: Extreme oversold (correction UP expected)
-        if rsi_14 < 25:
-            warning = True
-            direction = 'UP'
-            severity = min((30 - rsi_14) * 10, 40)
-            correction_score += severity
-            patterns.append(f'Oversold RSI-14: {rsi_14:.1f}')
-        
-        # Pattern 3: Parabolic rise
-        if price_change_7d > 10 and price_change_3d > 5 and rsi_14 > 70:
-            warning = True
-            direction = 'DOWN'
-            correction_score += 30
-            patterns.append(f'Parabolic rise: +{price_change_7d:.1f}% (7d)')
-        
-        # Pattern 4: Extended decline with oversold
-        if price_change_7d < -10 and rsi_14 < 35:
-            warning = True
-            direction = 'UP'
-            correction_score += 25
-            patterns.append(f'Extended decline: {price_change_7d:.1f}% (7d)')
-        
-        # Pattern 5: Upper Bollinger Band breakout
-        if bb_pct > 0.95 and rsi_14 > 65:
-            warning = True
-            direction = 'DOWN'
-            correction_score += 20
-            patterns.append('Upper BB breakout + overbought')
-        
-        # Pattern 6: Lower Bollinger Band breakdown
-        if bb_pct < 0.05 and rsi_14 < 40:
-            warning = True
-            direction = 'UP'
-            correction_score += 20
-            patterns.append('Lower BB breakdown + oversold')
-        
-        # Pattern 7: Volume exhaustion at highs
-        if volume_spike and rsi_14 > 70 and price_change_1d > 3:
-            warning = True
-            direction = 'DOWN'
-            correction_score += 25
-            patterns.append('Volume exhaustion at highs')
-        
-        correction_score = min(correction_score, 100)
+        return self._correction_result(correction_score, direction_code, mask,
+                                       features, want_patterns)
+    
+    def _correction_result(self, correction_score, direction_code, mask, features,
+                           want_patterns=True):
+        """
+        Build the correction warning dict from _correction_njit outputs
+        
+        Pattern descriptions are formatted from _PATTERN_TEMPLATES only for
+        the bits set in mask, reading their numbers from features, and are
+        None when want_patterns is False.
+        """
+        patterns = [] if want_patterns else None
+        bit = 0
+        while want_patterns and mask >> bit:
+            if mask >> bit & 1:
+                template, key = _PATTERN_TEMPLATES[bit]
+                patterns.append(template % features[key] if key else template)
+            bit += 1
         
         return {
-            'warning': warning,
+            'warning': bool(mask),
             'correction_score': correction_score,
-            'direction': direction,
+            'direction': DIRECTION_NAMES[direction_code],
             'patterns': patterns,
             'severity': 'HIGH' if correction_score > 60 else 'MODERATE' if correction_score > 30 else 'LOW'
         }
@@ -582,44 +1003,7 @@ class QuickModelV4:
             bb_width: Bollinger Band width
             volatility_multiplier: Stock category multiplier (1.0=normal, 2.0=tech giants)
         """
-        base_magnitude = abs(final_score)
-        
-        # Base ranges for predictions - INCREASED for tech stocks
-        # With 1.5-2.5x multipliers, even weak signals should produce 2%+ moves
-        if base_magnitude > 0.8:
-            # Very strong signal - expect major moves
-            expected_range = (5.0, 12.0)
-        elif base_magnitude > 0.6:
-            # Strong signal - expect significant moves
-            expected_range = (3.5, 8.0)
-        elif base_magnitude > 0.4:
-            # Moderate-strong signal
-            expected_range = (2.5, 5.0)
-        elif base_magnitude > 0.2:
-            # Moderate signal - CRITICAL for most predictions
-            # Base 1.5% * 1.8x multiplier = 2.7% ✅
-            expected_range = (1.5, 3.5)
-        else:
-            # Weak signal - even here, tech should be 2%+
-            # Base 1.2% * 1.8x = 2.16% ✅
-            expected_range = (1.2, 2.0)
-        
-        # Interpolate base move
-        base_move = expected_range[0] + (expected_range[1] - expected_range[0]) * base_magnitude
-        
-        # CRITICAL: Apply volatility multiplier for stock category
-        # Technology stocks (NVDA: 2.0x, AVGO: 1.8x, TSLA: 2.5x) get amplified predictions
-        # Finance/Healthcare stocks (1.0-1.2x) get standard predictions
-        expected_move = base_move * volatility_multiplier
-        
-        # ENFORCE minimum 2% for tech mega-caps (multiplier >= 1.5)
-        # This ensures tech giants always have realistic volatile predictions
-        if volatility_multiplier >= 1.5 and abs(expected_move) < 2.0:
-            expected_move = 2.0  # Minimum 2% magnitude
-        
-        # Apply direction based on final_score sign
-        final_move = expected_move if final_score >= 0 else -expected_move
-        return final_move
+        return _expected_move(float(final_score), float(volatility_multiplier))
     
     def _generate_reasons(self, features, final_score, european_influence, 
                          asian_influence, local_score, correction_warning):
@@ -629,102 +1013,210 @@ class QuickModelV4:
         # Market influences with weights
         if abs(european_influence) > 0.1:
             sentiment = 'bullish' if european_influence > 0 else 'bearish'
-            reasons.append(
-                f'European markets show {sentiment} momentum ({european_influence:+.2f}) '
-                f'with 30% weight in model'
-            )
+            reasons.append(self._TMPL_EUROPEAN % (sentiment, european_influence))
         
         if abs(asian_influence) > 0.1:
             sentiment = 'bullish' if asian_influence > 0 else 'bearish'
-            reasons.append(
-                f'Asian markets indicate {sentiment} direction ({asian_influence:+.2f}) '
-                f'with 20% weight in model'
-            )
+            reasons.append(self._TMPL_ASIAN % (sentiment, asian_influence))
         
         # Local factors
         news_sentiment = features.get('news_sentiment_score', 0)
         if abs(news_sentiment) > 0.2:
             sentiment = 'positive' if news_sentiment > 0 else 'negative'
-            reasons.append(f'News sentiment is {sentiment} ({news_sentiment:+.2f})')
+            reasons.append(self._TMPL_NEWS % (sentiment, news_sentiment))
         
         # Technical indicators
         rsi_14 = features.get('rsi_14', 50)
         if rsi_14 > 70:
-            reasons.append(f'RSI shows overbought conditions ({rsi_14:.1f})')
+            reasons.append(self._TMPL_RSI_OVERBOUGHT % rsi_14)
         elif rsi_14 < 30:
-            reasons.append(f'RSI indicates oversold bounce potential ({rsi_14:.1f})')
+            reasons.append(self._TMPL_RSI_OVERSOLD % rsi_14)
         
         # Price momentum
         price_change_1d = features.get('price_change_1d', 0)
         if abs(price_change_1d) > 1:
             direction = 'up' if price_change_1d > 0 else 'down'
-            reasons.append(f'Strong 1-day momentum {direction} ({price_change_1d:+.1f}%)')
+            reasons.append(self._TMPL_MOMENTUM % (direction, price_change_1d))
         
         # Correction warning
         if correction_warning['warning']:
-            reasons.append(
-                f'Correction warning: {correction_warning["direction"]} '
-                f'({correction_warning["severity"]})'
-            )
+            reasons.append(self._TMPL_CORRECTION % (
+                correction_warning['direction'], correction_warning['severity']
+            ))
         
         # Final ensemble score
         direction = 'bullish' if final_score > 0 else 'bearish'
-        reasons.append(f'Overall ensemble signal is {direction} ({final_score:+.2f})')
+        reasons.append(self._TMPL_ENSEMBLE % (direction, final_score))
         
         return reasons[:6]  # Top 6 reasons
     
+    def _booster_path(self):
+        """
+        LightGBM text model stored next to the model file
+        
+        Named <model>.booster.txt so it never coincides with model_path
+        itself, even when that ends in .txt.
+        """
+        return str(Path(self.model_path).with_suffix('.booster.txt'))
+    
     def save_model(self):
-        """Save model to disk"""
-        if self.base_model is not None:
-            with open(self.model_path, 'wb') as f:
-                pickle.dump({
-                    'model': self.base_model,
-                    'scaler': self.scaler,
-                    'features': self.all_features,
-                    'version': 'v4'
-                }, f)
+        """
+        Save model to disk
+        
+        The booster goes to a LightGBM text file and the scaler statistics to
+        an uncompressed joblib file at model_path, so arrays load memory-mapped.
+        """
+        if self._booster is not None:
+            import joblib
+            
+            with open(self._booster_path(), 'w') as f:
+                f.write(self._float32_model_str(self._booster))
+            joblib.dump({
+                'scaler_mean': self._scaler_stats[0],
+                'scaler_scale': self._scaler_stats[1],
+                'features': self.all_features,
+                'version': 'v4'
+            }, self.model_path)
+    
+    def _compile_booster(self):
+        """
+        Compile the LightGBM booster into a native shared library with treelite
+        
+        Each booster version gets its own library next to the model file, named
+        by a hash of the model text: a process keeps using a library it has
+        already loaded even after the file is rebuilt, so a retrained model
+        must not reuse the old path. Libraries of older versions are removed
+        when a new one is built. Returns a single-threaded tl2cgen predictor,
+        or None if treelite is not installed or compilation fails (LightGBM is
+        used instead).
+        """
+        try:
+            import treelite
+            import tl2cgen
+        except ImportError:
+            return None
+        
+        try:
+            lgb = self._ml_libs()
+            # Keep only the trees up to the early-stopping best iteration
+            model_str = self._booster.model_to_string(num_iteration=self._booster.best_iteration)
+            digest = hashlib.sha1(model_str.encode()).hexdigest()[:16]
+            stem = Path(self.model_path).with_suffix('')
+            libpath = stem.parent / f'{stem.name}.{digest}.so'
+            if not libpath.exists():
+                tl_model = treelite.frontend.from_lightgbm(lgb.Booster(model_str=model_str))
+                tl2cgen.export_lib(
+                    tl_model,
+                    toolchain='gcc',
+                    libpath=str(libpath),
+                    params={'parallel_comp': 0, 'quantize': 1}
+                )
+                for old in [stem.parent / f'{stem.name}.so', *stem.parent.glob(f'{stem.name}.*.so')]:
+                    if old != libpath and old.exists():
+                        old.unlink()
+            # Single row per call - no OpenMP thread pool
+            return tl2cgen.Predictor(str(libpath), nthread=1)
+        except Exception as e:
+            print(f"Treelite compilation failed, using LightGBM: {e}", file=sys.stderr)
+            return None
     
     def load_model(self):
         """Load model from disk"""
+        self.clear_prediction_cache()
         try:
-            with open(self.model_path, 'rb') as f:
-                data = pickle.load(f)
-                self.base_model = data['model']
-                self.scaler = data['scaler']
+            import joblib
+            
+            lgb = self._ml_libs()
+            data = joblib.load(self.model_path, mmap_mode='r')
+            if 'model' in data:
+                # Older pickles hold the fitted LGBMClassifier and StandardScaler
+                self._booster = data['model'].booster_
+                self._cache_scaler_stats(data['scaler'].mean_, data['scaler'].scale_)
+            else:
+                self._booster = lgb.Booster(model_file=self._booster_path())
+                self._cache_scaler_stats(data['scaler_mean'], data['scaler_scale'])
+            self.base_model = self._booster
+            self._treelite_predictor = self._compile_booster()
         except Exception as e:
             print(f"Warning: Could not load model from {self.model_path}: {e}", file=sys.stderr)
             self.base_model = None
+            self._booster = None
+            self._treelite_predictor = None
+
+
+def _handle_request_line(model, line):
+    """Answer one line-delimited JSON request; returns the response line"""
+    try:
+        features = json.loads(line)
+        if isinstance(features, list):
+            result = model.predict_batch(features)
+        else:
+            result = model.predict(features)
+    except json.JSONDecodeError as e:
+        result = {'error': f'Invalid JSON: {str(e)}'}
+    except Exception as e:
+        result = {'error': f'Prediction failed: {str(e)}'}
+    return _dumps(result) + '\n'
+
+
+def serve(model):
+    """
+    Keep a warm model and answer line-delimited JSON requests from stdin
+    
+    Each request line holds a feature object (or an array of them for batch
+    scoring) and gets exactly one JSON response line on stdout.
+    
+    Args:
+        model: Loaded QuickModelV4 instance
+    """
+    model.warm_up()
+    
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        sys.stdout.write(_handle_request_line(model, line))
+        sys.stdout.flush()
 
 
 def main():
     """CLI interface for the model"""
     parser = argparse.ArgumentParser(description='Quick Model V4 - Stock Prediction')
     parser.add_argument('action', choices=['predict', 'train'], help='Action to perform')
-    parser.add_argument('--features', type=str, help='JSON string of features for prediction')
+    parser.add_argument('--features', type=str,
+                        help='JSON string of features for prediction (an array of objects predicts a batch)')
     parser.add_argument('--model-path', type=str, help='Path to model file')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Load the model once and answer line-delimited JSON requests on stdin')
     
     args = parser.parse_args()
     
     model = QuickModelV4(model_path=args.model_path)
     
+    if args.daemon:
+        serve(model)
+        return
+    
     if args.action == 'predict':
         if not args.features:
-            print(json.dumps({'error': 'Features required for prediction'}))
+            print(_dumps({'error': 'Features required for prediction'}))
             sys.exit(1)
         
         try:
             features = json.loads(args.features)
-            result = model.predict(features)
-            print(json.dumps(result, indent=2))
+            if isinstance(features, list):
+                result = model.predict_batch(features)
+            else:
+                result = model.predict(features)
+            print(_dumps(result))
         except json.JSONDecodeError as e:
-            print(json.dumps({'error': f'Invalid JSON: {str(e)}'}))
+            print(_dumps({'error': f'Invalid JSON: {str(e)}'}))
             sys.exit(1)
         except Exception as e:
-            print(json.dumps({'error': f'Prediction failed: {str(e)}'}))
+            print(_dumps({'error': f'Prediction failed: {str(e)}'}))
             sys.exit(1)
     
     elif args.action == 'train':
-        print(json.dumps({'error': 'Training not yet implemented in CLI'}))
+        print(_dumps({'error': 'Training not yet implemented in CLI'}))
         sys.exit(1)
 
 
@@ -20,15 +20,272 @@ Date: 2025-10-13
 import sys
 import json
 import math
+import time
 import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 
+try:
+    import orjson
+    
+    def _dumps(obj, indent=True):
+        """JSON via orjson, which also encodes NumPy scalars; one line unless indent"""
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option).decode()
+    
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj, indent=True):
+        """JSON via the standard library; one line unless indent"""
+        return json.dumps(obj, indent=2 if indent else None)
+    
+    _loads = json.loads
+
+try:
+    from .jit_kernels import kernel, compile_kernels
+except ImportError:
+    # Run as a script: the models directory is on sys.path
+    from jit_kernels import kernel, compile_kernels
+
+
+# Presence bits for the optional indicators passed to _tech_score
+TECH_HAS_RSI = 1
+TECH_HAS_MACD = 2
+TECH_HAS_MA = 4     # sma_20, sma_50 and current_price all present
+TECH_HAS_BB = 8
+
+
+# ---------------------------------------------------------------------------
+# Scoring kernels (compiled with numba on first batch use, see jit_kernels)
+# ---------------------------------------------------------------------------
+
+@kernel(cache=True)
+def _tech_score(rsi, macd_hist, sma_20, sma_50, price, bb_position,
+                price_change_5d, near_support, near_resistance, mask):
+    """Technical score (see QuickModelV5._calculate_technical_score)"""
+    score = 0.0
+    count = 0
+    
+    # RSI Analysis (30% weight)
+    if mask & TECH_HAS_RSI:
+        if rsi < 30:
+            score += 0.8  # Oversold - strong buy signal
+        elif rsi < 40:
+            score += 0.4  # Moderately oversold
+        elif rsi > 70:
+            score -= 0.8  # Overbought - strong sell signal
+        elif rsi > 60:
+            score -= 0.4  # Moderately overbought
+        else:
+            score += (50 - rsi) / 50 * 0.2  # Slight bias
+        count += 1
+    
+    # MACD Analysis (25% weight)
+    if mask & TECH_HAS_MACD:
+        if macd_hist > 0.5:
+            score += 0.7
+        elif macd_hist > 0:
+            score += 0.4
+        elif macd_hist < -0.5:
+            score -= 0.7
+        else:
+            score -= 0.4
+        count += 1
+    
+    # Moving Average Crossover (20% weight)
+    if mask & TECH_HAS_MA:
+        # Price above both MAs = bullish
+        if price > sma_20 > sma_50:
+            score += 0.6
+        elif price > sma_20:
+            score += 0.3
+        elif price < sma_20 < sma_50:
+            score -= 0.6
+        elif price < sma_20:
+            score -= 0.3
+        count += 1
+    
+    # Bollinger Bands (15% weight)
+    if mask & TECH_HAS_BB:
+        if bb_position < 0.2:
+            score += 0.5  # Near lower band - buy
+        elif bb_position > 0.8:
+            score -= 0.5  # Near upper band - sell
+        count += 1
+    
+    # Price momentum (10% weight)
+    if abs(price_change_5d) > 0:
+        score += math.tanh(price_change_5d / 5) * 0.3  # Normalize large moves
+        count += 1
+    
+    # Support/Resistance proximity (10% weight)
+    if near_support:
+        score += 0.4
+    if near_resistance:
+        score -= 0.4
+    
+    return min(max(score / max(count, 1), -1.0), 1.0)
+
+
+@kernel(cache=True)
+def _tech_score_batch(rsi, macd_hist, sma_20, sma_50, price, bb_position,
+                      price_change_5d, near_support, near_resistance, mask):
+    """_tech_score for every row of the feature columns"""
+    out = np.empty(rsi.shape[0])
+    for i in range(rsi.shape[0]):
+        out[i] = _tech_score(rsi[i], macd_hist[i], sma_20[i], sma_50[i], price[i], bb_position[i],
+                             price_change_5d[i], near_support[i], near_resistance[i], mask[i])
+    return out
+
+
+# Last formatted timestamp: [epoch second, ISO string]
+_ts_cache = [0, '']
+
+
+def _timestamp():
+    """ISO timestamp at second resolution, reformatted at most once per second"""
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache[0] = now
+        _ts_cache[1] = datetime.fromtimestamp(now).isoformat()
+    return _ts_cache[1]
+
+
+# Integer codes for the categorical features: 1 bullish, -1 bearish. Any
+# other value (including 'neutral', 'none' or a missing key) codes as 0.
+_SENTIMENT_CODES = {'positive': 1, 'negative': -1}
+_ANALYST_CODES = {'upgrade': 1, 'downgrade': -1}
+_INSIDER_CODES = {'buying': 1, 'selling': -1}
+
+
+def _category_code(codes, value):
+    """Code of a categorical feature value (0 for unknown or non-string values)"""
+    return codes.get(value, 0) if isinstance(value, str) else 0
+
+
+# Trading signals. Fixed signals are shared by every prediction that emits
+# them, so treat returned signal dicts as read-only; the reason of a
+# formatted signal is a printf template filled in by _formatted_signal.
+_SIGNAL_STRONG_BUY = {
+    'type': 'BUY',
+    'strength': 'STRONG',
+    'reason': 'High confidence bullish prediction with strong technicals'
+}
+_SIGNAL_MODERATE_BUY = {
+    'type': 'BUY',
+    'strength': 'MODERATE',
+    'reason': 'Bullish prediction with positive momentum'
+}
+_SIGNAL_STRONG_SELL = {
+    'type': 'SELL',
+    'strength': 'STRONG',
+    'reason': 'High confidence bearish prediction with weak technicals'
+}
+_SIGNAL_MODERATE_SELL = {
+    'type': 'SELL',
+    'strength': 'MODERATE',
+    'reason': 'Bearish prediction with negative momentum'
+}
+_SIGNAL_OVERBOUGHT = {
+    'type': 'WARNING',
+    'strength': 'HIGH',
+    'reason': 'Overbought condition (RSI: %.1f) - Correction possible'
+}
+_SIGNAL_OVERSOLD = {
+    'type': 'OPPORTUNITY',
+    'strength': 'HIGH',
+    'reason': 'Oversold condition (RSI: %.1f) - Potential bounce'
+}
+_SIGNAL_VOLUME_SPIKE = {
+    'type': 'ALERT',
+    'strength': 'HIGH',
+    'reason': 'High volume spike (%.1fx average) - Increased activity'
+}
+
+
+def _formatted_signal(signal, value):
+    """New signal dict with value formatted into the template reason"""
+    return {'type': signal['type'], 'strength': signal['strength'], 'reason': signal['reason'] % value}
+
+
+# Numeric features read by predict_batch and their defaults for absent keys.
+# The optional indicators default to NaN (missing) and may also be None;
+# a None anywhere else would fail in predict, so that row is routed there.
+_BATCH_NUMERIC = {
+    'current_price': 0.0,
+    'rsi': math.nan,
+    'macd_histogram': math.nan,
+    'sma_20': math.nan,
+    'sma_50': math.nan,
+    'bollinger_position': math.nan,
+    'price_change_5d': 0.0,
+    'news_sentiment_score': 0.0,
+    'news_count': 0.0,
+    'social_sentiment': 0.0,
+    'earnings_surprise_percent': 0.0,
+    'asian_market_change': 0.0,
+    'european_market_change': 0.0,
+    'volume_ratio': 1.0,
+    'price_change_1d': 0.0,
+    'revenue_growth': 0.0,
+    'earnings_growth': 0.0,
+    'volatility': math.nan,  # Defaults differ: 0 for confidence, 1.0 for target
+}
+_BATCH_OPTIONAL = frozenset(('rsi', 'macd_histogram', 'sma_20', 'sma_50', 'bollinger_position'))
+
+
+def _float_column(rows, key, default, unsupported):
+    """
+    Gather one numeric feature from every row into a float64 array
+    
+    Rows holding a value the scalar path would treat differently (strings,
+    None for a non-optional feature, ...) are flagged in ``unsupported``.
+    """
+    values = [row.get(key, default) for row in rows]
+    column = np.array(values)
+    if column.dtype.kind in 'fiub':
+        return column.astype(np.float64, copy=False)
+    
+    column = np.full(len(values), math.nan)
+    allow_none = key in _BATCH_OPTIONAL
+    for i, value in enumerate(values):
+        if isinstance(value, (int, float)):
+            column[i] = value
+        elif not (value is None and allow_none):
+            unsupported[i] = True
+    return column
+
+
+def _code_column(rows, key, codes):
+    """Categorical feature as an int8 column of category codes"""
+    return np.fromiter(
+        (_category_code(codes, row.get(key)) for row in rows),
+        dtype=np.int8, count=len(rows)
+    )
+
+
+def _round_column(column, ndigits):
+    """
+    Round a float64 column to a list of Python floats, exactly like round()
+    
+    np.round scales, rounds and unscales, which can land on the other side
+    of a decimal tie than Python's correctly rounded round(); the few
+    values close to a tie are re-rounded with round() itself.
+    """
+    values = np.round(column, ndigits).tolist()
+    scaled = column * 10.0 ** ndigits
+    for i in np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6).tolist():
+        values[i] = round(float(column[i]), ndigits)
+    return values
+
+
 class QuickModelV5:
     """
     Enhanced prediction model with realistic price targets and strong signals
     """
     
+    __slots__ = ('version', 'min_confidence', 'max_confidence', 'weights', '_w_scalar')
+    
     def __init__(self):
         self.version = "5.0.0"
         self.min_confidence = 0.55  # Minimum 55% confidence
@@ -43,6 +300,22 @@ class QuickModelV5:
             'fundamentals': 0.10,   # Earnings, revenue, growth
         }
         
+        # Weights in component score order (technical, sentiment, global,
+        # volume, fundamentals) as plain floats for the composite sums
+        self._w_scalar = tuple(self.weights.values())
+        
+    def warm_up(self):
+        """
+        Compile the scoring kernels (or load them from the numba cache)
+        
+        Until then single predictions run the kernels as plain Python, so a
+        one-shot CLI call never imports numba. predict_batch compiles on
+        first use; serve() calls this at startup so the first request does
+        not pay for it.
+        """
+        compile_kernels(globals())
+        _tech_score(50.0, 0.0, 0.0, 0.0, 0.0, 0.5, 0.0, False, False, 0)
+    
     def predict(self, features: Dict) -> Dict:
         """
         Main prediction method - returns Bullish or Bearish with realistic targets
@@ -67,12 +340,13 @@ class QuickModelV5:
             fundamental_score = self._calculate_fundamental_score(features)
             
             # Weighted composite score (-1 to +1)
+            w_technical, w_sentiment, w_global, w_volume, w_fundamentals = self._w_scalar
             composite_score = (
-                technical_score * self.weights['technical'] +
-                sentiment_score * self.weights['sentiment'] +
-                global_score * self.weights['global_markets'] +
-                volume_score * self.weights['volume'] +
-                fundamental_score * self.weights['fundamentals']
+                technical_score * w_technical +
+                sentiment_score * w_sentiment +
+                global_score * w_global +
+                volume_score * w_volume +
+                fundamental_score * w_fundamentals
             )
             
             # Convert to probability (Bullish vs Bearish)
@@ -80,7 +354,9 @@ class QuickModelV5:
             bullish_probability = (composite_score + 1) / 2
             
             # Apply confidence bounds and boost strong signals
-            bullish_probability = self._adjust_confidence(bullish_probability, features)
+            bullish_probability = self._adjust_confidence(
+                bullish_probability, features, technical_score, sentiment_score
+            )
             
             # Ensure no neutral (must be >= 55% or <= 45%)
             if 0.45 < bullish_probability < 0.55:
@@ -108,11 +384,12 @@ class QuickModelV5:
             
             # Generate trading signals
             signals = self._generate_signals(
-                features, 
                 is_bullish, 
                 confidence,
                 technical_score,
-                sentiment_score
+                sentiment_score,
+                features.get('rsi'),
+                features.get('volume_ratio', 1.0)
             )
             
             # Build response
@@ -137,7 +414,7 @@ class QuickModelV5:
                     'composite': round(composite_score, 3),
                 },
                 'signals': signals,
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': _timestamp(),
             }
             
             return response
@@ -145,84 +422,332 @@ class QuickModelV5:
         except Exception as e:
             return self._error_response(f"Prediction error: {str(e)}")
     
-    def _calculate_technical_score(self, features: Dict) -> float:
+    def predict_batch(self, features_list: List[Dict]) -> List[Dict]:
         """
-        Calculate technical indicator score (-1 to +1)
-        Combines: RSI, MACD, Moving Averages, Bollinger Bands
+        Predict many feature dicts at once
+        
+        Features are transposed into one NumPy column per feature and every
+        score is computed with vectorized expressions over the whole batch.
+        Rows the column layout cannot represent faithfully (non-numeric
+        values) are scored one at a time with predict instead.
+        
+        Args:
+            features_list: List of feature dictionaries
+            
+        Returns:
+            List of prediction dicts, in input order
         """
-        score = 0.0
-        count = 0
+        rows = list(features_list)
+        n = len(rows)
+        if n == 0:
+            return []
         
-        # RSI Analysis (30% weight)
-        rsi = features.get('rsi')
-        if rsi is not None:
-            if rsi < 30:
-                score += 0.8  # Oversold - strong buy signal
-            elif rsi < 40:
-                score += 0.4  # Moderately oversold
-            elif rsi > 70:
-                score -= 0.8  # Overbought - strong sell signal
-            elif rsi > 60:
-                score -= 0.4  # Moderately overbought
-            else:
-                score += (50 - rsi) / 50 * 0.2  # Slight bias
-            count += 1
+        compile_kernels(globals())
+        unsupported = np.zeros(n, dtype=bool)
+        c = {key: _float_column(rows, key, default, unsupported)
+             for key, default in _BATCH_NUMERIC.items()}
+        for key in ('near_support', 'near_resistance', 'has_surge_keywords', 'has_bearish_keywords'):
+            c[key] = np.array([bool(row.get(key, False)) for row in rows])
+        for key in ('asian_market_sentiment', 'european_market_sentiment', 'futures_sentiment'):
+            c[key] = _code_column(rows, key, _SENTIMENT_CODES)
+        c['analyst_action'] = _code_column(rows, 'analyst_action', _ANALYST_CODES)
+        c['insider_activity'] = _code_column(rows, 'insider_activity', _INSIDER_CODES)
         
-        # MACD Analysis (25% weight)
-        macd_hist = features.get('macd_histogram')
-        if macd_hist is not None:
-            if macd_hist > 0.5:
-                score += 0.7
-            elif macd_hist > 0:
-                score += 0.4
-            elif macd_hist < -0.5:
-                score -= 0.7
+        current_price = c['current_price']
+        
+        # Component scores (-1 to +1)
+        technical_score = self._batch_technical_score(c)
+        sentiment_score = self._batch_sentiment_score(c)
+        global_score = self._batch_global_market_score(c)
+        volume_score = self._batch_volume_score(c)
+        fundamental_score = self._batch_fundamental_score(c)
+        
+        # Weighted composite, summed in the same order as predict (a matrix
+        # product can round differently and flip a 3-decimal tie)
+        w_technical, w_sentiment, w_global, w_volume, w_fundamentals = self._w_scalar
+        composite_score = (
+            technical_score * w_technical +
+            sentiment_score * w_sentiment +
+            global_score * w_global +
+            volume_score * w_volume +
+            fundamental_score * w_fundamentals
+        )
+        bullish_probability = (composite_score + 1) / 2
+        
+        # Confidence adjustment (see _adjust_confidence)
+        aligned = (
+            ((technical_score > 0.5) & (sentiment_score > 0.5)) |
+            ((technical_score < -0.5) & (sentiment_score < -0.5))
+        )
+        boost = np.minimum(np.abs(technical_score * sentiment_score) * 0.15, 0.15)
+        adjusted = np.where(
+            aligned,
+            np.where(bullish_probability > 0.5, bullish_probability + boost, bullish_probability - boost),
+            bullish_probability
+        )
+        volatility = c['volatility']
+        high_volatility = np.nan_to_num(volatility, nan=0.0) > 2.0
+        adjusted = np.where(
+            high_volatility & (adjusted > 0.7), 0.7 + (adjusted - 0.7) * 0.7,
+            np.where(high_volatility & (adjusted < 0.3), 0.3 - (0.3 - adjusted) * 0.7, adjusted)
+        )
+        bullish_probability = np.clip(adjusted, self.min_confidence, self.max_confidence)
+        
+        # No neutral predictions (see predict). With the default confidence
+        # floor of 0.55 no row lands in the band, so skip the arrays then
+        neutral = (bullish_probability > 0.45) & (bullish_probability < 0.55)
+        if neutral.any():
+            strongest_signal = np.maximum.reduce([
+                np.abs(technical_score), np.abs(sentiment_score), np.abs(global_score)
+            ])
+            bullish_probability = np.where(
+                neutral,
+                np.where((strongest_signal > 0) & (composite_score < 0), 0.44, 0.56),
+                bullish_probability
+            )
+        bearish_probability = 1 - bullish_probability
+        
+        is_bullish = bullish_probability > 0.5
+        confidence = np.where(is_bullish, bullish_probability, bearish_probability)
+        
+        # Target price (see _calculate_target_price) as one expression, with
+        # the clip and sign applied in place
+        change_percent = (
+            (0.5 + 4.5 * ((confidence - 0.5) / 0.45)) *
+            np.minimum(np.nan_to_num(volatility, nan=1.0) * 0.5, 1.5) *
+            np.where(np.abs(c['price_change_5d']) > 2, 1.2, 1.0)
+        )
+        np.clip(change_percent, 0.3, 6.0, out=change_percent)
+        np.negative(change_percent, out=change_percent, where=~is_bullish)
+        target_price = current_price * (1 + change_percent / 100)
+        
+        signals = self._batch_signals(c, is_bullish, confidence, technical_score)
+        
+        timestamp = _timestamp()
+        results = []
+        # Round whole columns at once: per-row round() calls dominated the
+        # cost of building the results
+        columns = zip(
+            is_bullish.tolist(), (current_price <= 0).tolist(),
+            *(_round_column(column, 4) for column in (bullish_probability, bearish_probability, confidence)),
+            *(_round_column(column, 2) for column in (target_price, change_percent, current_price)),
+            *(_round_column(column, 3) for column in (
+                technical_score, sentiment_score, global_score, volume_score, fundamental_score, composite_score
+            )),
+        )
+        for i, (bullish, invalid_price, bull, bear, conf, target, change, price,
+                tech, sent, glob, vol, fund, comp) in enumerate(columns):
+            if unsupported[i]:
+                results.append(self.predict(rows[i]))
+                continue
+            if invalid_price:
+                results.append(self._error_response("Invalid current price"))
+                continue
+            
+            results.append({
+                'success': True,
+                'model_version': self.version,
+                'prediction': {
+                    'direction': 'up' if bullish else 'down',
+                    'bullish_probability': bull,
+                    'bearish_probability': bear,
+                    'confidence': conf,
+                    'predicted_price': target,
+                    'target_change_percent': change,
+                    'current_price': price,
+                },
+                'scores': {
+                    'technical': tech,
+                    'sentiment': sent,
+                    'global_markets': glob,
+                    'volume': vol,
+                    'fundamentals': fund,
+                    'composite': comp,
+                },
+                'signals': signals[i],
+                'timestamp': timestamp,
+            })
+        
+        return results
+    
+    @staticmethod
+    def _batch_signals(
+        c: Dict,
+        is_bullish: np.ndarray,
+        confidence: np.ndarray,
+        technical_score: np.ndarray
+    ) -> List[List[Dict]]:
+        """
+        Vectorized _generate_signals: one signal list per row
+        
+        Each rule is evaluated as a boolean mask over the batch and signal
+        dicts (and their formatted reasons) are only built for the rows
+        where it fires. Rules are applied in the same order as the scalar
+        method so every row lists its signals in the same order.
+        """
+        rsi = c['rsi']
+        volume_ratio = c['volume_ratio']
+        is_bearish = ~is_bullish
+        
+        strong_buy = is_bullish & (confidence > 0.75) & (technical_score > 0.5)
+        strong_sell = is_bearish & (confidence > 0.75) & (technical_score < -0.5)
+        rules = (
+            (strong_buy, _SIGNAL_STRONG_BUY, None),
+            (is_bullish & ~strong_buy & (confidence > 0.60), _SIGNAL_MODERATE_BUY, None),
+            (strong_sell, _SIGNAL_STRONG_SELL, None),
+            (is_bearish & ~strong_sell & (confidence > 0.60), _SIGNAL_MODERATE_SELL, None),
+            # Missing RSI is NaN and never fires; an RSI of 0 is skipped as
+            # in the scalar path
+            ((rsi != 0) & (rsi > 75), _SIGNAL_OVERBOUGHT, rsi),
+            ((rsi != 0) & (rsi < 25), _SIGNAL_OVERSOLD, rsi),
+            (volume_ratio > 2.0, _SIGNAL_VOLUME_SPIKE, volume_ratio),
+        )
+        
+        signals = [[] for _ in range(len(confidence))]
+        for mask, signal, values in rules:
+            rows = np.flatnonzero(mask).tolist()
+            if values is None:
+                for i in rows:
+                    signals[i].append(signal)
             else:
-                score -= 0.4
-            count += 1
+                for i in rows:
+                    signals[i].append(_formatted_signal(signal, values[i]))
+        return signals
+    
+    @staticmethod
+    def _batch_technical_score(c: Dict) -> np.ndarray:
+        """
+        Technical scores over feature columns
         
-        # Moving Average Crossover (20% weight)
-        sma_20 = features.get('sma_20')
-        sma_50 = features.get('sma_50')
-        current_price = features.get('current_price')
-        
-        if all(v is not None for v in [sma_20, sma_50, current_price]):
-            # Price above both MAs = bullish
-            if current_price > sma_20 > sma_50:
-                score += 0.6
-            elif current_price > sma_20:
-                score += 0.3
-            elif current_price < sma_20 < sma_50:
-                score -= 0.6
-            elif current_price < sma_20:
-                score -= 0.3
-            count += 1
+        Runs the scalar _tech_score ladders in one compiled loop, which
+        beats evaluating every branch as nested np.where/np.piecewise
+        arrays and gives the same scores as predict.
+        """
+        sma_20 = c['sma_20']
+        sma_50 = c['sma_50']
+        mask = (
+            ~np.isnan(c['rsi']) * TECH_HAS_RSI |
+            ~np.isnan(c['macd_histogram']) * TECH_HAS_MACD |
+            ~(np.isnan(sma_20) | np.isnan(sma_50)) * TECH_HAS_MA |
+            ~np.isnan(c['bollinger_position']) * TECH_HAS_BB
+        )
+        return _tech_score_batch(
+            c['rsi'], c['macd_histogram'], sma_20, sma_50, c['current_price'],
+            c['bollinger_position'], c['price_change_5d'],
+            c['near_support'], c['near_resistance'], mask
+        )
+    
+    @staticmethod
+    def _batch_sentiment_score(c: Dict) -> np.ndarray:
+        """Vectorized _calculate_sentiment_score over feature columns"""
+        news_count = c['news_count']
+        social_sentiment = c['social_sentiment']
+        earnings_surprise = c['earnings_surprise_percent']
         
-        # Bollinger Bands (15% weight)
-        bb_position = features.get('bollinger_position')  # 0-1 scale (lower to upper)
-        if bb_position is not None:
-            if bb_position < 0.2:
-                score += 0.5  # Near lower band - buy
-            elif bb_position > 0.8:
-                score -= 0.5  # Near upper band - sell
-            count += 1
+        has_news = news_count > 0
+        has_surge = c['has_surge_keywords']
+        has_bearish = c['has_bearish_keywords']
+        has_social = np.abs(social_sentiment) > 0
+        has_earnings = np.abs(earnings_surprise) > 0
         
-        # Price momentum (10% weight)
-        price_change_5d = features.get('price_change_5d', 0)
-        if abs(price_change_5d) > 0:
-            momentum_score = np.tanh(price_change_5d / 5)  # Normalize large moves
-            score += momentum_score * 0.3
-            count += 1
+        score = np.where(has_news, c['news_sentiment_score'] * np.minimum(news_count / 10, 1.0) * 0.8, 0.0)
+        score = score + np.where(has_surge, 0.7, 0.0)
+        score = score - np.where(has_bearish, 0.7, 0.0)
+        score = score + np.where(has_social, social_sentiment * 0.5, 0.0)
+        score = score + np.where(has_earnings, np.tanh(earnings_surprise / 20) * 0.6, 0.0)
         
-        # Support/Resistance proximity (10% weight)
-        near_support = features.get('near_support', False)
-        near_resistance = features.get('near_resistance', False)
-        if near_support:
-            score += 0.4
-        if near_resistance:
-            score -= 0.4
+        count = (has_news.astype(np.int8) + has_surge + has_bearish + has_social + has_earnings)
+        return np.clip(score / np.maximum(count, 1), -1, 1)
+    
+    @staticmethod
+    def _batch_global_market_score(c: Dict) -> np.ndarray:
+        """Vectorized _calculate_global_market_score over feature columns"""
+        asian_sentiment = c['asian_market_sentiment']
+        european_sentiment = c['european_market_sentiment']
         
-        return np.clip(score / max(count, 1), -1, 1)
+        score = np.where(asian_sentiment != 0, asian_sentiment * 0.6,
+                         np.tanh(c['asian_market_change']) * 0.5)
+        score = score + np.where(european_sentiment != 0, european_sentiment * 0.2,
+                                 np.tanh(c['european_market_change']) * 0.15)
+        score = score + c['futures_sentiment'] * 0.15
+        return np.clip(score, -1, 1)
+    
+    @staticmethod
+    def _batch_volume_score(c: Dict) -> np.ndarray:
+        """Vectorized _calculate_volume_score over feature columns"""
+        volume_ratio = c['volume_ratio']
+        price_change = c['price_change_1d']
+        
+        spike_score = np.select(
+            [price_change > 1.0, price_change > 0, price_change < -1.0, price_change < 0],
+            [0.8, 0.4, -0.8, -0.4],
+            0.0
+        )
+        score = np.select(
+            [volume_ratio > 1.5, volume_ratio > 1.2],
+            [spike_score, np.tanh(price_change) * 0.5],
+            np.tanh(price_change) * 0.2
+        )
+        return np.clip(score, -1, 1)
+    
+    @staticmethod
+    def _batch_fundamental_score(c: Dict) -> np.ndarray:
+        """Vectorized _calculate_fundamental_score over feature columns"""
+        revenue_growth = c['revenue_growth']
+        earnings_growth = c['earnings_growth']
+        analyst_action = c['analyst_action']
+        insider_activity = c['insider_activity']
+        
+        has_revenue = np.abs(revenue_growth) > 0
+        has_earnings = np.abs(earnings_growth) > 0
+        
+        score = np.where(has_revenue, np.tanh(revenue_growth / 20) * 0.6, 0.0)
+        score = score + np.where(has_earnings, np.tanh(earnings_growth / 25) * 0.7, 0.0)
+        score = score + analyst_action * 0.5
+        score = score + insider_activity * 0.4
+        
+        count = (has_revenue.astype(np.int8) + has_earnings + (analyst_action != 0) + (insider_activity != 0))
+        return np.clip(score / np.maximum(count, 1), -1, 1)
+    
+    def _calculate_technical_score(self, features: Dict) -> float:
+        """
+        Calculate technical indicator score (-1 to +1)
+        Combines: RSI, MACD, Moving Averages, Bollinger Bands
+        """
+        get = features.get
+        rsi = get('rsi')
+        macd_hist = get('macd_histogram')
+        sma_20 = get('sma_20')
+        sma_50 = get('sma_50')
+        current_price = get('current_price')
+        bb_position = get('bollinger_position')  # 0-1 scale (lower to upper)
+        
+        # Missing indicators are passed as NaN with their presence bit clear
+        mask = 0
+        if rsi is None:
+            rsi = math.nan
+        else:
+            mask |= TECH_HAS_RSI
+        if macd_hist is None:
+            macd_hist = math.nan
+        else:
+            mask |= TECH_HAS_MACD
+        if sma_20 is None or sma_50 is None or current_price is None:
+            sma_20 = sma_50 = current_price = math.nan
+        else:
+            mask |= TECH_HAS_MA
+        if bb_position is None:
+            bb_position = math.nan
+        else:
+            mask |= TECH_HAS_BB
+        
+        return _tech_score(
+            float(rsi), float(macd_hist), float(sma_20), float(sma_50),
+            float(current_price), float(bb_position),
+            float(get('price_change_5d', 0)),
+            bool(get('near_support', False)), bool(get('near_resistance', False)),
+            mask
+        )
     
     def _calculate_sentiment_score(self, features: Dict) -> float:
         """
@@ -264,10 +789,10 @@ class QuickModelV5:
         earnings_surprise = features.get('earnings_surprise_percent', 0)
         if abs(earnings_surprise) > 0:
             # Positive surprise = bullish
-            score += np.tanh(earnings_surprise / 20) * 0.6
+            score += math.tanh(earnings_surprise / 20) * 0.6
             count += 1
         
-        return np.clip(score / max(count, 1), -1, 1)
+        return min(max(score / max(count, 1), -1.0), 1.0)
     
     def _calculate_global_market_score(self, features: Dict) -> float:
         """
@@ -276,36 +801,39 @@ class QuickModelV5:
         """
         score = 0.0
         
-        # Asian markets (Nikkei, Shanghai, Hang Seng, NIFTY) - 75% weight
-        asian_change = features.get('asian_market_change', 0)
-        asian_sentiment = features.get('asian_market_sentiment', 'neutral')
+        # Asian markets (Nikkei, Shanghai, Hang Seng, NIFTY) - 75% weight.
+        # A categorical sentiment wins; the % change is only read without one
+        asian_sentiment = _category_code(_SENTIMENT_CODES, features.get('asian_market_sentiment'))
         
-        if asian_sentiment == 'positive':
+        if asian_sentiment == 1:
             score += 0.6
-        elif asian_sentiment == 'negative':
+        elif asian_sentiment == -1:
             score -= 0.6
-        elif abs(asian_change) > 0:
-            score += np.tanh(asian_change) * 0.5
+        else:
+            asian_change = features.get('asian_market_change', 0)
+            if abs(asian_change) > 0:
+                score += math.tanh(asian_change) * 0.5
         
         # European markets (DAX, FTSE, CAC) - 25% weight
-        european_change = features.get('european_market_change', 0)
-        european_sentiment = features.get('european_market_sentiment', 'neutral')
+        european_sentiment = _category_code(_SENTIMENT_CODES, features.get('european_market_sentiment'))
         
-        if european_sentiment == 'positive':
+        if european_sentiment == 1:
             score += 0.2
-        elif european_sentiment == 'negative':
+        elif european_sentiment == -1:
             score -= 0.2
-        elif abs(european_change) > 0:
-            score += np.tanh(european_change) * 0.15
+        else:
+            european_change = features.get('european_market_change', 0)
+            if abs(european_change) > 0:
+                score += math.tanh(european_change) * 0.15
         
         # US Futures sentiment (if available)
-        futures_sentiment = features.get('futures_sentiment', 'neutral')
-        if futures_sentiment == 'positive':
+        futures_sentiment = _category_code(_SENTIMENT_CODES, features.get('futures_sentiment'))
+        if futures_sentiment == 1:
             score += 0.15
-        elif futures_sentiment == 'negative':
+        elif futures_sentiment == -1:
             score -= 0.15
         
-        return np.clip(score, -1, 1)
+        return min(max(score, -1.0), 1.0)
     
     def _calculate_volume_score(self, features: Dict) -> float:
         """
@@ -331,12 +859,12 @@ class QuickModelV5:
                 score -= 0.4
         elif volume_ratio > 1.2:
             # Moderate volume
-            score += np.tanh(price_change) * 0.5
+            score += math.tanh(price_change) * 0.5
         else:
             # Low volume - less conviction
-            score += np.tanh(price_change) * 0.2
+            score += math.tanh(price_change) * 0.2
         
-        return np.clip(score, -1, 1)
+        return min(max(score, -1.0), 1.0)
     
     def _calculate_fundamental_score(self, features: Dict) -> float:
         """
@@ -349,55 +877,60 @@ class QuickModelV5:
         # Revenue growth
         revenue_growth = features.get('revenue_growth', 0)
         if abs(revenue_growth) > 0:
-            score += np.tanh(revenue_growth / 20) * 0.6
+            score += math.tanh(revenue_growth / 20) * 0.6
             count += 1
         
         # Earnings growth
         earnings_growth = features.get('earnings_growth', 0)
         if abs(earnings_growth) > 0:
-            score += np.tanh(earnings_growth / 25) * 0.7
+            score += math.tanh(earnings_growth / 25) * 0.7
             count += 1
         
         # Analyst ratings upgrade/downgrade
-        analyst_action = features.get('analyst_action', 'none')
-        if analyst_action == 'upgrade':
+        analyst_action = _category_code(_ANALYST_CODES, features.get('analyst_action'))
+        if analyst_action == 1:
             score += 0.5
             count += 1
-        elif analyst_action == 'downgrade':
+        elif analyst_action == -1:
             score -= 0.5
             count += 1
         
         # Insider buying/selling
-        insider_activity = features.get('insider_activity', 'neutral')
-        if insider_activity == 'buying':
+        insider_activity = _category_code(_INSIDER_CODES, features.get('insider_activity'))
+        if insider_activity == 1:
             score += 0.4
             count += 1
-        elif insider_activity == 'selling':
+        elif insider_activity == -1:
             score -= 0.4
             count += 1
         
-        return np.clip(score / max(count, 1) if count > 0 else 0, -1, 1)
+        return min(max(score / max(count, 1) if count > 0 else 0, -1.0), 1.0)
     
-    def _adjust_confidence(self, probability: float, features: Dict) -> float:
+    def _adjust_confidence(
+        self,
+        probability: float,
+        features: Dict,
+        tech_score: float,
+        sent_score: float
+    ) -> float:
         """
         Adjust confidence based on market conditions and volatility
         Boosts strong signals, dampens uncertain conditions
+        
+        tech_score and sent_score are the component scores predict has
+        already computed for these features.
         """
         # Start with base probability
         adjusted = probability
         
-        # Boost confidence for strong technical + sentiment alignment
-        if 'technical' in str(features) and 'sentiment' in str(features):
-            tech_score = self._calculate_technical_score(features)
-            sent_score = self._calculate_sentiment_score(features)
-            
-            # Both strongly bullish or both strongly bearish = boost confidence
-            if (tech_score > 0.5 and sent_score > 0.5) or (tech_score < -0.5 and sent_score < -0.5):
-                boost = min(abs(tech_score * sent_score) * 0.15, 0.15)
-                if probability > 0.5:
-                    adjusted += boost
-                else:
-                    adjusted -= boost
+        # Boost confidence for strong technical + sentiment alignment:
+        # both strongly bullish or both strongly bearish
+        if (tech_score > 0.5 and sent_score > 0.5) or (tech_score < -0.5 and sent_score < -0.5):
+            boost = min(abs(tech_score * sent_score) * 0.15, 0.15)
+            if probability > 0.5:
+                adjusted += boost
+            else:
+                adjusted -= boost
         
         # High volatility = reduce extreme confidence
         volatility = features.get('volatility', 0)
@@ -409,7 +942,7 @@ class QuickModelV5:
                 adjusted = 0.3 - (0.3 - adjusted) * 0.7
         
         # Ensure bounds
-        return np.clip(adjusted, self.min_confidence, self.max_confidence)
+        return min(max(adjusted, self.min_confidence), self.max_confidence)
     
     def _calculate_target_price(
         self, 
@@ -445,7 +978,7 @@ class QuickModelV5:
             adjusted_change *= 1.2
         
         # Cap the change
-        adjusted_change = np.clip(adjusted_change, 0.3, 6.0)
+        adjusted_change = min(max(adjusted_change, 0.3), 6.0)
         
         # Apply direction
         change_percent = adjusted_change if is_bullish else -adjusted_change
@@ -457,70 +990,43 @@ class QuickModelV5:
     
     def _generate_signals(
         self,
-        features: Dict,
         is_bullish: bool,
         confidence: float,
         technical_score: float,
-        sentiment_score: float
+        sentiment_score: float,
+        rsi: Optional[float],
+        volume_ratio: float
     ) -> List[Dict]:
         """
         Generate trading signals (Buy, Sell, Hold, Correction Warning)
+        
+        rsi and volume_ratio are the raw feature values (rsi may be None).
         """
         signals = []
         
         # Strong Buy signal
         if is_bullish and confidence > 0.75 and technical_score > 0.5:
-            signals.append({
-                'type': 'BUY',
-                'strength': 'STRONG',
-                'reason': 'High confidence bullish prediction with strong technicals'
-            })
+            signals.append(_SIGNAL_STRONG_BUY)
         elif is_bullish and confidence > 0.60:
-            signals.append({
-                'type': 'BUY',
-                'strength': 'MODERATE',
-                'reason': 'Bullish prediction with positive momentum'
-            })
+            signals.append(_SIGNAL_MODERATE_BUY)
         
         # Strong Sell signal
         if not is_bullish and confidence > 0.75 and technical_score < -0.5:
-            signals.append({
-                'type': 'SELL',
-                'strength': 'STRONG',
-                'reason': 'High confidence bearish prediction with weak technicals'
-            })
+            signals.append(_SIGNAL_STRONG_SELL)
         elif not is_bullish and confidence > 0.60:
-            signals.append({
-                'type': 'SELL',
-                'strength': 'MODERATE',
-                'reason': 'Bearish prediction with negative momentum'
-            })
+            signals.append(_SIGNAL_MODERATE_SELL)
         
         # Overbought warning
-        rsi = features.get('rsi')
         if rsi and rsi > 75:
-            signals.append({
-                'type': 'WARNING',
-                'strength': 'HIGH',
-                'reason': f'Overbought condition (RSI: {rsi:.1f}) - Correction possible'
-            })
+            signals.append(_formatted_signal(_SIGNAL_OVERBOUGHT, rsi))
         
         # Oversold opportunity
         if rsi and rsi < 25:
-            signals.append({
-                'type': 'OPPORTUNITY',
-                'strength': 'HIGH',
-                'reason': f'Oversold condition (RSI: {rsi:.1f}) - Potential bounce'
-            })
+            signals.append(_formatted_signal(_SIGNAL_OVERSOLD, rsi))
         
         # Volume spike alert
-        volume_ratio = features.get('volume_ratio', 1.0)
         if volume_ratio > 2.0:
-            signals.append({
-                'type': 'ALERT',
-                'strength': 'HIGH',
-                'reason': f'High volume spike ({volume_ratio:.1f}x average) - Increased activity'
-            })
+            signals.append(_formatted_signal(_SIGNAL_VOLUME_SPIKE, volume_ratio))
         
         return signals
     
@@ -530,7 +1036,7 @@ class QuickModelV5:
             'success': False,
             'error': message,
             'model_version': self.version,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': _timestamp(),
         }
 
 
@@ -549,12 +1055,51 @@ def convert_numpy_types(obj):
     return obj
 
 
+def _handle_request_line(model, line):
+    """Answer one line-delimited JSON request; returns the response line"""
+    try:
+        features = _loads(line)
+        if isinstance(features, list):
+            result = model.predict_batch(features)
+        else:
+            result = model.predict(features)
+    except json.JSONDecodeError as e:
+        result = {'error': f'Invalid JSON input: {str(e)}'}
+    except Exception as e:
+        result = {'error': f'Unexpected error: {str(e)}'}
+    return _dumps(convert_numpy_types(result), indent=False) + '\n'
+
+
+def serve(model):
+    """
+    Keep a warm model and answer line-delimited JSON requests from stdin
+    
+    Each request line holds a feature object (or an array of them for batch
+    scoring) and gets exactly one JSON response line on stdout.
+    
+    Args:
+        model: QuickModelV5 instance
+    """
+    model.warm_up()
+    
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        sys.stdout.write(_handle_request_line(model, line))
+        sys.stdout.flush()
+
+
 def main():
     """
     CLI interface for the model
     Usage: python quick_model_v5.py '{"current_price": 300, "rsi": 45, ...}'
     Or: python quick_model_v5.py predict --features '{"current_price": 300, ...}'
+    Or: python quick_model_v5.py --server  (line-delimited JSON on stdin/stdout)
     """
+    if '--server' in sys.argv[1:]:
+        serve(QuickModelV5())
+        return
+    
     if len(sys.argv) < 2:
         print(json.dumps({
             'error': 'No input provided',
@@ -573,7 +1118,7 @@ def main():
             features_json = sys.argv[1]
         
         # Parse input JSON
-        features = json.loads(features_json)
+        features = _loads(features_json)
         
         # Create model and predict
         model = QuickModelV5()
@@ -583,7 +1128,7 @@ def main():
         result = convert_numpy_types(result)
         
         # Output JSON result
-        print(json.dumps(result, indent=2))
+        print(_dumps(result))
         
         # Exit with success/failure code
         sys.exit(0 if result.get('success') else 1)
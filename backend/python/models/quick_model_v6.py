@@ -20,13 +20,1062 @@ Version: 6.0
 Date: 2025-10-15
 """
 
+import os
 import sys
 import json
 import math
-import argparse
+import time
+import logging
 import numpy as np
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+from types import SimpleNamespace
+from typing import Dict, List, NamedTuple, Tuple, Optional
+
+try:
+    import orjson
+    
+    def _dumps(obj, indent=True):
+        """JSON via orjson, which also encodes NumPy scalars; one line unless indent"""
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option).decode()
+    
+    _loads = orjson.loads
+except ImportError:
+    def _json_default(obj):
+        """Encode the NumPy scalars and arrays predict() may return"""
+        if isinstance(obj, (np.generic, np.ndarray)):
+            return obj.tolist()
+        raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+    
+    def _dumps(obj, indent=True):
+        """JSON via the standard library; one line unless indent"""
+        return json.dumps(obj, indent=2 if indent else None, default=_json_default)
+    
+    _loads = json.loads
+
+_log = logging.getLogger('quick_model_v6')
+
+try:
+    from .jit_kernels import kernel, compile_kernels, prange
+except ImportError:
+    # Run as a script: the models directory is on sys.path
+    from jit_kernels import kernel, compile_kernels, prange
+
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+
+# Features read by the compiled kernels and the local US factors, in packed-vector order, with the
+# value used when a key is absent or None. A None default marks an optional
+# indicator, which is scored only when present (see the TECH_HAS_* bits).
+_PACKED_DEFAULTS = {
+    # Technical
+    'rsi': None,
+    'macd_histogram': None,
+    'macd_signal_diff': 0.0,
+    'sma_20': None,
+    'sma_50': None,
+    'sma_200': None,
+    'current_price': None,
+    'bollinger_position': None,
+    'bollinger_width': 0.0,
+    'price_change_1d': 0.0,
+    'price_change_5d': 0.0,
+    'near_support': False,
+    'near_resistance': False,
+    'bounce_from_support': False,
+    'failed_resistance': False,
+    # Sentiment
+    'news_sentiment_score': 0.0,
+    'news_count': 0.0,
+    'bullish_keyword_count': 0.0,
+    'bearish_keyword_count': 0.0,
+    'bullish_keyword_score_total': 0.0,
+    'bearish_keyword_score_total': 0.0,
+    'has_high_impact_keywords': False,
+    'earnings_surprise_percent': 0.0,
+    'guidance_change_percent': 0.0,
+    'has_surge_keywords': False,
+    'surge_keyword_count': 0.0,
+    'has_bearish_keywords': False,
+    'social_sentiment': 0.0,
+    'social_volume': 0.0,
+    'sector_sentiment': 0.0,
+    'analyst_upgrades': 0.0,
+    'analyst_downgrades': 0.0,
+    # Volume
+    'volume_ratio': 1.0,
+    'volume_trend': 'stable',
+    # Fundamentals
+    'revenue_growth': 0.0,
+    'earnings_growth': 0.0,
+    'margin_change_percent': 0.0,
+    'analyst_action': 'none',
+    'insider_activity': 'neutral',
+    'pe_percentile': 50.0,
+    # Intraday
+    'intraday_change_percent': 0.0,
+    'intraday_volume_ratio': 1.0,
+    'open_close_gap_percent': 0.0,
+    # Local US factors
+    'macd': 0.0,
+    'us_market_influence_score': 0.0,
+    'us_market_sentiment': 'neutral',
+    # Calibration and target price
+    'volatility': 1.0,
+    'global_market_change': 0.0,
+    # Global markets
+    'asian_market_change': 0.0,
+    'asian_market_sentiment': 'neutral',
+    'asian_market_strength': 0.0,
+    'european_market_change': 0.0,
+    'european_market_sentiment': 'neutral',
+    'european_market_strength': 0.0,
+    'futures_change': 0.0,
+    'futures_sentiment': 'neutral',
+}
+FEATURE_INDEX = {key: i for i, key in enumerate(_PACKED_DEFAULTS)}
+
+# Slot of each feature in the packed vector, as constants the kernels can read
+F_RSI = FEATURE_INDEX['rsi']
+F_MACD_HISTOGRAM = FEATURE_INDEX['macd_histogram']
+F_MACD_SIGNAL_DIFF = FEATURE_INDEX['macd_signal_diff']
+F_SMA_20 = FEATURE_INDEX['sma_20']
+F_SMA_50 = FEATURE_INDEX['sma_50']
+F_SMA_200 = FEATURE_INDEX['sma_200']
+F_CURRENT_PRICE = FEATURE_INDEX['current_price']
+F_BOLLINGER_POSITION = FEATURE_INDEX['bollinger_position']
+F_BOLLINGER_WIDTH = FEATURE_INDEX['bollinger_width']
+F_PRICE_CHANGE_1D = FEATURE_INDEX['price_change_1d']
+F_PRICE_CHANGE_5D = FEATURE_INDEX['price_change_5d']
+F_NEAR_SUPPORT = FEATURE_INDEX['near_support']
+F_NEAR_RESISTANCE = FEATURE_INDEX['near_resistance']
+F_BOUNCE_FROM_SUPPORT = FEATURE_INDEX['bounce_from_support']
+F_FAILED_RESISTANCE = FEATURE_INDEX['failed_resistance']
+F_NEWS_SENTIMENT_SCORE = FEATURE_INDEX['news_sentiment_score']
+F_NEWS_COUNT = FEATURE_INDEX['news_count']
+F_BULLISH_KEYWORD_COUNT = FEATURE_INDEX['bullish_keyword_count']
+F_BEARISH_KEYWORD_COUNT = FEATURE_INDEX['bearish_keyword_count']
+F_BULLISH_KEYWORD_SCORE = FEATURE_INDEX['bullish_keyword_score_total']
+F_BEARISH_KEYWORD_SCORE = FEATURE_INDEX['bearish_keyword_score_total']
+F_HAS_HIGH_IMPACT_KEYWORDS = FEATURE_INDEX['has_high_impact_keywords']
+F_EARNINGS_SURPRISE = FEATURE_INDEX['earnings_surprise_percent']
+F_GUIDANCE_CHANGE = FEATURE_INDEX['guidance_change_percent']
+F_HAS_SURGE_KEYWORDS = FEATURE_INDEX['has_surge_keywords']
+F_SURGE_KEYWORD_COUNT = FEATURE_INDEX['surge_keyword_count']
+F_HAS_BEARISH_KEYWORDS = FEATURE_INDEX['has_bearish_keywords']
+F_SOCIAL_SENTIMENT = FEATURE_INDEX['social_sentiment']
+F_SOCIAL_VOLUME = FEATURE_INDEX['social_volume']
+F_SECTOR_SENTIMENT = FEATURE_INDEX['sector_sentiment']
+F_ANALYST_UPGRADES = FEATURE_INDEX['analyst_upgrades']
+F_ANALYST_DOWNGRADES = FEATURE_INDEX['analyst_downgrades']
+F_VOLUME_RATIO = FEATURE_INDEX['volume_ratio']
+F_VOLUME_TREND = FEATURE_INDEX['volume_trend']
+F_REVENUE_GROWTH = FEATURE_INDEX['revenue_growth']
+F_EARNINGS_GROWTH = FEATURE_INDEX['earnings_growth']
+F_MARGIN_CHANGE = FEATURE_INDEX['margin_change_percent']
+F_ANALYST_ACTION = FEATURE_INDEX['analyst_action']
+F_INSIDER_ACTIVITY = FEATURE_INDEX['insider_activity']
+F_PE_PERCENTILE = FEATURE_INDEX['pe_percentile']
+F_INTRADAY_CHANGE = FEATURE_INDEX['intraday_change_percent']
+F_INTRADAY_VOLUME_RATIO = FEATURE_INDEX['intraday_volume_ratio']
+F_OPEN_CLOSE_GAP = FEATURE_INDEX['open_close_gap_percent']
+F_MACD = FEATURE_INDEX['macd']
+F_US_MARKET_INFLUENCE = FEATURE_INDEX['us_market_influence_score']
+F_US_MARKET_SENTIMENT = FEATURE_INDEX['us_market_sentiment']
+F_VOLATILITY = FEATURE_INDEX['volatility']
+F_GLOBAL_MARKET_CHANGE = FEATURE_INDEX['global_market_change']
+F_ASIAN_CHANGE = FEATURE_INDEX['asian_market_change']
+F_ASIAN_SENTIMENT = FEATURE_INDEX['asian_market_sentiment']
+F_ASIAN_STRENGTH = FEATURE_INDEX['asian_market_strength']
+F_EUROPEAN_CHANGE = FEATURE_INDEX['european_market_change']
+F_EUROPEAN_SENTIMENT = FEATURE_INDEX['european_market_sentiment']
+F_EUROPEAN_STRENGTH = FEATURE_INDEX['european_market_strength']
+F_FUTURES_CHANGE = FEATURE_INDEX['futures_change']
+F_FUTURES_SENTIMENT = FEATURE_INDEX['futures_sentiment']
+
+# Presence bits for the optional indicators, one per None-default slot
+TECH_HAS_RSI = 1
+TECH_HAS_MACD = 2
+TECH_HAS_SMA_20 = 4
+TECH_HAS_SMA_50 = 8
+TECH_HAS_SMA_200 = 16
+TECH_HAS_PRICE = 32
+TECH_HAS_BB = 64
+TECH_HAS_MA = TECH_HAS_SMA_20 | TECH_HAS_SMA_50 | TECH_HAS_PRICE
+
+_OPTIONAL_SLOTS = (
+    (F_RSI, TECH_HAS_RSI),
+    (F_MACD_HISTOGRAM, TECH_HAS_MACD),
+    (F_SMA_20, TECH_HAS_SMA_20),
+    (F_SMA_50, TECH_HAS_SMA_50),
+    (F_SMA_200, TECH_HAS_SMA_200),
+    (F_CURRENT_PRICE, TECH_HAS_PRICE),
+    (F_BOLLINGER_POSITION, TECH_HAS_BB),
+)
+_FLAG_SLOTS = tuple(i for key, i in FEATURE_INDEX.items() if _PACKED_DEFAULTS[key] is False)
+
+# Integer codes for the categorical features: 1 bullish, -1 bearish. Any
+# other value (including the defaults or a missing key) codes as 0.
+_CODE_SLOTS = (
+    (F_VOLUME_TREND, {'up': 1, 'down': -1}),
+    (F_ANALYST_ACTION, {'upgrade': 1, 'downgrade': -1}),
+    (F_INSIDER_ACTIVITY, {'buying': 1, 'selling': -1}),
+    (F_US_MARKET_SENTIMENT, {'positive': 1, 'negative': -1}),
+    (F_ASIAN_SENTIMENT, {'positive': 1, 'negative': -1}),
+    (F_EUROPEAN_SENTIMENT, {'positive': 1, 'negative': -1}),
+    (F_FUTURES_SENTIMENT, {'positive': 1, 'negative': -1}),
+)
+
+
+# Consensus trading signals (type, strength, reason) by direction (True for
+# bullish) and tier: aligned high confidence, > 70%, > 60% confidence
+_CONSENSUS_SIGNALS = {
+    True: (
+        ('BUY', 'VERY STRONG', 'Excellent alignment: Bullish technicals + positive sentiment'),
+        ('BUY', 'STRONG', 'High confidence bullish prediction'),
+        ('BUY', 'MODERATE', 'Bullish momentum detected'),
+    ),
+    False: (
+        ('SELL', 'VERY STRONG', 'Excellent alignment: Bearish technicals + negative sentiment'),
+        ('SELL', 'STRONG', 'High confidence bearish prediction'),
+        ('SELL', 'MODERATE', 'Bearish momentum detected'),
+    ),
+}
+
+# Keys of the local_factors breakdown, in _local_factors order
+_LOCAL_FACTORS = ('technical', 'sentiment', 'volume', 'intraday', 'fundamentals', 'us_markets')
+
+
+class _RegionParams(NamedTuple):
+    """Constants of _region_score for one overseas region"""
+    score_base: float            # |score| with sentiment set and no change
+    score_slope: float           # Added |score| per 1% change
+    impact_slope: float          # Impact % per 1% change with sentiment set
+    positive_impact_base: float
+    positive_impact_cap: float
+    negative_impact_base: float
+    negative_impact_cap: float
+    moderate_impact_slope: float  # Impact % per 1% change without sentiment
+    moderate_impact_cap: float
+    strength_score: float        # Score per unit of market strength
+    strength_impact: float       # Impact % per unit of market strength
+    impact_cap: float
+
+
+# Asian markets: 2.5-5% impact when positive, 1.5-4% when negative, up to 3%
+# for moderate moves and 0-1.5% for neutral/weak markets
+_ASIAN_PARAMS = _RegionParams(0.4, 0.3, 2.0, 2.5, 5.0, 1.5, 4.0, 1.5, 3.0, 0.3, 1.5, 10.0)
+# European markets: 3.5-8% impact when positive, 2.5-7% when negative, up to
+# 5% for moderate moves and 0-2% for neutral/weak markets
+_EUROPEAN_PARAMS = _RegionParams(0.45, 0.35, 2.5, 3.5, 8.0, 2.5, 7.0, 2.0, 5.0, 0.35, 2.0, 15.0)
+
+
+def _category_code(codes, value):
+    """Code of a categorical feature value (0 for unknown or non-string values)"""
+    return codes.get(value, 0) if isinstance(value, str) else 0
+
+
+def _pack_features(features: Dict) -> Tuple[np.ndarray, int]:
+    """
+    Pack the features read by the scoring kernels into a float64 vector
+
+    Returns the vector (laid out by FEATURE_INDEX) and the TECH_HAS_* mask of
+    the optional indicators present. Absent optional indicators are NaN,
+    flags are 0/1 and categorical features hold their integer code.
+    """
+    get = features.get
+    values = [get(key, default) for key, default in _PACKED_DEFAULTS.items()]
+
+    mask = 0
+    for i, bit in _OPTIONAL_SLOTS:
+        if values[i] is None:
+            values[i] = math.nan
+        else:
+            mask |= bit
+    if None in values:
+        values = [default if value is None else value
+                  for value, default in zip(values, _PACKED_DEFAULTS.values())]
+    for i in _FLAG_SLOTS:
+        values[i] = 1.0 if values[i] else 0.0
+    for i, codes in _CODE_SLOTS:
+        values[i] = _category_code(codes, values[i])
+
+    return np.array(values, dtype=np.float64), mask
+
+
+def _clip1(x):
+    """Clip a scalar score to [-1, 1] (NaN passes through, as with np.clip)"""
+    return -1.0 if x < -1.0 else (1.0 if x > 1.0 else x)
+
+
+def _clip(x, lo, hi):
+    """Clip a scalar to [lo, hi]; cheaper than np.clip or min(max(...)) on scalars"""
+    return lo if x < lo else (hi if x > hi else x)
+
+
+# ---------------------------------------------------------------------------
+# Scoring kernels (compiled with numba on first batch use, see jit_kernels)
+# ---------------------------------------------------------------------------
+
+@kernel(cache=True)
+def _technical_score(f, mask):
+    """Technical score (see QuickModelV6._calculate_technical_score_v2)"""
+    score = 0.0
+    count = 0
+
+    # RSI Analysis (improved)
+    if mask & TECH_HAS_RSI:
+        rsi = f[F_RSI]
+        if rsi < 25:
+            score += 0.9  # Extreme oversold
+        elif rsi < 30:
+            score += 0.8  # Strong oversold
+        elif rsi < 40:
+            score += 0.4  # Moderately oversold
+        elif rsi > 75:
+            score -= 0.9  # Extreme overbought
+        elif rsi > 70:
+            score -= 0.8  # Strong overbought
+        elif rsi > 60:
+            score -= 0.4  # Moderately overbought
+        else:
+            score += (50 - rsi) / 100 * 0.3  # Slight bias
+        count += 1
+
+    # MACD with histogram divergence (enhanced)
+    if mask & TECH_HAS_MACD:
+        macd_hist = f[F_MACD_HISTOGRAM]
+        macd_signal_diff = f[F_MACD_SIGNAL_DIFF]
+        if macd_hist > 1.0:
+            score += 0.85  # Strong bullish
+        elif macd_hist > 0.3:
+            score += 0.5
+        elif macd_hist > 0:
+            score += 0.25
+        elif macd_hist < -1.0:
+            score -= 0.85  # Strong bearish
+        elif macd_hist < -0.3:
+            score -= 0.5
+        else:
+            score -= 0.25
+        count += 1
+
+        # MACD divergence detection
+        if macd_signal_diff > 0.5 and macd_hist < 0:
+            score += 0.3  # Bullish divergence
+        elif macd_signal_diff < -0.5 and macd_hist > 0:
+            score -= 0.3  # Bearish divergence
+
+    # Moving Average Crossover & Golden/Death Cross (enhanced)
+    if (mask & TECH_HAS_MA) == TECH_HAS_MA:
+        current_price = f[F_CURRENT_PRICE]
+        sma_20 = f[F_SMA_20]
+        sma_50 = f[F_SMA_50]
+
+        # Price position
+        if current_price > sma_20 > sma_50:
+            score += 0.7  # Strong bullish alignment
+        elif current_price > sma_20:
+            score += 0.4
+        elif current_price < sma_20 < sma_50:
+            score -= 0.7  # Strong bearish alignment
+        elif current_price < sma_20:
+            score -= 0.4
+
+        # Golden Cross / Death Cross detection
+        if mask & TECH_HAS_SMA_200:
+            sma_200 = f[F_SMA_200]
+            if sma_50 > sma_200 and sma_20 > sma_50:
+                score += 0.5  # Golden cross setup
+            elif sma_50 < sma_200 and sma_20 < sma_50:
+                score -= 0.5  # Death cross setup
+
+        count += 1
+
+    # Bollinger Bands (enhanced with width)
+    if mask & TECH_HAS_BB:
+        bb_position = f[F_BOLLINGER_POSITION]
+        if bb_position < 0.15:
+            score += 0.6  # Very close to lower band
+        elif bb_position < 0.3:
+            score += 0.35
+        elif bb_position > 0.85:
+            score -= 0.6  # Very close to upper band
+        elif bb_position > 0.7:
+            score -= 0.35
+
+        # Bollinger band squeeze (volatility compression)
+        if f[F_BOLLINGER_WIDTH] < 0.1:  # Very narrow bands
+            score += 0.2  # Potential breakout
+
+        count += 1
+
+    # Recent 1-day momentum (higher weight for immediate price action)
+    price_change_1d = f[F_PRICE_CHANGE_1D]
+    if abs(price_change_1d) > 0:
+        day_momentum = math.tanh(price_change_1d / 3) * 0.5  # Stronger influence
+        # Extra penalty for significant drops
+        if price_change_1d < -2.0:
+            day_momentum -= 0.3  # Additional bearish signal for big drops
+        score += day_momentum
+        count += 1
+
+    # 5-day momentum (medium-term trend)
+    price_change_5d = f[F_PRICE_CHANGE_5D]
+    if abs(price_change_5d) > 0:
+        score += math.tanh(price_change_5d / 8) * 0.4
+        count += 1
+
+    # Support & Resistance with bounce detection
+    if f[F_BOUNCE_FROM_SUPPORT]:
+        score += 0.5  # Active bounce is bullish
+    elif f[F_NEAR_SUPPORT]:
+        score += 0.3
+
+    if f[F_FAILED_RESISTANCE]:
+        score -= 0.5  # Failed breakout is bearish
+    elif f[F_NEAR_RESISTANCE]:
+        score -= 0.3
+
+    if count == 0:
+        return 0.0
+    return min(max(score / count, -1.0), 1.0)
+
+
+@kernel(cache=True)
+def _sentiment_score(f):
+    """Sentiment score (see QuickModelV6._calculate_sentiment_score_v2)"""
+    score = 0.0
+    count = 0
+
+    # Base sentiment from averaged news articles, weighted by count
+    news_count = f[F_NEWS_COUNT]
+    if news_count > 0:
+        weight = min(news_count / 15, 1.0)  # Max at 15 articles
+        score += f[F_NEWS_SENTIMENT_SCORE] * weight * 0.5
+        count += 1
+
+    # Keyword-based sentiment boost
+    bearish_keyword_count = f[F_BEARISH_KEYWORD_COUNT]
+    if f[F_BULLISH_KEYWORD_COUNT] > 0 or bearish_keyword_count > 0:
+        bullish_keyword_score = f[F_BULLISH_KEYWORD_SCORE]
+        bearish_keyword_score = f[F_BEARISH_KEYWORD_SCORE]
+        net_keyword_score = bullish_keyword_score - bearish_keyword_score
+        score += math.tanh(net_keyword_score / 10.0) * 0.7  # 70% weight to keywords
+        count += 1
+
+        # Extra boost for high-impact keywords
+        if f[F_HAS_HIGH_IMPACT_KEYWORDS]:
+            score += 0.3 if bullish_keyword_score >= bearish_keyword_score else -0.3
+            count += 1
+
+    # Earnings impact analysis
+    earnings_surprise = f[F_EARNINGS_SURPRISE]
+    if abs(earnings_surprise) > 0:
+        # Earnings beats are more impactful
+        score += math.tanh(earnings_surprise / 15) * 0.8
+        count += 1
+
+        # Guidance is important too
+        guidance_change = f[F_GUIDANCE_CHANGE]
+        if abs(guidance_change) > 0:
+            score += math.tanh(guidance_change / 10) * 0.6
+            count += 1
+
+    # Surge keywords detection (more granular)
+    if f[F_HAS_SURGE_KEYWORDS]:
+        score += min(f[F_SURGE_KEYWORD_COUNT] / 5, 1.0) * 0.85  # Normalize
+        count += 1
+
+    # Bearish keywords detection
+    if f[F_HAS_BEARISH_KEYWORDS]:
+        score -= min(bearish_keyword_count / 5, 1.0) * 0.85
+        count += 1
+
+    # Social media sentiment, weighted by volume
+    social_sentiment = f[F_SOCIAL_SENTIMENT]
+    if abs(social_sentiment) > 0:
+        social_weight = min(f[F_SOCIAL_VOLUME] / 1000, 1.0)
+        score += social_sentiment * social_weight * 0.6
+        count += 1
+
+    # Sector news influence
+    sector_sentiment = f[F_SECTOR_SENTIMENT]
+    if abs(sector_sentiment) > 0:
+        score += sector_sentiment * 0.3  # Lower weight for sector
+        count += 1
+
+    # Analyst activity
+    analyst_upgrades = f[F_ANALYST_UPGRADES]
+    analyst_downgrades = f[F_ANALYST_DOWNGRADES]
+    if analyst_upgrades > 0:
+        score += min(analyst_upgrades / 3, 1.0) * 0.5
+        count += 1
+    if analyst_downgrades > 0:
+        score -= min(analyst_downgrades / 3, 1.0) * 0.5
+        count += 1
+
+    if count == 0:
+        return 0.0
+    return min(max(score / count, -1.0), 1.0)
+
+
+@kernel(cache=True)
+def _volume_score(f):
+    """Volume score (see QuickModelV6._calculate_volume_score_v2)"""
+    volume_ratio = f[F_VOLUME_RATIO]
+    price_change = f[F_PRICE_CHANGE_1D]
+
+    # Volume ratio scoring with price direction awareness
+    if volume_ratio > 2.0:
+        # High volume - direction matters more
+        if price_change > 1.0:
+            score = 0.8  # High volume + up = very bullish
+        elif price_change < -1.0:
+            score = -0.8  # High volume + down = very bearish
+        else:
+            score = 0.4  # High volume + neutral = slightly bullish
+    elif volume_ratio > 1.5:
+        # Elevated volume
+        if price_change > 1.0:
+            score = 0.6
+        elif price_change < -1.0:
+            score = -0.6
+        else:
+            score = 0.3
+    elif volume_ratio > 1.0:
+        # Normal to slightly above
+        score = math.tanh(price_change / 2) * 0.4  # Follow price direction
+    elif volume_ratio > 0.8:
+        # Normal range - still follow price
+        score = math.tanh(price_change / 2) * 0.3
+    else:
+        # Low volume - weak signal but still consider price
+        score = math.tanh(price_change / 3) * 0.2
+
+    # If price dropped >2%, apply strong penalty regardless of volume
+    if price_change < -2.0:
+        score = min(score, -0.5)  # Ensure at least -0.5 for big drops
+    elif price_change < -1.5:
+        score = min(score, -0.3)  # Moderate penalty for 1.5%+ drops
+
+    # Volume trend as modifier
+    volume_trend = f[F_VOLUME_TREND]
+    if volume_trend > 0:
+        score += 0.1  # Increasing volume amplifies signal
+    elif volume_trend < 0:
+        score -= 0.05  # Decreasing volume weakens signal
+
+    return min(max(score, -1.0), 1.0)
+
+
+@kernel(cache=True)
+def _fundamental_score(f):
+    """Fundamental score (see QuickModelV6._calculate_fundamental_score_v2)"""
+    score = 0.0
+    count = 0
+
+    revenue_growth = f[F_REVENUE_GROWTH]
+    if abs(revenue_growth) > 0.5:
+        score += math.tanh(revenue_growth / 25) * 0.7
+        count += 1
+
+    # Earnings growth (more important)
+    earnings_growth = f[F_EARNINGS_GROWTH]
+    if abs(earnings_growth) > 0.5:
+        score += math.tanh(earnings_growth / 30) * 0.8
+        count += 1
+
+    margin_change = f[F_MARGIN_CHANGE]
+    if abs(margin_change) > 0.5:
+        score += math.tanh(margin_change / 20) * 0.5
+        count += 1
+
+    # Analyst ratings and insider activity (+/-1 codes)
+    analyst_action = f[F_ANALYST_ACTION]
+    if analyst_action != 0:
+        score += 0.6 * analyst_action
+        count += 1
+    insider_activity = f[F_INSIDER_ACTIVITY]
+    if insider_activity != 0:
+        score += 0.5 * insider_activity
+        count += 1
+
+    # PE ratio relative to peers - always evaluated, even at the default 50
+    pe_score = (f[F_PE_PERCENTILE] - 50) / 50  # Convert to -1 to +1 range
+    score += pe_score * 0.5
+    count += 1
+
+    return min(max(score / count, -1.0), 1.0)
+
+
+@kernel(cache=True)
+def _intraday_score(f):
+    """Intraday score (see QuickModelV6._calculate_intraday_score)"""
+    score = 0.0
+    count = 0
+    intraday_volume_ratio = f[F_INTRADAY_VOLUME_RATIO]
+
+    intraday_change = f[F_INTRADAY_CHANGE]
+    if abs(intraday_change) > 0.1:  # Very small threshold
+        score += math.tanh(intraday_change / 5) * 0.5
+    elif intraday_volume_ratio > 1.0:
+        # Even with no intraday change, more activity during day = bullish
+        score += (intraday_volume_ratio - 1.0) * 0.1
+    count += 1
+
+    # Intraday volume vs daily average
+    if intraday_volume_ratio > 1.5:
+        score += math.tanh((intraday_volume_ratio - 1) * 2) * 0.3
+        count += 1
+    elif intraday_volume_ratio > 1.1:  # Even modest increase
+        score += (intraday_volume_ratio - 1.0) * 0.2
+        count += 1
+
+    # Opening vs closing position
+    open_close_gap = f[F_OPEN_CLOSE_GAP]
+    if abs(open_close_gap) > 0.1:  # Very small threshold
+        score += math.tanh(open_close_gap / 3) * 0.4
+        count += 1
+
+    return min(max(score / count, -1.0), 1.0)
+
+
+@kernel(cache=True)
+def _region_score(params, change, sentiment, strength, trend):
+    """
+    Influence score and impact percentage of one overseas region
+
+    The score grows with the size of the move when the region's sentiment
+    code is set, follows trend (tanh(change), computed by the caller) for
+    moderate moves without one, and falls back to the region's strength
+    otherwise.
+    """
+    if sentiment > 0:
+        # Dynamic score based on actual change, not hardcoded
+        score = min(params.score_base + abs(change) * params.score_slope, 1.0)
+        impact_pct = min(abs(change) * params.impact_slope + params.positive_impact_base, params.positive_impact_cap)
+    elif sentiment < 0:
+        score = max(-params.score_base - abs(change) * params.score_slope, -1.0)
+        impact_pct = min(abs(change) * params.impact_slope + params.negative_impact_base, params.negative_impact_cap)
+    elif abs(change) > 0.5:
+        score = trend * 0.6
+        impact_pct = min(abs(change) * params.moderate_impact_slope, params.moderate_impact_cap)
+    else:
+        score = strength * params.strength_score if strength > 0 else 0.0
+        impact_pct = strength * params.strength_impact  # Neutral/weak markets
+
+    return min(max(score, -1.0), 1.0), min(max(impact_pct, 0.0), params.impact_cap)
+
+
+@kernel(cache=True)
+def _global_scores(f):
+    """
+    Global market score, then the Asian and European influence scores and
+    impact percentages (see QuickModelV6._calculate_global_market_scores)
+
+    tanh of a region's move is shared by the global and region scores.
+    """
+    score = 0.0
+
+    # Asian markets (75% weight) - especially important for US market open
+    asian_change = f[F_ASIAN_CHANGE]
+    asian_sentiment = f[F_ASIAN_SENTIMENT]  # +/-1 code
+    asian_strength = f[F_ASIAN_STRENGTH]  # 0-1 scale
+    asian_trend = 0.0
+
+    if asian_sentiment > 0:
+        score += 0.65
+    elif asian_sentiment < 0:
+        score -= 0.65
+    elif abs(asian_change) > 0.5:
+        asian_trend = math.tanh(asian_change)
+        score += asian_trend * 0.6
+
+    # Boost if Asian markets are strong
+    if asian_strength > 0:
+        score += asian_strength * 0.2
+
+    # European markets (25% weight)
+    european_change = f[F_EUROPEAN_CHANGE]
+    european_sentiment = f[F_EUROPEAN_SENTIMENT]
+    european_trend = 0.0
+
+    if european_sentiment > 0:
+        score += 0.2
+    elif european_sentiment < 0:
+        score -= 0.2
+    elif abs(european_change) > 0.5:
+        european_trend = math.tanh(european_change)
+        score += european_trend * 0.15
+
+    # Futures sentiment (US pre-market)
+    futures_sentiment = f[F_FUTURES_SENTIMENT]
+    futures_change = f[F_FUTURES_CHANGE]
+    if futures_sentiment > 0:
+        score += 0.2
+    elif futures_sentiment < 0:
+        score -= 0.2
+    elif abs(futures_change) > 0.5:
+        score += math.tanh(futures_change) * 0.15
+
+    # Asian impact: 0-5% typical range, European impact: 0-8%
+    asian_score, asian_impact_pct = _region_score(
+        _ASIAN_PARAMS, asian_change, asian_sentiment, asian_strength, asian_trend
+    )
+    european_score, european_impact_pct = _region_score(
+        _EUROPEAN_PARAMS, european_change, european_sentiment, f[F_EUROPEAN_STRENGTH], european_trend
+    )
+
+    return min(max(score, -1.0), 1.0), asian_score, asian_impact_pct, european_score, european_impact_pct
+
+
+@kernel(cache=True)
+def _local_impact_percent(local_score):
+    """Local impact percentage (see QuickModelV6._calculate_local_impact_percent)"""
+    # The bands are symmetric around 0, so select on |score| with
+    # conditional expressions (compiled to selects rather than branches):
+    # 6-8% strong, 4-6% moderate, 2-4% weak, 1% minimal for neutral
+    strength = abs(local_score)
+    impact_pct = (
+        6.0 + (strength - 0.5) * 4.0 if strength > 0.5 else
+        4.0 + (strength - 0.3) * 10.0 if strength > 0.3 else
+        2.0 + strength * 10.0 if strength > 0 else
+        1.0
+    )
+    return min(max(impact_pct, 0.0), 10.0)
+
+
+@kernel(cache=True)
+def _local_factors(f):
+    """
+    Local US score and factors (see QuickModelV6._calculate_local_us_factors)
+
+    Returns the local score and its impact percentage followed by the
+    factors in _LOCAL_FACTORS order, each clipped to [-1, 1].
+    """
+    # Technical: RSI + MACD contribution (a missing RSI is NaN and, like the
+    # neutral 50, matches none of the bands)
+    rsi = f[F_RSI]
+    if rsi < 30:
+        technical = 0.7
+    elif rsi > 70:
+        technical = -0.7
+    elif rsi < 40:
+        technical = 0.3
+    elif rsi > 60:
+        technical = -0.3
+    else:
+        technical = 0.0
+
+    macd = f[F_MACD]
+    if macd != 0:
+        technical += math.tanh(macd) * 0.4
+
+    # Sentiment: news sentiment
+    sentiment = math.tanh(f[F_NEWS_SENTIMENT_SCORE] / 5) * 0.8
+
+    # Volume: volume ratio
+    volume_ratio = f[F_VOLUME_RATIO]
+    if volume_ratio > 1.5:
+        volume = 0.6
+    elif volume_ratio > 1.2:
+        volume = 0.3
+    elif volume_ratio < 0.8:
+        volume = -0.2
+    else:
+        volume = 0.0
+
+    # Intraday: price change during the day
+    intraday = math.tanh(f[F_INTRADAY_CHANGE] / 3) * 0.5
+
+    # Fundamentals: PE percentile, earnings growth
+    fundamentals = ((f[F_PE_PERCENTILE] - 50) / 50) * 0.4 + math.tanh(f[F_EARNINGS_GROWTH] / 20) * 0.3
+
+    # CRITICAL FIX: US Market Indices Factor, with HIGH weight (40% of local
+    # score). When markets are strongly bearish/bullish, it should
+    # significantly affect prediction
+    us_market_influence = f[F_US_MARKET_INFLUENCE]
+    us_sentiment = f[F_US_MARKET_SENTIMENT]  # +/-1 code
+    if us_sentiment < 0 or us_market_influence < -0.2:
+        us_markets = max(-0.9, us_market_influence * 1.2)
+    elif us_sentiment > 0 or us_market_influence > 0.2:
+        us_markets = min(0.9, us_market_influence * 1.2)
+    else:
+        # Neutral - still apply but dampened
+        us_markets = us_market_influence * 0.8
+
+    # US markets get 40% weight, the mean of the other factors 60% (summed
+    # left to right and divided, exactly like np.mean of five values)
+    other_factors_avg = (technical + sentiment + volume + intraday + fundamentals) / 5
+    local_score = min(max(us_markets * 0.40 + other_factors_avg * 0.60, -1.0), 1.0)
+
+    return (
+        local_score,
+        _local_impact_percent(local_score),
+        min(max(technical, -1.0), 1.0),
+        min(max(sentiment, -1.0), 1.0),
+        min(max(volume, -1.0), 1.0),
+        min(max(intraday, -1.0), 1.0),
+        min(max(fundamentals, -1.0), 1.0),
+        min(max(us_markets, -1.0), 1.0),
+    )
+
+
+@kernel(cache=True)
+def _score_all(f, mask):
+    """
+    Component scores, overseas scores, local US score and local factors of
+    one packed feature vector in a single compiled call
+
+    Returns the technical, sentiment, volume, fundamental and intraday
+    scores, then _global_scores (the global score and the Asian and
+    European scores and impact percentages), then _local_factors (the
+    local score, its impact percentage and its six factors).
+    """
+    global_score, asian_score, asian_impact_pct, european_score, european_impact_pct = _global_scores(f)
+    (local_score, local_impact_pct,
+     technical, sentiment, volume, intraday, fundamentals, us_markets) = _local_factors(f)
+    return (
+        _technical_score(f, mask),
+        _sentiment_score(f),
+        _volume_score(f),
+        _fundamental_score(f),
+        _intraday_score(f),
+        global_score,
+        asian_score,
+        asian_impact_pct,
+        european_score,
+        european_impact_pct,
+        local_score,
+        local_impact_pct,
+        technical,
+        sentiment,
+        volume,
+        intraday,
+        fundamentals,
+        us_markets,
+    )
+
+
+@kernel(parallel=True, cache=True)
+def _score_all_batch(features, masks):
+    """
+    _score_all over the rows of a packed feature matrix, in parallel
+
+    Returns an (N, 18) array with one column per _score_all result, in
+    _score_all order.
+    """
+    n = features.shape[0]
+    scores = np.empty((n, 18))
+    for i in prange(n):
+        f = features[i]
+        scores[i, 0] = _technical_score(f, masks[i])
+        scores[i, 1] = _sentiment_score(f)
+        scores[i, 2] = _volume_score(f)
+        scores[i, 3] = _fundamental_score(f)
+        scores[i, 4] = _intraday_score(f)
+        overseas = _global_scores(f)
+        for j in range(5):
+            scores[i, 5 + j] = overseas[j]
+        local = _local_factors(f)
+        for j in range(8):
+            scores[i, 10 + j] = local[j]
+    return scores
+
+
+@kernel(cache=True)
+def _calibrated_probability(f, composite_score, tech_score, sent_score, min_confidence, max_confidence):
+    """Bullish probability (see QuickModelV6._calibrate_probability)"""
+    # Apply sigmoid function for better calibration at extremes
+    adjusted = 0.5 + 0.45 * math.tanh(composite_score * 1.5)
+
+    # If both indicators strongly agree, boost confidence
+    if (tech_score > 0.6 and sent_score > 0.5) or (tech_score < -0.6 and sent_score < -0.5):
+        alignment_boost = min(abs(tech_score * sent_score) * 0.1, 0.12)
+        if adjusted > 0.5:
+            adjusted += alignment_boost
+        else:
+            adjusted -= alignment_boost
+
+    # Volatility adjustment
+    if f[F_VOLATILITY] > 2.5:  # High volatility
+        # Pull back from extremes
+        if adjusted > 0.75:
+            adjusted = 0.75 + (adjusted - 0.75) * 0.6
+        elif adjusted < 0.25:
+            adjusted = 0.25 - (0.25 - adjusted) * 0.6
+
+    # Ensure bounds
+    return min(max(adjusted, min_confidence), max_confidence)
+
+
+@kernel(cache=True)
+def _target_price(f, current_price, confidence, is_bullish, technical_score, sentiment_score):
+    """Target price and change percent (see QuickModelV6._calculate_target_price_v2)"""
+    # Base move calculation (1% - 8% range for more realistic targets)
+    confidence_factor = (confidence - 0.55) / 0.43  # Normalize 0.55-0.98 to 0-1
+    min_change = 1.0
+    max_change = 8.0
+    base_change = min_change + (max_change - min_change) * confidence_factor
+
+    # Market influence boost (global markets, volume, etc)
+    market_influence = max(0.0, f[F_GLOBAL_MARKET_CHANGE] * 0.2 + (f[F_VOLUME_RATIO] - 1.0) * 0.1)
+
+    # Volatility adjustment
+    volatility_multiplier = min(f[F_VOLATILITY] / 1.8, 1.6)
+
+    # Technical + Sentiment influence on target
+    combined_influence = technical_score * 0.5 + sentiment_score * 0.6
+
+    # Calculate final move
+    adjusted_change = base_change * volatility_multiplier
+    adjusted_change *= (1 + combined_influence * 0.7)
+    adjusted_change *= (1 + market_influence)
+
+    # Momentum boost - if stock is already moving, extend the target
+    price_change_1d = f[F_PRICE_CHANGE_1D]
+    price_change_5d = f[F_PRICE_CHANGE_5D]
+
+    # Recent momentum (1-3 days)
+    if abs(price_change_1d) > 1.5:
+        adjusted_change *= 1.25
+    elif abs(price_change_1d) > 1.0:
+        adjusted_change *= 1.15
+    elif abs(price_change_1d) > 0.5:
+        adjusted_change *= 1.05
+
+    # Longer momentum (5 days)
+    if abs(price_change_5d) > 4.0:
+        adjusted_change *= 1.20
+    elif abs(price_change_5d) > 2.5:
+        adjusted_change *= 1.12
+
+    # Ensure move is in same direction as momentum if strong
+    if is_bullish and price_change_1d > 1.0:
+        adjusted_change = max(adjusted_change, price_change_1d * 0.8)
+    elif not is_bullish and price_change_1d < -1.0:
+        adjusted_change = max(adjusted_change, abs(price_change_1d) * 0.8)
+
+    # Cap the change (wider range)
+    adjusted_change = min(max(adjusted_change, 0.5), 10.0)
+
+    # Apply direction
+    change_percent = adjusted_change if is_bullish else -adjusted_change
+
+    return current_price * (1 + change_percent / 100), change_percent
+
+
+@kernel(cache=True)
+def _decide(f, scores, weights, current_price, min_confidence, max_confidence):
+    """
+    Prediction from the _score_all results of one packed feature vector
+
+    Returns the (possibly dampened) sentiment score, the six weighted
+    component parts in weights order, the composite score, the bullish and
+    bearish probabilities, the confidence, the target price and its change
+    percent.
+    """
+    technical_score = scores[0]
+    sentiment_score = scores[1]
+    volume_score = scores[2]
+    fundamental_score = scores[3]
+    intraday_score = scores[4]
+    global_score = scores[5]
+
+    # CRITICAL FIX: Dampen sentiment when price contradicts it significantly
+    # (stock down >2% with positive sentiment or up >2% with negative sentiment)
+    price_change_1d = f[F_PRICE_CHANGE_1D]
+    if ((price_change_1d < -2.0 and sentiment_score > 0.2) or
+            (price_change_1d > 2.0 and sentiment_score < -0.2)):
+        sentiment_score *= 0.5
+
+    # Weighted component contributions and composite score (-1 to +1)
+    technical_part = technical_score * weights[0]
+    sentiment_part = sentiment_score * weights[1]
+    global_part = global_score * weights[2]
+    volume_part = volume_score * weights[3]
+    fundamental_part = fundamental_score * weights[4]
+    intraday_part = intraday_score * weights[5]
+    composite_score = (
+        technical_part + sentiment_part + global_part +
+        volume_part + fundamental_part + intraday_part
+    )
+
+    # Enhanced probability calculation with better calibration
+    bullish_probability = _calibrated_probability(
+        f, composite_score, technical_score, sentiment_score, min_confidence, max_confidence
+    )
+
+    # CRITICAL FIX: Hard override for clearly bearish/bullish composite scores
+    if composite_score < -0.1:
+        bullish_probability = min(bullish_probability, 0.44)
+    elif composite_score > 0.1:
+        bullish_probability = max(bullish_probability, 0.56)
+
+    # Ensure no neutral (must be >= 55% or <= 45%)
+    if 0.45 < bullish_probability < 0.55:
+        # Push to stronger conviction based on strongest signal
+        strongest_signal = max(
+            abs(technical_score), abs(sentiment_score),
+            abs(global_score), abs(intraday_score)
+        )
+        if strongest_signal > 0.3:
+            bullish_probability = 0.58 if composite_score >= 0 else 0.42
+        else:
+            # NO DEFAULT BIAS - follow the composite score direction
+            bullish_probability = 0.56 if composite_score > 0 else 0.44
+
+    bearish_probability = 1 - bullish_probability
+    is_bullish = bullish_probability > 0.5
+    confidence = bullish_probability if is_bullish else bearish_probability
+
+    # Calculate realistic target price with improved logic
+    target_price, target_change_percent = _target_price(
+        f, current_price, confidence, is_bullish, technical_score, sentiment_score
+    )
+
+    return (sentiment_score, technical_part, sentiment_part, global_part, volume_part,
+            fundamental_part, intraday_part, composite_score, bullish_probability,
+            bearish_probability, confidence, target_price, target_change_percent)
+
+
+@kernel(parallel=True, cache=True)
+def _decide_batch(features, scores, weights, min_confidence, max_confidence):
+    """
+    _decide over the rows of a packed feature matrix and its _score_all_batch
+    scores, in parallel
+
+    Returns an (N, 13) array with one column per _decide result.
+    """
+    n = features.shape[0]
+    decisions = np.empty((n, 13))
+    for i in prange(n):
+        f = features[i]
+        decision = _decide(f, scores[i], weights, f[F_CURRENT_PRICE],
+                           min_confidence, max_confidence)
+        for j in range(13):
+            decisions[i, j] = decision[j]
+    return decisions
+
+
+# Last formatted timestamp: [epoch second, ISO string]
+_ts_cache = [0, '']
+
+
+def _timestamp():
+    """ISO timestamp at second resolution, reformatted at most once per second"""
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache[0] = now
+        _ts_cache[1] = datetime.fromtimestamp(now).isoformat()
+    return _ts_cache[1]
+
 
 class QuickModelV6:
     """
@@ -48,6 +1097,11 @@ class QuickModelV6:
             'intraday': 0.05,           # Intraday momentum (new)
         }
         
+        # Weights in component score order (technical, sentiment, global,
+        # volume, fundamentals, intraday) as plain floats: for six scalars a
+        # NumPy weight vector costs more than the multiplications it replaces
+        self._w_scalar = tuple(self.weights.values())
+        
         # News sentiment keywords for scoring
         self.bullish_keywords = {
             'earnings_beat': 2.0, 'beat_estimates': 2.0, 'strong_earnings': 1.8,
@@ -65,105 +1119,166 @@ class QuickModelV6:
             'loss': -1.4, 'decline': -1.2, 'warning': -1.3,
         }
         
-    def predict(self, features: Dict) -> Dict:
+        # Aho-Corasick automaton over both keyword sets, shared by instances
+        # using the same keywords (None without pyahocorasick)
+        self._kw_automaton = self._keyword_automaton(self.bullish_keywords, self.bearish_keywords)
+        
+        # LRU cache of predict() results keyed on the feature items
+        self.predict_cache_size = int(os.getenv('QM_PREDICT_CACHE_SIZE', '1024'))
+        self._predict_cache = OrderedDict()
+        
+    def warm_up(self):
+        """
+        Compile the scoring kernels (or load them from the numba cache)
+        
+        Until then single predictions run the kernels as plain Python, so a
+        one-shot CLI call never imports numba. predict_many compiles on
+        first use; serve() calls this at startup so the first request does
+        not pay for it.
+        """
+        compile_kernels(globals())
+        packed = np.zeros(len(FEATURE_INDEX))
+        _decide(packed, _score_all(packed, 0), self._w_scalar, 1.0,
+                self.min_confidence, self.max_confidence)
+    
+    def predict(self, features: Dict, timestamp: Optional[str] = None) -> Dict:
         """
         Enhanced prediction with comprehensive multi-factor analysis
         
+        Repeated calls with equal feature dicts are answered from an LRU cache
+        with a fresh timestamp. Nested values (scores, signals, ...) are shared
+        with the cached entry. Features holding unhashable values (lists,
+        dicts) are never cached.
+        
         Args:
             features: Dictionary containing all input features
+            timestamp: ISO timestamp to stamp the result with (optional,
+                defaults to the current second)
             
         Returns:
             Dictionary with prediction, confidence, target price, and detailed signals
         """
+        if self.predict_cache_size <= 0:
+            return self._predict_uncached(features, timestamp)
+        
         try:
-            # Convert all numpy types to Python native types for JSON serialization
-            features = self._sanitize_numpy_types(features)
+            key = tuple(sorted(features.items()))
+            hash(key)
+        except (TypeError, AttributeError):
+            return self._predict_uncached(features, timestamp)
+        
+        cache = self._predict_cache
+        result = cache.get(key)
+        if result is not None:
+            cache.move_to_end(key)
+            return dict(result, timestamp=timestamp or _timestamp())
+        
+        result = self._predict_uncached(features, timestamp)
+        cache[key] = result
+        if len(cache) > self.predict_cache_size:
+            cache.popitem(last=False)
+        return dict(result)
+    
+    def predict_many(self, features_list: List[Dict], timestamp: Optional[str] = None) -> List[Dict]:
+        """
+        Predict many feature dicts at once
+        
+        All rows are packed into one feature matrix; their component scores,
+        then their composite scores, probabilities and target prices, are
+        computed in parallel compiled calls over the whole matrix. Only the
+        signals, reasons and response dicts are built per row. Results are
+        not cached. Rows that cannot be packed (non-numeric values) are
+        predicted one at a time instead.
+        
+        Args:
+            features_list: List of feature dictionaries
+            timestamp: ISO timestamp to stamp every result with (optional,
+                defaults to the current second)
             
+        Returns:
+            List of prediction dicts, in input order
+        """
+        rows = list(features_list)
+        if not rows:
+            return []
+        timestamp = timestamp or _timestamp()
+        compile_kernels(globals())
+        
+        packed = np.zeros((len(rows), len(FEATURE_INDEX)))
+        masks = np.zeros(len(rows), dtype=np.int64)
+        unsupported = set()
+        for i, features in enumerate(rows):
+            try:
+                packed[i], masks[i] = _pack_features(features)
+            except (TypeError, ValueError, AttributeError):
+                unsupported.add(i)
+        scores = _score_all_batch(packed, masks)
+        decisions = _decide_batch(
+            packed, scores, self._w_scalar, self.min_confidence, self.max_confidence
+        ).tolist()
+        scores = scores.tolist()
+        
+        return [
+            self._predict_uncached(features, timestamp)
+            if i in unsupported else
+            self._predict_uncached(features, timestamp, packed[i], tuple(scores[i]),
+                                   tuple(decisions[i]))
+            for i, features in enumerate(rows)
+        ]
+    
+    def clear_prediction_cache(self):
+        """Drop all memoized predict() results"""
+        self._predict_cache.clear()
+    
+    def _predict_uncached(self, features: Dict, timestamp: Optional[str] = None,
+                          packed: Optional[np.ndarray] = None,
+                          component_scores: Optional[Tuple[float, ...]] = None,
+                          decision: Optional[Tuple[float, ...]] = None) -> Dict:
+        """
+        Run the full prediction pipeline for one feature dict
+        
+        packed, component_scores and decision, when given, are the packed
+        feature vector and the _score_all and _decide results for these
+        features, precomputed by predict_many, and are not recomputed.
+        """
+        try:
             # Extract and validate features
             current_price = float(features.get('current_price', 0))
             if current_price <= 0:
                 return self._error_response("Invalid current price")
             
-            # Calculate all component scores
-            technical_score = self._calculate_technical_score_v2(features)
-            sentiment_score = self._calculate_sentiment_score_v2(features)
-            global_score = self._calculate_global_market_score_v2(features)
-            volume_score = self._calculate_volume_score_v2(features)
-            fundamental_score = self._calculate_fundamental_score_v2(features)
-            intraday_score = self._calculate_intraday_score(features)
-            
-            # CRITICAL FIX: Dampen sentiment when price contradicts it significantly
-            price_change_1d = features.get('price_change_1d', 0)
-            if price_change_1d < -2.0 and sentiment_score > 0.2:
-                # Stock down >2% but sentiment positive - reduce sentiment influence
-                original_sentiment = sentiment_score
-                sentiment_score = sentiment_score * 0.5  # Cut sentiment in half
-                print(f"WARNING: Price down {price_change_1d:.1f}% but sentiment positive {original_sentiment:.3f} - reducing to {sentiment_score:.3f}", file=sys.stderr)
-            elif price_change_1d > 2.0 and sentiment_score < -0.2:
-                # Stock up >2% but sentiment negative - reduce sentiment influence
-                original_sentiment = sentiment_score
-                sentiment_score = sentiment_score * 0.5
-                print(f"WARNING: Price up {price_change_1d:.1f}% but sentiment negative {original_sentiment:.3f} - reducing to {sentiment_score:.3f}", file=sys.stderr)
-            
-            # Extract individual market influence scores with weighted impact percentages
-            asian_score, asian_impact_pct = self._calculate_asian_market_score_with_impact(features)
-            european_score, european_impact_pct = self._calculate_european_market_score_with_impact(features)
-            local_score, local_factors = self._calculate_local_us_factors(features)
-            
-            # Calculate local impact percentage (0-10% range)
-            local_impact_pct = self._calculate_local_impact_percent(local_score, local_factors)
-            
-            # Calculate weighted composite score (-1 to +1)
-            composite_score = (
-                technical_score * self.weights['technical'] +
-                sentiment_score * self.weights['sentiment'] +
-                global_score * self.weights['global_markets'] +
-                volume_score * self.weights['volume'] +
-                fundamental_score * self.weights['fundamentals'] +
-                intraday_score * self.weights['intraday']
-            )
-            
-            # Enhanced probability calculation with better calibration
-            bullish_probability = self._calibrate_probability(composite_score, features, technical_score, sentiment_score)
-            
-            # CRITICAL FIX: Hard override for clearly bearish/bullish composite scores
-            if composite_score < -0.1:
-                # Composite clearly bearish - ensure bearish prediction
-                bullish_probability = min(bullish_probability, 0.44)
-            elif composite_score > 0.1:
-                # Composite clearly bullish - ensure bullish prediction
-                bullish_probability = max(bullish_probability, 0.56)
+            # Calculate all component, overseas and local scores in one compiled call
+            if component_scores is None:
+                packed, mask = _pack_features(features)
+                component_scores = _score_all(packed, mask)
+            (technical_score, sentiment_score, volume_score, fundamental_score, intraday_score,
+             global_score, asian_score, asian_impact_pct, european_score, european_impact_pct,
+             local_score, local_impact_pct, *local_factor_values) = component_scores
             
-            # Ensure no neutral (must be >= 55% or <= 45%)
-            if 0.45 < bullish_probability < 0.55:
-                # Push to stronger conviction based on strongest signal
-                strongest_signal = max(
-                    abs(technical_score), abs(sentiment_score), 
-                    abs(global_score), abs(intraday_score)
-                )
-                if strongest_signal > 0.3:
-                    bullish_probability = 0.58 if composite_score >= 0 else 0.42
-                else:
-                    # NO DEFAULT BIAS - follow the composite score direction
-                    bullish_probability = 0.56 if composite_score > 0 else 0.44
+            # Dampened sentiment, weighted parts, composite score, calibrated
+            # probabilities and target price in one compiled call
+            if decision is None:
+                decision = _decide(packed, component_scores, self._w_scalar, current_price,
+                                   self.min_confidence, self.max_confidence)
+            (dampened_sentiment, technical_part, sentiment_part, global_part, volume_part,
+             fundamental_part, intraday_part, composite_score, bullish_probability,
+             bearish_probability, confidence, target_price, target_change_percent) = decision
+            if dampened_sentiment != sentiment_score:
+                price_change_1d = packed[F_PRICE_CHANGE_1D]
+                _log.warning("Price down %.1f%% but sentiment positive %.3f - reducing to %.3f"
+                             if price_change_1d < 0 else
+                             "Price up %.1f%% but sentiment negative %.3f - reducing to %.3f",
+                             price_change_1d, sentiment_score, dampened_sentiment)
+            sentiment_score = dampened_sentiment
             
-            bearish_probability = 1 - bullish_probability
+            # Local US market factors (the local score and its 0-10% impact
+            # percentage come with the component scores)
+            local_factors = dict(zip(_LOCAL_FACTORS, local_factor_values))
             
             # Determine direction
             is_bullish = bullish_probability > 0.5
-            confidence = bullish_probability if is_bullish else bearish_probability
             direction = 'up' if is_bullish else 'down'
             
-            # Calculate realistic target price with improved logic
-            target_price, target_change_percent = self._calculate_target_price_v2(
-                current_price, 
-                confidence, 
-                is_bullish,
-                features,
-                technical_score,
-                sentiment_score
-            )
-            
             # Generate comprehensive trading signals
             signals = self._generate_signals_v2(
                 features, 
@@ -176,12 +1291,12 @@ class QuickModelV6:
             
             # Calculate component contributions for transparency
             contributions = {
-                'technical': round(technical_score * self.weights['technical'], 3),
-                'sentiment': round(sentiment_score * self.weights['sentiment'], 3),
-                'global_markets': round(global_score * self.weights['global_markets'], 3),
-                'volume': round(volume_score * self.weights['volume'], 3),
-                'fundamentals': round(fundamental_score * self.weights['fundamentals'], 3),
-                'intraday': round(intraday_score * self.weights['intraday'], 3),
+                'technical': round(technical_part, 3),
+                'sentiment': round(sentiment_part, 3),
+                'global_markets': round(global_part, 3),
+                'volume': round(volume_part, 3),
+                'fundamentals': round(fundamental_part, 3),
+                'intraday': round(intraday_part, 3),
             }
             
             # Calculate market influence contributions (impact % converted to decimal)
@@ -189,6 +1304,11 @@ class QuickModelV6:
             european_contribution = european_score * (european_impact_pct / 100)
             local_contribution = local_score * (local_impact_pct / 100)
             
+            # Values reported under more than one key are rounded once
+            confidence_rounded = round(confidence, 4)
+            change_rounded = round(target_change_percent, 2)
+            composite_rounded = round(composite_score, 3)
+            
             # Build comprehensive response
             response = {
                 'success': True,
@@ -198,12 +1318,12 @@ class QuickModelV6:
                     'label': 'BULLISH' if is_bullish else 'BEARISH',
                     'bullish_probability': round(bullish_probability, 4),
                     'bearish_probability': round(bearish_probability, 4),
-                    'confidence': round(confidence, 4),
+                    'confidence': confidence_rounded,
                     'predicted_price': round(target_price, 2),
-                    'target_change_percent': round(target_change_percent, 2),
-                    'expected_pct_move': round(target_change_percent, 2),
+                    'target_change_percent': change_rounded,
+                    'expected_pct_move': change_rounded,
                     'current_price': round(current_price, 2),
-                    'probability': round(confidence, 4),  # For compatibility
+                    'probability': confidence_rounded,  # For compatibility
                 },
                 'scores': {
                     'technical': round(technical_score, 3),
@@ -212,9 +1332,9 @@ class QuickModelV6:
                     'volume': round(volume_score, 3),
                     'fundamentals': round(fundamental_score, 3),
                     'intraday': round(intraday_score, 3),
-                    'composite': round(composite_score, 3),
-                    'base_score': round(composite_score, 3),
-                    'final_score': round(composite_score, 3),
+                    'composite': composite_rounded,
+                    'base_score': composite_rounded,
+                    'final_score': composite_rounded,
                 },
                 'asian_influence_score': round(asian_score, 3),
                 'asian_impact_percent': round(asian_impact_pct, 4),
@@ -243,11 +1363,11 @@ class QuickModelV6:
                 'top_reasons': self._generate_top_reasons(
                     features, is_bullish, technical_score, sentiment_score
                 ),
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': timestamp or _timestamp(),
             }
             
-            # Sanitize entire response to remove numpy types
-            return self._sanitize_numpy_types(response)
+            # May hold NumPy scalars; _dumps encodes them
+            return response
             
         except Exception as e:
             return self._error_response(f"Prediction error: {str(e)}")
@@ -256,232 +1376,41 @@ class QuickModelV6:
         """
         Enhanced technical indicator score with pattern recognition
         """
-        score = 0.0
-        count = 0
-        
-        # RSI Analysis (improved)
-        rsi = features.get('rsi')
-        if rsi is not None:
-            if rsi < 25:
-                score += 0.9  # Extreme oversold
-            elif rsi < 30:
-                score += 0.8  # Strong oversold
-            elif rsi < 40:
-                score += 0.4  # Moderately oversold
-            elif rsi > 75:
-                score -= 0.9  # Extreme overbought
-            elif rsi > 70:
-                score -= 0.8  # Strong overbought
-            elif rsi > 60:
-                score -= 0.4  # Moderately overbought
-            else:
-                score += (50 - rsi) / 100 * 0.3  # Slight bias
-            count += 1
-        
-        # MACD with histogram divergence (enhanced)
-        macd_hist = features.get('macd_histogram')
-        macd_signal_diff = features.get('macd_signal_diff', 0)
-        if macd_hist is not None:
-            if macd_hist > 1.0:
-                score += 0.85  # Strong bullish
-            elif macd_hist > 0.3:
-                score += 0.5
-            elif macd_hist > 0:
-                score += 0.25
-            elif macd_hist < -1.0:
-                score -= 0.85  # Strong bearish
-            elif macd_hist < -0.3:
-                score -= 0.5
-            else:
-                score -= 0.25
-            count += 1
-            
-            # MACD divergence detection
-            if macd_signal_diff > 0.5 and macd_hist < 0:
-                score += 0.3  # Bullish divergence
-            elif macd_signal_diff < -0.5 and macd_hist > 0:
-                score -= 0.3  # Bearish divergence
-        
-        # Moving Average Crossover & Golden/Death Cross (enhanced)
-        sma_20 = features.get('sma_20')
-        sma_50 = features.get('sma_50')
-        sma_200 = features.get('sma_200')
-        current_price = features.get('current_price')
-        
-        if all(v is not None for v in [sma_20, sma_50, current_price]):
-            # Price position
-            if current_price > sma_20 > sma_50:
-                score += 0.7  # Strong bullish alignment
-            elif current_price > sma_20:
-                score += 0.4
-            elif current_price < sma_20 < sma_50:
-                score -= 0.7  # Strong bearish alignment
-            elif current_price < sma_20:
-                score -= 0.4
-            
-            # Golden Cross / Death Cross detection
-            if sma_200 is not None:
-                if sma_50 > sma_200 and sma_20 > sma_50:
-                    score += 0.5  # Golden cross setup
-                elif sma_50 < sma_200 and sma_20 < sma_50:
-                    score -= 0.5  # Death cross setup
-            
-            count += 1
-        
-        # Bollinger Bands (enhanced with width)
-        bb_position = features.get('bollinger_position')  # 0-1 scale
-        bb_width = features.get('bollinger_width', 0)  # Band width indicator
-        if bb_position is not None:
-            if bb_position < 0.15:
-                score += 0.6  # Very close to lower band
-            elif bb_position < 0.3:
-                score += 0.35
-            elif bb_position > 0.85:
-                score -= 0.6  # Very close to upper band
-            elif bb_position > 0.7:
-                score -= 0.35
-            
-            # Bollinger band squeeze (volatility compression)
-            if bb_width < 0.1:  # Very narrow bands
-                score += 0.2  # Potential breakout
-            
-            count += 1
-        
-        # Price momentum (1-day and 5-day) - ENHANCED
-        price_change_1d = features.get('price_change_1d', 0)
-        price_change_5d = features.get('price_change_5d', 0)
-        
-        # Recent 1-day momentum (higher weight for immediate price action)
-        if abs(price_change_1d) > 0:
-            day_momentum = np.tanh(price_change_1d / 3) * 0.5  # Stronger influence
-            # Extra penalty for significant drops
-            if price_change_1d < -2.0:
-                day_momentum -= 0.3  # Additional bearish signal for big drops
-            score += day_momentum
-            count += 1
-        
-        # 5-day momentum (medium-term trend)
-        if abs(price_change_5d) > 0:
-            week_momentum = np.tanh(price_change_5d / 8) * 0.4
-            score += week_momentum
-            count += 1
-        
-        # Support & Resistance with bounce detection
-        near_support = features.get('near_support', False)
-        near_resistance = features.get('near_resistance', False)
-        bounce_from_support = features.get('bounce_from_support', False)
-        failed_resistance = features.get('failed_resistance', False)
-        
-        if bounce_from_support:
-            score += 0.5  # Active bounce is bullish
-        elif near_support:
-            score += 0.3
-        
-        if failed_resistance:
-            score -= 0.5  # Failed breakout is bearish
-        elif near_resistance:
-            score -= 0.3
-        
-        # Normalize and return
-        return np.clip(score / max(count, 1) if count > 0 else 0, -1, 1)
+        f, mask = _pack_features(features)
+        return _technical_score(f, mask)
     
     def _calculate_sentiment_score_v2(self, features: Dict) -> float:
         """
         Enhanced news and social sentiment analysis with keyword scoring
         Incorporates bullish/bearish keyword counts and weights
         """
-        score = 0.0
-        count = 0
-        
-        # Base sentiment from averaged news articles
-        news_sentiment = features.get('news_sentiment_score', 0)
-        news_count = features.get('news_count', 0)
-        
-        if news_count > 0:
-            # Base sentiment weighted by count
-            weight = min(news_count / 15, 1.0)  # Max at 15 articles
-            score += news_sentiment * weight * 0.5  # Reduced from 0.9
-            count += 1
-        
-        # KEYWORD-BASED SENTIMENT BOOST (this is the critical fix!)
-        bullish_keyword_count = features.get('bullish_keyword_count', 0)
-        bearish_keyword_count = features.get('bearish_keyword_count', 0)
-        bullish_keyword_score = features.get('bullish_keyword_score_total', 0.0)
-        bearish_keyword_score = features.get('bearish_keyword_score_total', 0.0)
-        has_high_impact_keywords = features.get('has_high_impact_keywords', False)
-        
-        # Net keyword sentiment
-        if bullish_keyword_count > 0 or bearish_keyword_count > 0:
-            net_keyword_score = bullish_keyword_score - bearish_keyword_score
-            keyword_sentiment = np.tanh(net_keyword_score / 10.0)  # Normalize large scores
-            score += keyword_sentiment * 0.7  # 70% weight to keywords
-            count += 1
-            
-            # Extra boost for high-impact keywords
-            if has_high_impact_keywords:
-                score += 0.3 * (1 if bullish_keyword_score >= bearish_keyword_score else -1)
-                count += 1
-            
-            # Keyword analysis is already handled above in keyword sentiment,
-            # so we don't need an additional keyword analysis pass
-        
-        # Earnings impact analysis
-        earnings_surprise = features.get('earnings_surprise_percent', 0)
-        guidance_change = features.get('guidance_change_percent', 0)
-        if abs(earnings_surprise) > 0:
-            # Earnings beats are more impactful
-            surprise_score = np.tanh(earnings_surprise / 15) * 0.8
-            score += surprise_score
-            count += 1
-            
-            # Guidance is important too
-            if abs(guidance_change) > 0:
-                guidance_score = np.tanh(guidance_change / 10) * 0.6
-                score += guidance_score
-                count += 1
-        
-        # Surge keywords detection (more granular)
-        has_surge_keywords = features.get('has_surge_keywords', False)
-        surge_keyword_count = features.get('surge_keyword_count', 0)
-        if has_surge_keywords:
-            surge_boost = min(surge_keyword_count / 5, 1.0) * 0.85  # Normalize
-            score += surge_boost
-            count += 1
-        
-        # Bearish keywords detection
-        has_bearish_keywords = features.get('has_bearish_keywords', False)
-        bearish_keyword_count = features.get('bearish_keyword_count', 0)
-        if has_bearish_keywords:
-            bearish_boost = min(bearish_keyword_count / 5, 1.0) * 0.85
-            score -= bearish_boost
-            count += 1
-        
-        # Social media sentiment (enhanced)
-        social_sentiment = features.get('social_sentiment', 0)
-        social_volume = features.get('social_volume', 0)
-        if abs(social_sentiment) > 0:
-            # Weight by volume
-            social_weight = min(social_volume / 1000, 1.0)
-            score += social_sentiment * social_weight * 0.6
-            count += 1
-        
-        # Sector news influence
-        sector_sentiment = features.get('sector_sentiment', 0)
-        if abs(sector_sentiment) > 0:
-            score += sector_sentiment * 0.3  # Lower weight for sector
-            count += 1
-        
-        # Analyst activity
-        analyst_upgrades = features.get('analyst_upgrades', 0)
-        analyst_downgrades = features.get('analyst_downgrades', 0)
-        if analyst_upgrades > 0:
-            score += min(analyst_upgrades / 3, 1.0) * 0.5
-            count += 1
-        if analyst_downgrades > 0:
-            score -= min(analyst_downgrades / 3, 1.0) * 0.5
-            count += 1
+        return _sentiment_score(_pack_features(features)[0])
+    
+    # Automata built by _keyword_automaton, keyed on the keyword weights
+    _kw_automata = {}
+    
+    @classmethod
+    def _keyword_automaton(cls, bullish_keywords: Dict, bearish_keywords: Dict):
+        """
+        Aho-Corasick automaton matching every bullish and bearish keyword
         
-        return np.clip(score / max(count, 1) if count > 0 else 0, -1, 1)
+        Each keyword's payload is (side, rank, weight): side is 1 for bullish
+        and -1 for bearish, rank its position in its dict. Returns None when
+        pyahocorasick is not installed.
+        """
+        if not HAS_AHOCORASICK:
+            return None
+        
+        key = (tuple(bullish_keywords.items()), tuple(bearish_keywords.items()))
+        automaton = cls._kw_automata.get(key)
+        if automaton is None:
+            automaton = ahocorasick.Automaton()
+            for side, keyword_weights in ((1, bullish_keywords), (-1, bearish_keywords)):
+                for rank, (keyword, weight) in enumerate(keyword_weights.items()):
+                    automaton.add_word(keyword, (side, rank, weight))
+            automaton.make_automaton()
+            cls._kw_automata[key] = automaton
+        return automaton
     
     def _analyze_news_keywords(self, keywords: List[str]) -> float:
         """
@@ -493,6 +1422,21 @@ class QuickModelV6:
         score = 0.0
         matched_count = 0
         
+        if self._kw_automaton is not None:
+            # One automaton pass per keyword. Like the loop below, each keyword
+            # counts its first bullish and first bearish match in dict order.
+            for keyword in keywords:
+                first = [None, None, None]  # Indexed by side: [_, bullish, bearish]
+                for _, (side, rank, weight) in self._kw_automaton.iter(keyword.lower()):
+                    if first[side] is None or rank < first[side][0]:
+                        first[side] = (rank, weight)
+                for match in first[1:]:
+                    if match is not None:
+                        score += match[1] * 0.1
+                        matched_count += 1
+            
+            return _clip1(score / matched_count) if matched_count > 0 else 0.0
+        
         for keyword in keywords:
             keyword_lower = keyword.lower()
             
@@ -510,108 +1454,18 @@ class QuickModelV6:
                     matched_count += 1
                     break
         
-        return np.clip(score / max(matched_count, 1) if matched_count > 0 else 0, -1, 1)
+        return _clip1(score / matched_count) if matched_count > 0 else 0.0
     
-    def _calculate_global_market_score_v2(self, features: Dict) -> float:
-        """
-        Enhanced global market correlation with time-of-day weighting
+    def _calculate_global_market_scores(self, features: Dict) -> Tuple[float, float, float, float, float]:
         """
-        score = 0.0
-        
-        # Asian markets (75% weight) - especially important for US market open
-        asian_change = features.get('asian_market_change', 0)
-        asian_sentiment = features.get('asian_market_sentiment', 'neutral')
-        asian_strength = features.get('asian_market_strength', 0)  # 0-1 scale
-        
-        if asian_sentiment == 'positive':
-            score += 0.65
-        elif asian_sentiment == 'negative':
-            score -= 0.65
-        elif abs(asian_change) > 0.5:
-            score += np.tanh(asian_change) * 0.6
-        
-        # Boost if Asian markets are strong
-        if asian_strength > 0:
-            score += asian_strength * 0.2
+        Enhanced global market correlation with time-of-day weighting, plus
+        the Asian and European influence scores and impact percentages
         
-        # European markets (25% weight)
-        european_change = features.get('european_market_change', 0)
-        european_sentiment = features.get('european_market_sentiment', 'neutral')
-        
-        if european_sentiment == 'positive':
-            score += 0.2
-        elif european_sentiment == 'negative':
-            score -= 0.2
-        elif abs(european_change) > 0.5:
-            score += np.tanh(european_change) * 0.15
-        
-        # Futures sentiment (US pre-market)
-        futures_sentiment = features.get('futures_sentiment', 'neutral')
-        futures_change = features.get('futures_change', 0)
-        if futures_sentiment == 'positive':
-            score += 0.2
-        elif futures_sentiment == 'negative':
-            score -= 0.2
-        elif abs(futures_change) > 0.5:
-            score += np.tanh(futures_change) * 0.15
-        
-        return np.clip(score, -1, 1)
-    
-    def _calculate_asian_market_score_with_impact(self, features: Dict) -> Tuple[float, float]:
-        """
-        Calculate Asian market influence score and impact percentage.
-        Impact % is based on absolute strength of Asian markets (0-5% typical range)
-        """
-        score = 0.0
-        impact_pct = 0.0
-        
-        asian_change = features.get('asian_market_change', 0)
-        asian_sentiment = features.get('asian_market_sentiment', 'neutral')
-        asian_strength = features.get('asian_market_strength', 0)  # 0-1 scale
-        
-        if asian_sentiment == 'positive':
-            # Dynamic score based on actual change, not hardcoded
-            score = min(0.4 + abs(asian_change) * 0.3, 1.0)
-            impact_pct = min(abs(asian_change) * 2 + 2.5, 5.0)  # 2.5-5% for positive
-        elif asian_sentiment == 'negative':
-            score = max(-0.4 - abs(asian_change) * 0.3, -1.0)
-            impact_pct = min(abs(asian_change) * 2 + 1.5, 4.0)  # 1.5-4% for negative
-        elif abs(asian_change) > 0.5:
-            score = np.tanh(asian_change) * 0.6
-            impact_pct = min(abs(asian_change) * 1.5, 3.0)  # Up to 3% for moderate
-        else:
-            score = asian_strength * 0.3 if asian_strength > 0 else 0.0
-            impact_pct = asian_strength * 1.5  # 0-1.5% for neutral/weak
-        
-        return np.clip(score, -1, 1), np.clip(impact_pct, 0, 10)
-    
-    def _calculate_european_market_score_with_impact(self, features: Dict) -> Tuple[float, float]:
-        """
-        Calculate European market influence score and impact percentage.
-        Impact % is based on absolute strength of European markets (0-8% typical range)
+        Returns:
+            (global_score, asian_score, asian_impact_pct,
+             european_score, european_impact_pct)
         """
-        score = 0.0
-        impact_pct = 0.0
-        
-        european_change = features.get('european_market_change', 0)
-        european_sentiment = features.get('european_market_sentiment', 'neutral')
-        european_strength = features.get('european_market_strength', 0)  # 0-1 scale
-        
-        if european_sentiment == 'positive':
-            # Dynamic score based on actual change, not hardcoded
-            score = min(0.45 + abs(european_change) * 0.35, 1.0)
-            impact_pct = min(abs(european_change) * 2.5 + 3.5, 8.0)  # 3.5-8% for positive
-        elif european_sentiment == 'negative':
-            score = max(-0.45 - abs(european_change) * 0.35, -1.0)
-            impact_pct = min(abs(european_change) * 2.5 + 2.5, 7.0)  # 2.5-7% for negative
-        elif abs(european_change) > 0.5:
-            score = np.tanh(european_change) * 0.6
-            impact_pct = min(abs(european_change) * 2, 5.0)  # Up to 5% for moderate
-        else:
-            score = european_strength * 0.35 if european_strength > 0 else 0.0
-            impact_pct = european_strength * 2.0  # 0-2% for neutral/weak
-        
-        return np.clip(score, -1, 1), np.clip(impact_pct, 0, 15)
+        return _global_scores(_pack_features(features)[0])
     
     def _calculate_local_us_factors(self, features: Dict) -> Tuple[float, Dict]:
         """
@@ -619,279 +1473,37 @@ class QuickModelV6:
         Now includes US market indices (S&P 500, NASDAQ, Russell)
         Returns score and detailed breakdown of each factor.
         """
-        factors = {
-            'technical': 0.0,
-            'sentiment': 0.0,
-            'volume': 0.0,
-            'intraday': 0.0,
-            'fundamentals': 0.0,
-            'us_markets': 0.0,  # NEW: US market indices factor
-        }
-        
-        # Extract component scores
-        rsi = features.get('rsi', 50)
-        macd = features.get('macd', 0)
-        technical_component = features.get('technical_score', 0)  # Will be calculated from RSI/MACD
-        
-        # Technical: RSI + MACD contribution
-        if rsi < 30:
-            factors['technical'] = 0.7
-        elif rsi > 70:
-            factors['technical'] = -0.7
-        elif rsi < 40:
-            factors['technical'] = 0.3
-        elif rsi > 60:
-            factors['technical'] = -0.3
-        
-        if macd != 0:
-            factors['technical'] += np.tanh(macd) * 0.4
-        
-        # Sentiment: news sentiment
-        sentiment_score = features.get('news_sentiment_score', 0)
-        factors['sentiment'] = np.tanh(sentiment_score / 5) * 0.8
-        
-        # Volume: volume ratio
-        volume_ratio = features.get('volume_ratio', 1.0)
-        if volume_ratio > 1.5:
-            factors['volume'] = 0.6
-        elif volume_ratio > 1.2:
-            factors['volume'] = 0.3
-        elif volume_ratio < 0.8:
-            factors['volume'] = -0.2
-        
-        # Intraday: price change during the day
-        intraday_change = features.get('intraday_change_percent', 0)
-        factors['intraday'] = np.tanh(intraday_change / 3) * 0.5
-        
-        # Fundamentals: PE percentile, earnings growth
-        pe_pct = features.get('pe_percentile', 50)
-        earnings_growth = features.get('earnings_growth', 0)
-        factors['fundamentals'] = ((pe_pct - 50) / 50) * 0.4 + np.tanh(earnings_growth / 20) * 0.3
-        
-        # CRITICAL FIX: US Market Indices Factor
-        # Use actual S&P 500, NASDAQ, DOW, Russell data to influence prediction
-        us_market_influence = features.get('us_market_influence_score', 0.0)
-        us_sentiment = features.get('us_market_sentiment', 'neutral')
-        sp500_change = features.get('sp500_change_pct', 0.0)
-        nasdaq_change = features.get('nasdaq_change_pct', 0.0)
-        
-        # Apply US market influence with HIGH weight (40% of local score)
-        # When markets are strongly bearish/bullish, it should significantly affect prediction
-        if us_sentiment == 'negative' or us_market_influence < -0.2:
-            # Bearish US market - apply strong negative influence
-            factors['us_markets'] = max(-0.9, us_market_influence * 1.2)
-        elif us_sentiment == 'positive' or us_market_influence > 0.2:
-            # Bullish US market - apply strong positive influence  
-            factors['us_markets'] = min(0.9, us_market_influence * 1.2)
-        else:
-            # Neutral - still apply but dampened
-            factors['us_markets'] = us_market_influence * 0.8
-        
-        # Calculate combined local score with weighted US markets (40% weight)
-        # US markets get 40% weight, other factors share 60%
-        us_weight = 0.40
-        other_weight = 0.60
-        
-        other_factors_avg = np.mean([
-            factors['technical'],
-            factors['sentiment'],
-            factors['volume'],
-            factors['intraday'],
-            factors['fundamentals']
-        ])
-        
-        local_score = (factors['us_markets'] * us_weight) + (other_factors_avg * other_weight)
-        
-        # Normalize factors to -1 to 1
-        for key in factors:
-            factors[key] = np.clip(factors[key], -1, 1)
-        
-        return np.clip(local_score, -1, 1), factors
+        local_score, _, *factors = _local_factors(_pack_features(features)[0])
+        return local_score, dict(zip(_LOCAL_FACTORS, factors))
     
     def _calculate_volume_score_v2(self, features: Dict) -> float:
         """
         Enhanced volume analysis - considers both volume AND price direction
         CRITICAL FIX: When price drops significantly, volume score should reflect that
         """
-        volume_ratio = features.get('volume_ratio', 1.0)
-        volume_trend = features.get('volume_trend', 'stable')
-        volume_spike = features.get('volume_spike', False)
-        price_change = features.get('price_change_1d', 0)
-        
-        score = 0.0
-        
-        # PRIMARY: Volume ratio scoring WITH price direction awareness
-        if volume_ratio > 2.0:
-            # High volume - direction matters more
-            if price_change > 1.0:
-                score = 0.8  # High volume + up = very bullish
-            elif price_change < -1.0:
-                score = -0.8  # High volume + down = very bearish
-            else:
-                score = 0.4  # High volume + neutral = slightly bullish
-        elif volume_ratio > 1.5:
-            # Elevated volume
-            if price_change > 1.0:
-                score = 0.6
-            elif price_change < -1.0:
-                score = -0.6
-            else:
-                score = 0.3
-        elif volume_ratio > 1.0:
-            # Normal to slightly above
-            score = np.tanh(price_change / 2) * 0.4  # Follow price direction
-        elif volume_ratio > 0.8:
-            # Normal range - still follow price
-            score = np.tanh(price_change / 2) * 0.3
-        else:
-            # Low volume - weak signal but still consider price
-            score = np.tanh(price_change / 3) * 0.2
-        
-        # CRITICAL: If price dropped >2%, apply strong penalty regardless of volume
-        if price_change < -2.0:
-            score = min(score, -0.5)  # Ensure at least -0.5 for big drops
-        elif price_change < -1.5:
-            score = min(score, -0.3)  # Moderate penalty for 1.5%+ drops
-        
-        # Volume trend as modifier
-        if volume_trend == 'up':
-            score += 0.1  # Increasing volume amplifies signal
-        elif volume_trend == 'down':
-            score -= 0.05  # Decreasing volume weakens signal
-        
-        return np.clip(score, -1, 1)
+        return _volume_score(_pack_features(features)[0])
     
     def _calculate_fundamental_score_v2(self, features: Dict) -> float:
         """
         Enhanced fundamental analysis
         """
-        score = 0.0
-        count = 0
-        
-        # Revenue growth
-        revenue_growth = features.get('revenue_growth', 0)
-        if abs(revenue_growth) > 0.5:
-            score += np.tanh(revenue_growth / 25) * 0.7
-            count += 1
-        
-        # Earnings growth (more important)
-        earnings_growth = features.get('earnings_growth', 0)
-        if abs(earnings_growth) > 0.5:
-            score += np.tanh(earnings_growth / 30) * 0.8
-            count += 1
-        
-        # Profit margin
-        margin_change = features.get('margin_change_percent', 0)
-        if abs(margin_change) > 0.5:
-            score += np.tanh(margin_change / 20) * 0.5
-            count += 1
-        
-        # Analyst ratings
-        analyst_action = features.get('analyst_action', 'none')
-        if analyst_action == 'upgrade':
-            score += 0.6
-            count += 1
-        elif analyst_action == 'downgrade':
-            score -= 0.6
-            count += 1
-        
-        # Insider activity
-        insider_activity = features.get('insider_activity', 'neutral')
-        if insider_activity == 'buying':
-            score += 0.5
-            count += 1
-        elif insider_activity == 'selling':
-            score -= 0.5
-            count += 1
-        
-        # PE ratio relative to peers - ALWAYS EVALUATE even if at default 50
-        pe_percentile = features.get('pe_percentile', 50)  # 0-100 scale
-        pe_score = (pe_percentile - 50) / 50  # Convert to -1 to +1 range
-        score += pe_score * 0.5  # PE is 50% of fundamental score
-        count += 1
-        
-        # Ensure we always have at least a PE-based score
-        if count == 0:
-            count = 1
-        
-        return np.clip(score / max(count, 1), -1, 1)
+        return _fundamental_score(_pack_features(features)[0])
     
     def _calculate_intraday_score(self, features: Dict) -> float:
         """
         Calculate intraday momentum and price action
         """
-        score = 0.0
-        count = 0
-        
-        # Intraday change
-        intraday_change = features.get('intraday_change_percent', 0)
-        if abs(intraday_change) > 0.1:  # Very small threshold
-            score += np.tanh(intraday_change / 5) * 0.5
-            count += 1
-        else:
-            # Even with 0 intraday change, contribute based on volume activity
-            intraday_volume_ratio = features.get('intraday_volume_ratio', 1.0)
-            if intraday_volume_ratio > 1.0:
-                # More activity during day = bullish
-                score += (intraday_volume_ratio - 1.0) * 0.1
-            count += 1
-        
-        # Intraday volume vs daily average
-        intraday_volume_ratio = features.get('intraday_volume_ratio', 1.0)
-        if intraday_volume_ratio > 1.5:
-            score += np.tanh((intraday_volume_ratio - 1) * 2) * 0.3
-            count += 1
-        elif intraday_volume_ratio > 1.1:  # Even modest increase
-            score += (intraday_volume_ratio - 1.0) * 0.2
-            count += 1
-        
-        # Opening vs closing position
-        open_close_gap = features.get('open_close_gap_percent', 0)
-        if abs(open_close_gap) > 0.1:  # Very small threshold
-            score += np.tanh(open_close_gap / 3) * 0.4
-            count += 1
-        
-        # Ensure at least some contribution from volume ratio
-        if count == 0:
-            count = 1
-        
-        return np.clip(score / max(count, 1), -1, 1)
+        return _intraday_score(_pack_features(features)[0])
     
-    def _calibrate_probability(self, composite_score: float, features: Dict, tech_score: float = None, sent_score: float = None) -> float:
+    def _calibrate_probability(self, composite_score: float, features: Dict,
+                               tech_score: float, sent_score: float) -> float:
         """
         Calibrate probability with improved mapping and confidence boosting
         """
-        # Map: -1 → 5% bullish, 0 → 50% bullish, +1 → 95% bullish
-        base_probability = (composite_score + 1) / 2
-        
-        # Apply sigmoid function for better calibration at extremes
-        adjusted = 0.5 + 0.45 * np.tanh(composite_score * 1.5)
-        
-        # Boost for strong alignment - use passed scores if available (avoid recalculation)
-        if tech_score is None:
-            tech_score = self._calculate_technical_score_v2(features)
-        if sent_score is None:
-            sent_score = self._calculate_sentiment_score_v2(features)
-        
-        # If both indicators strongly agree, boost confidence
-        if (tech_score > 0.6 and sent_score > 0.5) or (tech_score < -0.6 and sent_score < -0.5):
-            alignment_boost = min(abs(tech_score * sent_score) * 0.1, 0.12)
-            if adjusted > 0.5:
-                adjusted += alignment_boost
-            else:
-                adjusted -= alignment_boost
-        
-        # Volatility adjustment
-        volatility = features.get('volatility', 1.0)
-        if volatility > 2.5:  # High volatility
-            # Pull back from extremes
-            if adjusted > 0.75:
-                adjusted = 0.75 + (adjusted - 0.75) * 0.6
-            elif adjusted < 0.25:
-                adjusted = 0.25 - (0.25 - adjusted) * 0.6
-        
-        # Ensure bounds
-        return np.clip(adjusted, self.min_confidence, self.max_confidence)
+        return _calibrated_probability(
+            _pack_features(features)[0], composite_score, tech_score, sent_score,
+            self.min_confidence, self.max_confidence
+        )
     
     def _calculate_target_price_v2(
         self,
@@ -905,66 +1517,10 @@ class QuickModelV6:
         """
         Enhanced target price calculation with multiple factors
         """
-        # Base move calculation (1% - 8% range for more realistic targets)
-        confidence_factor = (confidence - 0.55) / 0.43  # Normalize 0.55-0.98 to 0-1
-        min_change = 1.0  # Increased from 0.5%
-        max_change = 8.0  # Increased from 5.0%
-        base_change = min_change + (max_change - min_change) * confidence_factor
-        
-        # Market influence boost (global markets, volume, etc)
-        global_markets_score = features.get('global_market_change', 0)
-        volume_score = features.get('volume_ratio', 1.0)
-        market_influence = max(0, global_markets_score * 0.2 + (volume_score - 1.0) * 0.1)
-        
-        # Volatility adjustment
-        volatility = features.get('volatility', 1.0)
-        volatility_multiplier = min(volatility / 1.8, 1.6)  # Increased cap to 1.6
-        
-        # Technical + Sentiment influence on target
-        technical_influence = technical_score * 0.5  # Increased from 0.3
-        sentiment_influence = sentiment_score * 0.6  # Increased from 0.4
-        combined_influence = technical_influence + sentiment_influence
-        
-        # Calculate final move
-        adjusted_change = base_change * volatility_multiplier
-        adjusted_change *= (1 + combined_influence * 0.7)  # Increased from 0.5
-        adjusted_change *= (1 + market_influence)  # Add market influence
-        
-        # Momentum boost - if stock is already moving, extend the target
-        price_change_1d = features.get('price_change_1d', 0)
-        price_change_3d = features.get('price_change_3d', 0)
-        price_change_5d = features.get('price_change_5d', 0)
-        
-        # Recent momentum (1-3 days)
-        if abs(price_change_1d) > 1.5:
-            adjusted_change *= 1.25
-        elif abs(price_change_1d) > 1.0:
-            adjusted_change *= 1.15
-        elif abs(price_change_1d) > 0.5:
-            adjusted_change *= 1.05
-        
-        # Longer momentum (5 days)
-        if abs(price_change_5d) > 4.0:
-            adjusted_change *= 1.20
-        elif abs(price_change_5d) > 2.5:
-            adjusted_change *= 1.12
-        
-        # Ensure move is in same direction as momentum if strong
-        if is_bullish and price_change_1d > 1.0:
-            adjusted_change = max(adjusted_change, price_change_1d * 0.8)  # At least 80% of current day's move
-        elif not is_bullish and price_change_1d < -1.0:
-            adjusted_change = max(adjusted_change, abs(price_change_1d) * 0.8)
-        
-        # Cap the change (wider range)
-        adjusted_change = np.clip(adjusted_change, 0.5, 10.0)
-        
-        # Apply direction
-        change_percent = adjusted_change if is_bullish else -adjusted_change
-        
-        # Calculate target
-        target_price = current_price * (1 + change_percent / 100)
-        
-        return target_price, change_percent
+        return _target_price(
+            _pack_features(features)[0], current_price, confidence, is_bullish,
+            technical_score, sentiment_score
+        )
     
     def _generate_signals_v2(
         self,
@@ -978,70 +1534,34 @@ class QuickModelV6:
         """
         Generate comprehensive trading signals
         """
+        rsi = features.get('rsi')
+        volume_ratio = features.get('volume_ratio', 1.0)
+        news_count = features.get('news_count', 0)
         signals = []
-        top_reasons = []
-        
-        # Strong consensus signals
-        if is_bullish and confidence > 0.80 and technical_score > 0.6 and sentiment_score > 0.4:
-            signals.append({
-                'type': 'BUY',
-                'strength': 'VERY STRONG',
-                'reason': 'Excellent alignment: Bullish technicals + positive sentiment'
-            })
-            top_reasons.append("Strong bullish technical + news alignment")
-        elif is_bullish and confidence > 0.70:
-            signals.append({
-                'type': 'BUY',
-                'strength': 'STRONG',
-                'reason': 'High confidence bullish prediction'
-            })
-            top_reasons.append("High confidence bullish setup")
-        elif is_bullish and confidence > 0.60:
-            signals.append({
-                'type': 'BUY',
-                'strength': 'MODERATE',
-                'reason': 'Bullish momentum detected'
-            })
-            top_reasons.append("Moderate bullish momentum")
         
-        if not is_bullish and confidence > 0.80 and technical_score < -0.6 and sentiment_score < -0.4:
-            signals.append({
-                'type': 'SELL',
-                'strength': 'VERY STRONG',
-                'reason': 'Excellent alignment: Bearish technicals + negative sentiment'
-            })
-            top_reasons.append("Strong bearish technical + news alignment")
-        elif not is_bullish and confidence > 0.70:
-            signals.append({
-                'type': 'SELL',
-                'strength': 'STRONG',
-                'reason': 'High confidence bearish prediction'
-            })
-            top_reasons.append("High confidence bearish setup")
-        elif not is_bullish and confidence > 0.60:
-            signals.append({
-                'type': 'SELL',
-                'strength': 'MODERATE',
-                'reason': 'Bearish momentum detected'
-            })
-            top_reasons.append("Moderate bearish momentum")
+        # Consensus signal: VERY STRONG needs aligned technicals and sentiment
+        if confidence > 0.60:
+            if is_bullish:
+                aligned = technical_score > 0.6 and sentiment_score > 0.4
+            else:
+                aligned = technical_score < -0.6 and sentiment_score < -0.4
+            tier = 0 if confidence > 0.80 and aligned else (1 if confidence > 0.70 else 2)
+            signal_type, strength, reason = _CONSENSUS_SIGNALS[is_bullish][tier]
+            signals.append({'type': signal_type, 'strength': strength, 'reason': reason})
         
         # Technical alerts
-        rsi = features.get('rsi')
         if rsi and rsi > 80:
             signals.append({
                 'type': 'WARNING',
                 'strength': 'CRITICAL',
                 'reason': f'Extreme overbought (RSI: {rsi:.1f}) - Strong correction risk'
             })
-            top_reasons.append("Extreme overbought condition")
         elif rsi and rsi > 75:
             signals.append({
                 'type': 'WARNING',
                 'strength': 'HIGH',
                 'reason': f'Overbought (RSI: {rsi:.1f}) - Correction possible'
             })
-            top_reasons.append("Overbought RSI")
         
         if rsi and rsi < 20:
             signals.append({
@@ -1049,49 +1569,40 @@ class QuickModelV6:
                 'strength': 'CRITICAL',
                 'reason': f'Extreme oversold (RSI: {rsi:.1f}) - Major bounce opportunity'
             })
-            top_reasons.append("Extreme oversold condition")
         elif rsi and rsi < 25:
             signals.append({
                 'type': 'OPPORTUNITY',
                 'strength': 'HIGH',
                 'reason': f'Oversold (RSI: {rsi:.1f}) - Potential bounce'
             })
-            top_reasons.append("Oversold opportunity")
         
         # Volume signals
-        volume_ratio = features.get('volume_ratio', 1.0)
         if volume_ratio > 2.5:
             signals.append({
                 'type': 'ALERT',
                 'strength': 'CRITICAL',
                 'reason': f'Exceptional volume spike ({volume_ratio:.1f}x) - Major activity'
             })
-            top_reasons.append(f"Volume spike: {volume_ratio:.1f}x average")
         elif volume_ratio > 1.8:
             signals.append({
                 'type': 'ALERT',
                 'strength': 'HIGH',
                 'reason': f'High volume ({volume_ratio:.1f}x) - Increased conviction'
             })
-            top_reasons.append(f"Elevated volume: {volume_ratio:.1f}x")
         
         # News sentiment signals
-        if sentiment_score > 0.7 and features.get('news_count', 0) > 5:
+        if sentiment_score > 0.7 and news_count > 5:
             signals.append({
                 'type': 'BUY',
                 'strength': 'STRONG',
                 'reason': 'Very positive news sentiment across multiple sources'
             })
-            if "Strong bullish" not in str(top_reasons):
-                top_reasons.append("Positive news sentiment")
-        elif sentiment_score < -0.7 and features.get('news_count', 0) > 5:
+        elif sentiment_score < -0.7 and news_count > 5:
             signals.append({
                 'type': 'SELL',
                 'strength': 'STRONG',
                 'reason': 'Very negative news sentiment across multiple sources'
             })
-            if "Strong bearish" not in str(top_reasons):
-                top_reasons.append("Negative news sentiment")
         
         return signals[:5]  # Limit to top 5 signals
     
@@ -1105,6 +1616,11 @@ class QuickModelV6:
         """
         Generate top reasons for the prediction
         """
+        news_count = features.get('news_count', 0)
+        asian_sentiment = features.get('asian_market_sentiment', 'neutral')
+        european_sentiment = features.get('european_market_sentiment', 'neutral')
+        volume_ratio = features.get('volume_ratio', 1.0)
+        rsi = features.get('rsi')
         reasons = []
         
         # Technical reasons
@@ -1118,7 +1634,6 @@ class QuickModelV6:
             reasons.append("Moderately bearish technical setup")
         
         # Sentiment reasons
-        news_count = features.get('news_count', 0)
         if sentiment_score > 0.6 and news_count > 3:
             reasons.append("Positive news sentiment and strong buying interest")
         elif sentiment_score > 0.3:
@@ -1129,26 +1644,22 @@ class QuickModelV6:
             reasons.append("Slight bearish sentiment shift")
         
         # Market context
-        asian_sentiment = features.get('asian_market_sentiment', 'neutral')
         if asian_sentiment == 'positive':
             reasons.append("Asian markets showing strength")
         elif asian_sentiment == 'negative':
             reasons.append("Asian market weakness affecting US")
         
         # European market context
-        european_sentiment = features.get('european_market_sentiment', 'neutral')
         if european_sentiment == 'positive':
             reasons.append("European markets showing strength")
         elif european_sentiment == 'negative':
             reasons.append("European market weakness affecting US")
         
         # Volume confirmation
-        volume_ratio = features.get('volume_ratio', 1.0)
         if volume_ratio > 1.5:
             reasons.append("Volume supporting price direction")
         
         # RSI condition
-        rsi = features.get('rsi')
         if rsi and rsi < 30:
             reasons.append("Oversold conditions present")
         elif rsi and rsi > 70:
@@ -1160,39 +1671,7 @@ class QuickModelV6:
         """
         Calculate local US factors impact percentage (0-10% typical range)
         """
-        # Base impact on absolute local score strength
-        if local_score > 0.5:
-            impact_pct = 6.0 + (local_score - 0.5) * 4.0  # 6-8% for strong positive
-        elif local_score > 0.3:
-            impact_pct = 4.0 + (local_score - 0.3) * 10.0  # 4-6% for moderate positive
-        elif local_score > 0:
-            impact_pct = 2.0 + local_score * 10.0  # 2-4% for weak positive
-        elif local_score < -0.5:
-            impact_pct = 6.0 + abs(local_score - (-0.5)) * 4.0  # 6-8% for strong negative
-        elif local_score < -0.3:
-            impact_pct = 4.0 + abs(local_score - (-0.3)) * 10.0  # 4-6% for moderate negative
-        elif local_score < 0:
-            impact_pct = 2.0 + abs(local_score) * 10.0  # 2-4% for weak negative
-        else:
-            impact_pct = 1.0  # 1% minimal impact for neutral
-        
-        return np.clip(impact_pct, 0, 10)
-    
-    def _sanitize_numpy_types(self, obj):
-        """
-        Recursively convert numpy types to Python native types for JSON serialization
-        """
-        if isinstance(obj, dict):
-            return {k: self._sanitize_numpy_types(v) for k, v in obj.items()}
-        elif isinstance(obj, (list, tuple)):
-            return type(obj)(self._sanitize_numpy_types(item) for item in obj)
-        elif isinstance(obj, np.integer):
-            return int(obj)
-        elif isinstance(obj, np.floating):
-            return float(obj)
-        elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        return obj
+        return _local_impact_percent(local_score)
     
     def _error_response(self, message: str) -> Dict:
         """Return error response"""
@@ -1200,21 +1679,115 @@ class QuickModelV6:
             'success': False,
             'error': message,
             'model_version': self.version,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': _timestamp(),
         }
 
 
-def main():
+# Shared instance returned by get_model()
+_model = None
+
+
+def get_model() -> 'QuickModelV6':
     """
-    CLI interface for the model - supports argparse and stdin
+    Per-process QuickModelV6 with the default configuration
+    
+    Built on first use and then reused, so repeated callers (the CLI,
+    services importing this module, tests) pay __init__ once.
     """
+    global _model
+    if _model is None:
+        _model = QuickModelV6()
+    return _model
+
+
+def _handle_request_line(model, line):
+    """Answer one line-delimited JSON request; returns the response line"""
+    try:
+        features = _loads(line)
+        if isinstance(features, list):
+            result = model.predict_many(features)
+        else:
+            result = model.predict(features)
+    except json.JSONDecodeError as e:
+        result = {'error': f'Invalid JSON: {str(e)}'}
+    except Exception as e:
+        result = {'error': f'Prediction failed: {str(e)}'}
+    return _dumps(result, indent=False) + '\n'
+
+
+def serve(model):
+    """
+    Keep a warm model and answer line-delimited JSON requests from stdin
+    
+    Each request line holds a feature object (or an array of them for batch
+    scoring) and gets exactly one JSON response line on stdout.
+    
+    Args:
+        model: QuickModelV6 instance
+    """
+    model.warm_up()
+    
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        sys.stdout.write(_handle_request_line(model, line))
+        sys.stdout.flush()
+
+
+def _cli_parser():
+    """Full argparse parser for the CLI (imported on demand)"""
+    import argparse
+    
     parser = argparse.ArgumentParser(description='Quick Model V6 - Stock Prediction')
     parser.add_argument('action', nargs='?', choices=['predict', 'train'], help='Action to perform')
     parser.add_argument('--features', type=str, help='JSON string of features for prediction')
+    parser.add_argument('--serve', action='store_true',
+                        help='Keep one model warm and answer line-delimited JSON requests on stdin')
+    parser.add_argument('--pretty', action='store_true',
+                        help='Indent the prediction JSON for reading (default: one line)')
+    return parser
+
+
+def _parse_cli_args(argv):
+    """
+    Parse the common CLI forms without argparse
+    
+    Importing argparse and building the parser costs a few milliseconds,
+    about a hundred warm predictions, on every spawned call. "predict
+    [--features JSON]", "train" and "--serve", each optionally with
+    "--pretty", are parsed here; anything else (help, errors, other
+    argument orders) returns None and goes through _cli_parser().
+    """
+    pretty = '--pretty' in argv
+    argv = [arg for arg in argv if arg != '--pretty']
+    args = SimpleNamespace(action=None, features=None, serve=False, pretty=pretty)
+    if argv == ['--serve']:
+        args.serve = True
+    elif argv in (['predict'], ['train']):
+        args.action = argv[0]
+    elif len(argv) == 3 and argv[:2] == ['predict', '--features']:
+        args.action, args.features = 'predict', argv[2]
+    elif len(argv) == 2 and argv[0] == 'predict' and argv[1].startswith('--features='):
+        args.action, args.features = 'predict', argv[1][len('--features='):]
+    else:
+        return None
+    return args
+
+
+def main():
+    """
+    CLI interface for the model - supports argparse and stdin
+    """
+    # Sentiment warnings go to stderr as "WARNING: ..." lines
+    logging.basicConfig(format='%(levelname)s: %(message)s')
     
     # Try to parse as argparse first, fallback to direct JSON for backward compatibility
     try:
-        args = parser.parse_args()
+        args = _parse_cli_args(sys.argv[1:]) or _cli_parser().parse_args()
+        
+        if args.serve:
+            serve(get_model())
+            return
         
         # If action is specified, use argparse mode
         if args.action == 'predict':
@@ -1223,7 +1796,7 @@ def main():
             # Try to get features from --features argument first
             if args.features:
                 try:
-                    features = json.loads(args.features)
+                    features = _loads(args.features)
                 except json.JSONDecodeError:
                     pass
             
@@ -1232,50 +1805,50 @@ def main():
                 try:
                     stdin_data = sys.stdin.read()
                     if stdin_data:
-                        features = json.loads(stdin_data)
+                        features = _loads(stdin_data)
                 except (json.JSONDecodeError, Exception):
                     pass
             
             # If still no features, error
             if not features:
-                print(json.dumps({'error': 'Features required for prediction (via --features or stdin)'}))
+                print(_dumps({'error': 'Features required for prediction (via --features or stdin)'}, indent=False))
                 sys.exit(1)
             
             try:
-                model = QuickModelV6()
+                model = get_model()
                 result = model.predict(features)
-                print(json.dumps(result, indent=2))
+                print(_dumps(result, indent=args.pretty))
                 sys.exit(0 if result.get('success') else 1)
             except json.JSONDecodeError as e:
-                print(json.dumps({'error': f'Invalid JSON: {str(e)}'}))
+                print(_dumps({'error': f'Invalid JSON: {str(e)}'}, indent=False))
                 sys.exit(1)
             except Exception as e:
-                print(json.dumps({'error': f'Prediction failed: {str(e)}'}))
+                print(_dumps({'error': f'Prediction failed: {str(e)}'}, indent=False))
                 sys.exit(1)
         elif args.action == 'train':
-            print(json.dumps({'error': 'Training not yet implemented'}))
+            print(_dumps({'error': 'Training not yet implemented'}, indent=False))
             sys.exit(1)
         else:
             # Fallback: treat first argument as JSON
             if len(sys.argv) > 1 and not sys.argv[1].startswith('-'):
                 try:
                     features_json = sys.argv[1]
-                    features = json.loads(features_json)
-                    model = QuickModelV6()
+                    features = _loads(features_json)
+                    model = get_model()
                     result = model.predict(features)
-                    print(json.dumps(result, indent=2))
+                    print(_dumps(result, indent=args.pretty))
                     sys.exit(0 if result.get('success') else 1)
                 except json.JSONDecodeError as e:
-                    print(json.dumps({'error': f'Invalid JSON: {str(e)}'}))
+                    print(_dumps({'error': f'Invalid JSON: {str(e)}'}, indent=False))
                     sys.exit(1)
             else:
-                parser.print_help()
+                _cli_parser().print_help()
                 sys.exit(1)
     
     except SystemExit:
         raise
     except Exception as e:
-        print(json.dumps({'error': f'Unexpected error: {str(e)}'}))
+        print(_dumps({'error': f'Unexpected error: {str(e)}'}, indent=False))
         sys.exit(1)
 
 
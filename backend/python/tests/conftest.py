@@ -0,0 +1,109 @@
+"""
+Shared fixtures for the quick model test suites
+"""
+
+import pytest
+import numpy as np
+
+
+# Feature name -> (mean, standard deviation) of its random test values
+RANDOM_NUMERIC = {
+    'rsi': (50, 25), 'macd_histogram': (0, 1), 'macd_signal_diff': (0, 1),
+    'bollinger_position': (0.5, 0.35), 'bollinger_width': (0.15, 0.1),
+    'price_change_1d': (0, 2.5), 'price_change_5d': (0, 4), 'news_sentiment_score': (0, 0.6),
+    'news_count': (10, 6), 'bullish_keyword_score_total': (5, 6), 'bearish_keyword_score_total': (5, 6),
+    'earnings_surprise_percent': (0, 10), 'social_sentiment': (0, 0.6), 'sector_sentiment': (0, 0.5),
+    'volume_ratio': (1.2, 0.6), 'revenue_growth': (5, 15), 'earnings_growth': (5, 20),
+    'pe_percentile': (50, 30), 'intraday_change_percent': (0, 2), 'macd': (0, 1.5),
+    'us_market_influence_score': (0, 0.4), 'volatility': (1.8, 1.2),
+    'asian_market_change': (0, 1.2), 'asian_market_strength': (0.3, 0.4),
+    'european_market_change': (0, 1.2), 'european_market_strength': (0.3, 0.4),
+    'futures_change': (0, 1),
+}
+RANDOM_FLAGS = (
+    'near_support', 'near_resistance', 'bounce_from_support', 'failed_resistance',
+    'has_high_impact_keywords', 'has_surge_keywords', 'has_bearish_keywords',
+)
+RANDOM_CATEGORIES = {
+    'asian_market_sentiment': ['positive', 'negative', 'neutral'],
+    'european_market_sentiment': ['positive', 'negative', 'neutral'],
+    'futures_sentiment': ['positive', 'negative', 'neutral'],
+    'us_market_sentiment': ['positive', 'negative', 'neutral'],
+    'volume_trend': ['up', 'down', 'stable'],
+    'analyst_action': ['upgrade', 'downgrade', 'none'],
+    'insider_activity': ['buying', 'selling', 'neutral'],
+}
+
+
+def _random_row(rng):
+    """Random feature dict: current_price plus a random subset of the other keys"""
+    price = float(rng.uniform(1, 500))
+    features = {'current_price': price}
+    for key, (mean, std) in RANDOM_NUMERIC.items():
+        if rng.random() < 0.7:
+            features[key] = float(rng.normal(mean, std))
+    for key in ('sma_20', 'sma_50', 'sma_200'):
+        if rng.random() < 0.7:
+            features[key] = price * float(rng.uniform(0.9, 1.1))
+    for key in RANDOM_FLAGS:
+        if rng.random() < 0.5:
+            features[key] = bool(rng.random() < 0.5)
+    for key, values in RANDOM_CATEGORIES.items():
+        if rng.random() < 0.7:
+            features[key] = str(rng.choice(values))
+    return features
+
+
+@pytest.fixture
+def random_features():
+    """
+    Seeded random feature dicts in the V5/V6 feature format
+    
+    Returns a function taking a row count (and optionally a seed) that
+    returns that many feature dicts.
+    """
+    def generate(count, seed=0):
+        rng = np.random.default_rng(seed)
+        return [_random_row(rng) for _ in range(count)]
+    return generate
+
+
+# Feature name -> (mean, standard deviation) in the V2/V4 indicator format;
+# None marks a boolean flag
+RANDOM_INDICATORS = {
+    'close': (150, 20), 'rsi_14': (50, 20), 'macd_hist': (0, 1), 'atr_14': (2, 1.5),
+    'bb_width': (6, 4), 'bb_pct': (0.7, 0.4), 'bb_middle': (150, 15),
+    'price_change_1d': (0, 2), 'price_change_3d': (0, 4), 'price_change_7d': (0, 8),
+    'news_sentiment_score': (0, 0.5), 'volume_sma_ratio': (1.3, 0.7), 'fear_greed_index': (50, 25),
+    'asian_influence_score': (0, 0.5), 'asian_avg_change': (0, 2),
+    'european_influence_score': (0, 0.5), 'volatility_multiplier': (1.2, 0.4),
+    'volume_spike': None,
+}
+
+
+def _random_indicator_row(rng):
+    """Random V2/V4 feature dict: a random subset of the keys, some values as ints"""
+    features = {}
+    for key, spec in RANDOM_INDICATORS.items():
+        if rng.random() < 0.25:
+            continue
+        if spec is None:
+            features[key] = bool(rng.random() < 0.3)
+            continue
+        value = float(rng.normal(*spec))
+        features[key] = int(round(value)) if rng.random() < 0.2 else value
+    return features
+
+
+@pytest.fixture
+def random_indicator_features():
+    """
+    Seeded random feature dicts in the V2/V4 indicator format
+    
+    Returns a function taking a row count (and optionally a seed) that
+    returns that many feature dicts.
+    """
+    def generate(count, seed=0):
+        rng = np.random.default_rng(seed)
+        return [_random_indicator_row(rng) for _ in range(count)]
+    return generate
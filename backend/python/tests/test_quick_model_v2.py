@@ -8,6 +8,10 @@ Tests Asian market influence, correction warnings, and prediction logic
 import pytest
 import sys
 import os
+import json
+import socket
+import subprocess
+import time
 from pathlib import Path
 
 # Add parent directory to path
@@ -16,16 +20,27 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from models.quick_model_v2 import QuickModelV2
 
 
+@pytest.fixture(scope="module")
+def model():
+    """One QuickModelV2 shared by every test in this module"""
+    return QuickModelV2()
+
+
+def _without_timestamps(result):
+    """Copy of a prediction dict (JSON-normalised) without its timestamp"""
+    result = json.loads(json.dumps(result))
+    result.pop('timestamp', None)
+    return result
+
+
 class TestAsianInfluence:
     """Tests for Asian market influence calculation"""
     
-    def test_strong_bearish_asian_markets_override_bullish_base(self):
+    def test_strong_bearish_asian_markets_override_bullish_base(self, model):
         """
         When Asian markets strongly bearish (avg -2%),
         final label should be BEARISH even if base model slightly bullish
         """
-        model = QuickModelV2()
-        
         features = {
             'close': 150.0,
             'rsi_14': 55,  # Neutral RSI
@@ -42,13 +57,11 @@ class TestAsianInfluence:
         assert prediction['asian_impact_percent'] > 0.3, "Asian impact should be significant"
         assert prediction['final_score'] < 0, "Final score should be negative"
     
-    def test_strong_bullish_asian_markets_override_bearish_base(self):
+    def test_strong_bullish_asian_markets_override_bearish_base(self, model):
         """
         When Asian markets strongly bullish (avg +2%),
         final label should be BULLISH even if base model slightly bearish
         """
-        model = QuickModelV2()
-        
         features = {
             'close': 150.0,
             'rsi_14': 45,  # Neutral RSI
@@ -65,12 +78,10 @@ class TestAsianInfluence:
         assert prediction['asian_impact_percent'] > 0.3, "Asian impact should be significant"
         assert prediction['final_score'] > 0, "Final score should be positive"
     
-    def test_neutral_asian_markets_low_impact(self):
+    def test_neutral_asian_markets_low_impact(self, model):
         """
         When Asian markets neutral, impact should be minimal
         """
-        model = QuickModelV2()
-        
         features = {
             'close': 150.0,
             'rsi_14': 60,
@@ -84,12 +95,10 @@ class TestAsianInfluence:
         
         assert prediction['asian_impact_percent'] < 0.1, "Impact should be minimal for neutral Asian markets"
     
-    def test_asian_impact_caps_at_50_percent(self):
+    def test_asian_impact_caps_at_50_percent(self, model):
         """
         Asian impact percentage should never exceed 50%
         """
-        model = QuickModelV2()
-        
         features = {
             'close': 150.0,
             'asian_influence_score': 1.0,  # Maximum score
@@ -106,12 +115,10 @@ class TestAsianInfluence:
 class TestCorrectionWarnings:
     """Tests for correction warning detection"""
     
-    def test_high_rsi_with_price_surge_triggers_warning(self):
+    def test_high_rsi_with_price_surge_triggers_warning(self, model):
         """
         When price up > 10% + RSI > 80, correction warning should trigger
         """
-        model = QuickModelV2()
-        
         features = {
             'close': 165.0,
             'price_change_7d': 12.5,  # Up 12.5% in 7 days
@@ -130,12 +137,10 @@ class TestCorrectionWarnings:
         assert warning['severity'] == 'HIGH', "Severity should be HIGH for RSI > 85"
         assert 'RSI' in warning['reasons'][0], "Reason should mention RSI"
     
-    def test_bollinger_zscore_extreme_triggers_warning(self):
+    def test_bollinger_zscore_extreme_triggers_warning(self, model):
         """
         When Bollinger z-score > 2.5, warning should trigger
         """
-        model = QuickModelV2()
-        
         features = {
             'close': 170.0,
             'price_change_7d': 8.0,
@@ -153,12 +158,10 @@ class TestCorrectionWarnings:
         assert warning['warning'] == True, "Warning should be triggered for high z-score"
         assert 'Bollinger' in warning['reasons'][0] or 'overbought' in warning['reasons'][0].lower()
     
-    def test_volume_spike_with_price_spike_triggers_warning(self):
+    def test_volume_spike_with_price_spike_triggers_warning(self, model):
         """
         When volume > 2x average AND price up > 10%, warning should trigger
         """
-        model = QuickModelV2()
-        
         features = {
             'close': 160.0,
             'price_change_7d': 11.0,
@@ -176,12 +179,10 @@ class TestCorrectionWarnings:
         assert warning['warning'] == True, "Warning should be triggered"
         assert 'volume' in warning['reasons'][0].lower() or 'Volume' in warning['reasons'][0]
     
-    def test_no_warning_for_normal_conditions(self):
+    def test_no_warning_for_normal_conditions(self, model):
         """
         No warning when conditions are normal
         """
-        model = QuickModelV2()
-        
         features = {
             'close': 152.0,
             'price_change_7d': 3.0,  # Small gain
@@ -197,17 +198,28 @@ class TestCorrectionWarnings:
         warning = prediction['correction_warning']
         
         assert warning['warning'] == False, "No warning should be triggered for normal conditions"
+    
+    def test_non_numeric_bollinger_inputs_are_accepted(self, model):
+        """
+        None or text in close / bb_middle / bb_width should not raise when
+        the Bollinger check does not apply
+        """
+        for feature in ('close', 'bb_middle', 'bb_width'):
+            for value in (None, 'n/a'):
+                features = {'close': 150.0, 'bb_pct': 0.5, feature: value}
+                
+                prediction = model.predict(features)
+                
+                assert prediction['correction_warning'] == {'warning': False}
 
 
 class TestPredictionLogic:
     """Tests for core prediction logic"""
     
-    def test_prediction_is_binary(self):
+    def test_prediction_is_binary(self, model):
         """
         Prediction should always be BULLISH or BEARISH, never neutral
         """
-        model = QuickModelV2()
-        
         features = {
             'close': 150.0,
             'rsi_14': 50,  # Perfectly neutral
@@ -221,12 +233,10 @@ class TestPredictionLogic:
         assert prediction['label'] in ['BULLISH', 'BEARISH'], "Label must be binary"
         assert prediction['label'] != 'NEUTRAL', "Should never predict NEUTRAL"
     
-    def test_expected_move_has_correct_sign(self):
+    def test_expected_move_has_correct_sign(self, model):
         """
         Expected % move should match the predicted direction
         """
-        model = QuickModelV2()
-        
         # Bullish scenario
         features_bullish = {
             'close': 150.0,
@@ -244,12 +254,10 @@ class TestPredictionLogic:
         else:
             assert prediction['expected_pct_move'] < 0, "Bearish prediction should have negative move"
     
-    def test_probability_in_valid_range(self):
+    def test_probability_in_valid_range(self, model):
         """
         Probability should always be between 0 and 1
         """
-        model = QuickModelV2()
-        
         features = {
             'close': 150.0,
             'rsi_14': 70,
@@ -261,12 +269,10 @@ class TestPredictionLogic:
         
         assert 0 <= prediction['probability'] <= 1, "Probability must be between 0 and 1"
     
-    def test_top_reasons_provided(self):
+    def test_top_reasons_provided(self, model):
         """
         Prediction should include top reasons
         """
-        model = QuickModelV2()
-        
         features = {
             'close': 150.0,
             'rsi_14': 85,  # Strong signal
@@ -282,17 +288,31 @@ class TestPredictionLogic:
         assert 'top_reasons' in prediction, "Should include top_reasons"
         assert len(prediction['top_reasons']) > 0, "Should have at least one reason"
         assert len(prediction['top_reasons']) <= 5, "Should have at most 5 reasons"
+    
+    def test_reasons_skipped_when_not_wanted(self, model):
+        """
+        want_reasons=False should skip reason generation but keep the scores
+        """
+        features = {
+            'close': 150.0,
+            'rsi_14': 85,
+            'asian_influence_score': 0.7,
+            'atr_14': 2.0,
+        }
+        
+        prediction = model.predict(features, want_reasons=False)
+        
+        assert prediction['top_reasons'] is None
+        assert prediction['final_score'] == model.predict(features)['final_score']
 
 
 class TestFeatureHandling:
     """Tests for feature validation and handling"""
     
-    def test_missing_features_filled_with_defaults(self):
+    def test_missing_features_filled_with_defaults(self, model):
         """
         Missing features should be filled with default values
         """
-        model = QuickModelV2()
-        
         # Minimal features
         features = {
             'close': 150.0,
@@ -304,12 +324,10 @@ class TestFeatureHandling:
         assert 'label' in prediction
         assert 'probability' in prediction
     
-    def test_feature_validation(self):
+    def test_feature_validation(self, model):
         """
         All expected features should be validated
         """
-        model = QuickModelV2()
-        
         features = {
             'close': 150.0,
             'rsi_14': 55,
@@ -325,12 +343,10 @@ class TestFeatureHandling:
 class TestExpectedMove:
     """Tests for expected percentage move calculation"""
     
-    def test_higher_score_means_bigger_move(self):
+    def test_higher_score_means_bigger_move(self, model):
         """
         Higher final score should generally lead to bigger expected move
         """
-        model = QuickModelV2()
-        
         # Low score scenario
         features_low = {
             'close': 150.0,
@@ -357,12 +373,10 @@ class TestExpectedMove:
         assert abs(pred_high['expected_pct_move']) > abs(pred_low['expected_pct_move']), \
             "Higher score should lead to bigger expected move"
     
-    def test_volatility_increases_expected_move(self):
+    def test_volatility_increases_expected_move(self, model):
         """
         Higher volatility (ATR) should increase expected move magnitude
         """
-        model = QuickModelV2()
-        
         # Low volatility
         features_low_vol = {
             'close': 150.0,
@@ -389,5 +403,420 @@ class TestExpectedMove:
             "Higher volatility should increase expected move"
 
 
+
+class TestPredictionCache:
+    """Tests for the predict() LRU cache"""
+    
+    def test_repeat_call_is_served_from_cache(self, model):
+        """
+        An equal feature dict should hit the cache; a different one should not
+        """
+        model.clear_prediction_cache()
+        features = {'close': 150.0, 'rsi_14': 60, 'asian_influence_score': 0.4}
+        
+        first = model.predict(features)
+        assert len(model._predict_cache) == 1
+        
+        second = model.predict(dict(features))
+        assert len(model._predict_cache) == 1
+        first.pop('timestamp')
+        second.pop('timestamp')
+        assert second == first
+        
+        model.predict({**features, 'rsi_14': 61})
+        model.predict(features, want_reasons=False)
+        assert len(model._predict_cache) == 3
+    
+    def test_least_recently_used_entry_is_evicted(self, model, monkeypatch):
+        """
+        The cache should stay within predict_cache_size, dropping the entry
+        used longest ago
+        """
+        monkeypatch.setattr(model, 'predict_cache_size', 2)
+        model.clear_prediction_cache()
+        
+        model.predict({'close': 1.0})
+        model.predict({'close': 2.0})
+        model.predict({'close': 1.0})  # Now the most recently used
+        model.predict({'close': 3.0})
+        
+        assert [dict(key[1:])['close'] for key in model._predict_cache] == [1.0, 3.0]
+    
+    def test_unhashable_features_are_not_cached(self, model):
+        """
+        Features holding lists should be predicted without touching the cache
+        """
+        model.clear_prediction_cache()
+        features = {'close': 150.0, 'volume_ratio': [1.0]}
+        
+        cached = model.predict(features)
+        uncached = model._predict_uncached(features)
+        cached.pop('timestamp')
+        uncached.pop('timestamp')
+        
+        assert cached == uncached
+        assert len(model._predict_cache) == 0
+    
+    def test_changing_a_result_does_not_change_the_cache(self, model):
+        """
+        Callers may modify returned results, nested values included,
+        without affecting later cache hits
+        """
+        model.clear_prediction_cache()
+        features = {'close': 165.0, 'price_change_7d': 12.5, 'rsi_14': 87, 'volume_sma_ratio': 2.5}
+        
+        first = model.predict(features)
+        expected = _without_timestamps(first)
+        first['correction_warning']['reasons'].append('changed')
+        first['correction_warning']['details']['rsi'] = 0
+        first['top_reasons'].append('changed')
+        second = model.predict(features)
+        second['correction_warning']['reasons'].append('changed')
+        
+        assert _without_timestamps(model.predict(features)) == expected
+
+
+class TestBatchPrediction:
+    """Tests for batch prediction"""
+    
+    def test_batch_matches_single_predictions(self, model):
+        """
+        predict_batch should return the same results as per-row predict
+        """
+        features_list = [
+            {'close': 150.0, 'rsi_14': 30, 'macd_hist': 1.5, 'asian_influence_score': 0.6, 'atr_14': 2.0},
+            {'close': 150.0, 'rsi_14': 55, 'asian_influence_score': -0.8, 'atr_14': 2.0, 'bb_width': 5.0},
+            {'close': 98.0, 'price_change_7d': -8.0, 'price_change_1d': 2.5, 'news_sentiment_score': 0.6},
+        ]
+        
+        batch = model.predict_batch(features_list)
+        
+        assert len(batch) == len(features_list)
+        for features, result in zip(features_list, batch):
+            single = model.predict(features)
+            assert result['label'] == single['label']
+            assert result['final_score'] == pytest.approx(single['final_score'])
+            assert result['probability'] == pytest.approx(single['probability'])
+            assert result['expected_pct_move'] == pytest.approx(single['expected_pct_move'])
+            assert result['correction_warning'] == single['correction_warning']
+    
+    def test_expected_move_rounded_like_single_predictions(self, model):
+        """
+        Batch expected moves should be rounded exactly like predict rounds
+        them, including values on a decimal tie (atr_14=10 gives 2.295)
+        """
+        base = {'close': 150.0, 'rsi_14': 30, 'macd_hist': 1.5, 'asian_influence_score': 0.6}
+        features_list = [dict(base, atr_14=atr / 100) for atr in range(1001)]
+        
+        batch = model.predict_batch(features_list)
+        
+        assert [result['expected_pct_move'] for result in batch] == [
+            model.predict(features)['expected_pct_move'] for features in features_list
+        ]
+    
+    def test_empty_batch(self, model):
+        """
+        Empty input should return an empty list
+        """
+        assert model.predict_batch([]) == []
+
+
+class TestRetraining:
+    """Tests for retraining a model in place"""
+    
+    def test_retrained_model_is_used_for_predictions(self, tmp_path):
+        """
+        After train() on a new target, predict should use the new booster,
+        both in the same instance and in a fresh instance loading the file
+        """
+        pytest.importorskip('lightgbm')
+        pytest.importorskip('sklearn')
+        import numpy as np
+        
+        model_path = str(tmp_path / 'quick_model_v2.txt')
+        rng = np.random.default_rng(0)
+        retrain_model = QuickModelV2(model_path)
+        X = rng.normal(size=(600, len(retrain_model.all_features)))
+        y = (X[:, 0] > 0).astype(int)
+        X_val = rng.normal(size=(200, len(retrain_model.all_features)))
+        y_val = (X_val[:, 0] > 0).astype(int)
+        features = {'close': 2.0}
+        
+        retrain_model.train(X, y, X_val, y_val)
+        retrain_model = QuickModelV2(model_path)  # Loaded (and compiled) from disk
+        before = retrain_model.predict(features)['probability']
+        
+        retrain_model.train(X, 1 - y, X_val, 1 - y_val)  # Inverted target
+        after = retrain_model.predict(features)['probability']
+        
+        assert (before - 0.5) * (after - 0.5) < 0, "Retrained model should flip the direction"
+        assert QuickModelV2(model_path).predict(features)['probability'] == pytest.approx(after)
+    
+    def test_json_model_path_keeps_booster_and_scaler_apart(self, tmp_path):
+        """
+        A model path ending in .json must not be overwritten by the scaler
+        statistics sidecar
+        """
+        pytest.importorskip('lightgbm')
+        pytest.importorskip('sklearn')
+        import numpy as np
+        
+        model_path = str(tmp_path / 'quick_model_v2.json')
+        rng = np.random.default_rng(0)
+        trained = QuickModelV2(model_path)
+        X = rng.normal(size=(600, len(trained.all_features)))
+        y = (X[:, 0] > 0).astype(int)
+        X_val = rng.normal(size=(200, len(trained.all_features)))
+        y_val = (X_val[:, 0] > 0).astype(int)
+        features = {'close': 2.0}
+        
+        trained.train(X, y, X_val, y_val)
+        loaded = QuickModelV2(model_path)
+        
+        assert loaded.base_model is not None
+        assert loaded.predict(features)['probability'] == pytest.approx(trained.predict(features)['probability'])
+    
+    def test_loaded_model_can_be_saved_again(self, tmp_path):
+        """
+        save_model after load_model (no fitted StandardScaler) should write
+        the same scaler statistics
+        """
+        pytest.importorskip('lightgbm')
+        pytest.importorskip('sklearn')
+        import numpy as np
+        
+        rng = np.random.default_rng(0)
+        trained = QuickModelV2(str(tmp_path / 'trained.txt'))
+        X = rng.normal(size=(600, len(trained.all_features)))
+        y = (X[:, 0] > 0).astype(int)
+        X_val = rng.normal(size=(200, len(trained.all_features)))
+        y_val = (X_val[:, 0] > 0).astype(int)
+        trained.train(X, y, X_val, y_val)
+        
+        loaded = QuickModelV2(str(tmp_path / 'trained.txt'))
+        loaded.model_path = str(tmp_path / 'copy.txt')
+        loaded.save_model()
+        copy = QuickModelV2(str(tmp_path / 'copy.txt'))
+        
+        for stats in ('mean', 'scale'):
+            assert (json.loads((tmp_path / 'copy.scaler.json').read_text())[stats] ==
+                    json.loads((tmp_path / 'trained.scaler.json').read_text())[stats])
+        features = {'close': 2.0, 'rsi_14': 40}
+        assert copy.predict(features)['probability'] == trained.predict(features)['probability']
+    
+    def test_legacy_pickle_is_loaded(self, tmp_path):
+        """
+        A quick_model_v2.pkl saved by earlier versions (fitted LGBMClassifier
+        and StandardScaler) should be loaded until a retrain writes the
+        booster text file
+        """
+        lightgbm = pytest.importorskip('lightgbm')
+        pytest.importorskip('sklearn')
+        import pickle
+        import numpy as np
+        from sklearn.preprocessing import StandardScaler
+        
+        rng = np.random.default_rng(0)
+        n_features = len(QuickModelV2(str(tmp_path / 'unused.txt')).all_features)
+        X = rng.normal(size=(600, n_features))
+        y = (X[:, 0] > 0).astype(int)
+        scaler = StandardScaler().fit(X)
+        classifier = lightgbm.LGBMClassifier(n_estimators=20, verbose=-1).fit(scaler.transform(X), y)
+        with open(tmp_path / 'quick_model_v2.pkl', 'wb') as f:
+            pickle.dump({'base_model': classifier, 'scaler': scaler, 'version': '2.0'}, f)
+        
+        for model_path in ('quick_model_v2.pkl', 'quick_model_v2.txt'):
+            legacy = QuickModelV2(str(tmp_path / model_path))
+            
+            assert legacy.base_model.model_to_string() == classifier.booster_.model_to_string()
+            assert np.array_equal(legacy._mu, scaler.mean_.astype(np.float32))
+        
+        legacy.train(X, 1 - y, X[:200], 1 - y[:200])
+        assert (tmp_path / 'quick_model_v2.txt').exists()
+        assert QuickModelV2(str(tmp_path / 'quick_model_v2.pkl')).base_model.model_to_string() == \
+            legacy.base_model.model_to_string()
+
+
+class TestKernelCompilation:
+    """Tests for the lazily compiled scoring kernels"""
+    
+    def test_one_shot_cli_predict_does_not_import_numba(self):
+        """
+        A single CLI prediction should run the kernels as plain Python
+        instead of paying for importing numba
+        """
+        models_dir = str(Path(__file__).parent.parent / 'models')
+        code = (
+            "import runpy, sys\n"
+            "sys.path.insert(0, sys.argv[1])\n"
+            "sys.argv = sys.argv[2:]\n"
+            "try:\n"
+            "    runpy.run_path(sys.argv[0], run_name='__main__')\n"
+            "finally:\n"
+            "    sys.stderr.write('numba imported: %s' % ('numba' in sys.modules))\n"
+        )
+        run = subprocess.run([sys.executable, '-c', code, models_dir,
+                              str(Path(models_dir) / 'quick_model_v2.py'),
+                              'predict', '--features', '{"close": 150.0, "rsi_14": 45}'],
+                             capture_output=True, text=True)
+        
+        assert run.returncode == 0, run.stdout + run.stderr
+        assert run.stderr.endswith('numba imported: False')
+    
+    def test_plain_python_kernels_match_compiled(self, random_indicator_features):
+        """
+        Single predictions before warm_up() (plain Python kernels) should
+        equal those after it (compiled kernels)
+        """
+        code = (
+            "import json, sys\n"
+            "sys.path.insert(0, sys.argv[1])\n"
+            "from models.quick_model_v2 import QuickModelV2\n"
+            "model = QuickModelV2()\n"
+            "rows = json.load(sys.stdin)\n"
+            "before = [model.predict(row) for row in rows]\n"
+            "model.warm_up()\n"
+            "model.clear_prediction_cache()\n"
+            "after = [model.predict(row) for row in rows]\n"
+            "json.dump([before, after], sys.stdout)\n"
+        )
+        run = subprocess.run([sys.executable, '-c', code, str(Path(__file__).parent.parent)],
+                             input=json.dumps(random_indicator_features(1000)), capture_output=True,
+                             text=True, timeout=120)
+        
+        assert run.returncode == 0, run.stderr
+        before, after = json.loads(run.stdout)
+        assert [_without_timestamps(result) for result in before] == [
+            _without_timestamps(result) for result in after
+        ]
+
+
+class TestCommandLine:
+    """Tests for the quick_model_v2.py command line"""
+    
+    def test_cli_after_import_under_package_name(self, tmp_path):
+        """
+        numba cache entries written while the module was imported under a
+        package name must not break a later CLI run of the same file (and
+        vice versa)
+        """
+        script = str(Path(__file__).parent.parent / 'models' / 'quick_model_v2.py')
+        repo_root = str(Path(__file__).resolve().parents[3])
+        env = dict(os.environ, NUMBA_CACHE_DIR=str(tmp_path / 'numba_cache'))
+        
+        importer = (
+            "import sys\n"
+            "sys.path.insert(0, sys.argv[1])\n"
+            "from backend.python.models import quick_model_v2\n"
+            "quick_model_v2.QuickModelV2().predict_batch([{'close': 150.0}] * 3)\n"
+        )
+        subprocess.run([sys.executable, '-c', importer, repo_root], env=env, check=True,
+                       capture_output=True, cwd=tmp_path)
+        
+        for features in ('{"close": 150.0}', '[{"close": 150.0}, {"close": 98.0}]'):
+            run = subprocess.run([sys.executable, script, 'predict', '--features', features],
+                                 env=env, capture_output=True, text=True, cwd=tmp_path)
+            
+            assert run.returncode == 0, run.stderr
+            result = json.loads(run.stdout)
+            assert 'label' in (result[0] if isinstance(result, list) else result)
+        
+        subprocess.run([sys.executable, '-c', importer, repo_root], env=env, check=True,
+                       capture_output=True, cwd=tmp_path)
+    
+    def test_serve_answers_one_line_per_request(self):
+        """
+        serve on stdin/stdout should answer single, batch and malformed
+        requests with one JSON line each, matching in-process predictions
+        """
+        script = str(Path(__file__).parent.parent / 'models' / 'quick_model_v2.py')
+        features = {'close': 150.0, 'rsi_14': 72, 'asian_influence_score': 0.5}
+        requests = [features, [features, {'close': 98.0}]]
+        stdin = ''.join(json.dumps(request) + '\n\n' for request in requests) + '{not json\n'
+        
+        run = subprocess.run([sys.executable, script, 'serve'], input=stdin,
+                             capture_output=True, text=True, timeout=120)
+        
+        assert run.returncode == 0, run.stderr
+        single, batch, error = [json.loads(line) for line in run.stdout.splitlines()]
+        expected = _without_timestamps(QuickModelV2().predict(features))
+        assert _without_timestamps(single) == expected
+        assert len(batch) == 2
+        assert _without_timestamps(batch[0]) == expected
+        assert error['error'].startswith('Invalid JSON')
+    
+    def test_serve_over_unix_socket(self, tmp_path):
+        """
+        serve --socket should answer requests over a UNIX socket connection
+        """
+        script = str(Path(__file__).parent.parent / 'models' / 'quick_model_v2.py')
+        socket_path = str(tmp_path / 'qm.sock')
+        server = subprocess.Popen([sys.executable, script, 'serve', '--socket', socket_path],
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        try:
+            deadline = time.monotonic() + 60
+            while not os.path.exists(socket_path):
+                assert server.poll() is None, server.stderr.read().decode()
+                assert time.monotonic() < deadline, "Server did not open its socket"
+                time.sleep(0.05)
+            
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+                conn.connect(socket_path)
+                conn.sendall(b'{"close": 150.0}\n[{"close": 150.0}, {"close": 98.0}]\n')
+                reader = conn.makefile('r')
+                single = json.loads(reader.readline())
+                batch = json.loads(reader.readline())
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+        
+        assert 'label' in single
+        assert len(batch) == 2
+        assert _without_timestamps(batch[0]) == _without_timestamps(single)
+    
+    def test_serve_refuses_to_replace_a_regular_file(self, tmp_path):
+        """
+        serve --socket should exit with an error instead of deleting a
+        path that is not a socket
+        """
+        script = str(Path(__file__).parent.parent / 'models' / 'quick_model_v2.py')
+        path = tmp_path / 'notes.txt'
+        path.write_text('keep me')
+        
+        run = subprocess.run([sys.executable, script, 'serve', '--socket', str(path)],
+                             capture_output=True, text=True, timeout=60)
+        
+        assert run.returncode == 1
+        assert 'not a socket' in json.loads(run.stdout)['error']
+        assert path.read_text() == 'keep me'
+    
+    def test_serve_replaces_a_stale_socket(self, tmp_path):
+        """
+        A socket file left behind by an earlier server should be replaced
+        """
+        script = str(Path(__file__).parent.parent / 'models' / 'quick_model_v2.py')
+        socket_path = str(tmp_path / 'qm.sock')
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+            stale.bind(socket_path)  # Closing leaves the socket file behind
+        server = subprocess.Popen([sys.executable, script, 'serve', '--socket', socket_path],
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        try:
+            deadline = time.monotonic() + 60
+            while True:
+                assert server.poll() is None, server.stderr.read().decode()
+                assert time.monotonic() < deadline, "Server did not open its socket"
+                try:
+                    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+                        conn.connect(socket_path)
+                        conn.sendall(b'{"close": 150.0}\n')
+                        assert 'label' in json.loads(conn.makefile('r').readline())
+                    break
+                except (ConnectionRefusedError, FileNotFoundError):
+                    time.sleep(0.05)
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
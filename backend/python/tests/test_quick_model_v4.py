@@ -0,0 +1,314 @@
+"""
+Test Suite for quick_model_v4
+==============================
+
+Tests batch prediction, the prediction cache, model persistence, retraining
+and the command line
+"""
+
+import pytest
+import sys
+import os
+import json
+import subprocess
+from pathlib import Path
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models.quick_model_v4 import QuickModelV4
+
+
+@pytest.fixture(scope="module")
+def model():
+    """One QuickModelV4 shared by every test in this module"""
+    return QuickModelV4()
+
+
+def _without_timestamp(result):
+    """Copy of a prediction dict (JSON-normalised) without its timestamp"""
+    result = json.loads(json.dumps(result))
+    result.pop('timestamp', None)
+    return result
+
+
+BATCH_FEATURES = [
+    {'close': 150.0, 'rsi_14': 72, 'european_influence_score': 0.6, 'price_change_1d': 3.5},
+    {'close': 98.0, 'price_change_7d': -8.0, 'price_change_1d': 2.5, 'news_sentiment_score': 0.6},
+    {'close': 120.0, 'rsi_14': 35, 'asian_influence_score': -0.7, 'bb_pct': 1.2, 'volume_spike': 2.5},
+]
+TIMESTAMP = '2026-01-02T03:04:05'
+
+
+class TestBatchPrediction:
+    """Tests for predict_batch"""
+    
+    def test_batch_matches_single_predictions(self, model):
+        """
+        predict_batch over a list of dicts should return per-row predict results
+        """
+        batch = model.predict_batch(BATCH_FEATURES, timestamp=TIMESTAMP)
+        
+        assert batch == [model._predict_uncached(features, timestamp=TIMESTAMP)
+                         for features in BATCH_FEATURES]
+    
+    def test_dataframe_matches_list_of_dicts(self, model):
+        """
+        A DataFrame should score like the equivalent dicts, with empty cells
+        treated as missing features
+        """
+        frame = pd.DataFrame.from_records(BATCH_FEATURES)
+        assert frame.isna().any().any(), "Rows should not all share the same keys"
+        
+        assert model.predict_batch(frame, timestamp=TIMESTAMP) == model.predict_batch(
+            BATCH_FEATURES, timestamp=TIMESTAMP)
+    
+    def test_batch_without_reasons(self, model):
+        """
+        want_reasons=False should only drop the reasons
+        """
+        with_reasons = model.predict_batch(BATCH_FEATURES, timestamp=TIMESTAMP)
+        without = model.predict_batch(BATCH_FEATURES, want_reasons=False, timestamp=TIMESTAMP)
+        
+        for full, lean in zip(with_reasons, without):
+            assert lean['top_reasons'] is None
+            assert lean['probability'] == full['probability']
+            assert lean['final_score'] == full['final_score']
+    
+    def test_empty_batch(self, model):
+        """
+        Empty input should return an empty list
+        """
+        assert model.predict_batch([]) == []
+        assert model.predict_batch(pd.DataFrame()) == []
+
+
+class TestPredictionCache:
+    """Tests for the predict() LRU cache"""
+    
+    def test_repeat_call_is_served_from_cache(self, model):
+        """
+        An equal feature dict should hit the cache; a different one should not
+        """
+        model.clear_prediction_cache()
+        features = {'close': 150.0, 'rsi_14': 60, 'european_influence_score': 0.4}
+        
+        first = model.predict(features)
+        assert len(model._predict_cache) == 1
+        assert model.predict(dict(features)) == first
+        assert len(model._predict_cache) == 1
+        
+        model.predict({**features, 'rsi_14': 61})
+        assert len(model._predict_cache) == 2
+    
+    def test_close_values_are_not_merged(self, model):
+        """
+        Feature values that differ only past the 6th decimal are distinct keys
+        """
+        first = model.predict({'european_influence_score': 0.3000001})
+        second = model.predict({'european_influence_score': 0.3000004})
+        
+        assert first['final_score'] != second['final_score']
+    
+    @pytest.mark.parametrize('value', [None, 'n/a', [1.0]])
+    def test_non_numeric_values_match_uncached(self, model, value):
+        """
+        Values the uncached path accepts must not break the cache lookup
+        """
+        features = {'close': 150.0, 'volume_spike': value, 'dax_change_pct': value}
+        
+        cached = model.predict(features)
+        uncached = model._predict_uncached(features)
+        cached.pop('timestamp')
+        uncached.pop('timestamp')
+        
+        assert cached == uncached
+    
+    def test_changing_a_result_does_not_change_the_cache(self, model):
+        """
+        Callers may modify returned results, nested values included,
+        without affecting later cache hits
+        """
+        model.clear_prediction_cache()
+        features = {'close': 165.0, 'rsi_14': 87, 'price_change_7d': 12.5, 'bb_pct': 1.1}
+        
+        first = model.predict(features)
+        expected = _without_timestamp(first)
+        first['correction_warning']['patterns'].append('changed')
+        first['top_reasons'].append('changed')
+        second = model.predict(features)
+        second['correction_warning']['patterns'].append('changed')
+        
+        assert _without_timestamp(model.predict(features)) == expected
+
+
+class TestPersistence:
+    """Tests for saving and loading a trained model"""
+    
+    def test_model_path_ending_in_txt_round_trips(self, tmp_path):
+        """
+        A .txt model path must not be overwritten by the booster sidecar
+        """
+        pytest.importorskip('lightgbm')
+        pytest.importorskip('sklearn')
+        import numpy as np
+        
+        model_path = str(tmp_path / 'quick_model_v4.txt')
+        rng = np.random.default_rng(0)
+        trained = QuickModelV4(model_path)
+        X = rng.normal(size=(600, len(trained.all_features)))
+        y = (X[:, 0] > 0).astype(int)
+        trained.train(X, y, X[:200], y[:200])
+        features = {'close': 2.0}
+        
+        loaded = QuickModelV4(model_path)
+        
+        assert loaded.base_model is not None, "Saved model should load back"
+        assert loaded.predict(features)['probability'] == pytest.approx(
+            trained.predict(features)['probability'])
+
+
+class TestRetraining:
+    """Tests for retraining a model in place"""
+    
+    def test_retrained_model_is_used_for_predictions(self, tmp_path):
+        """
+        After train() on a new target, predict should use the new booster,
+        both in the same instance and in a fresh instance loading the file
+        """
+        pytest.importorskip('lightgbm')
+        pytest.importorskip('sklearn')
+        import numpy as np
+        
+        model_path = str(tmp_path / 'quick_model_v4.pkl')
+        rng = np.random.default_rng(0)
+        retrain_model = QuickModelV4(model_path)
+        X = rng.normal(size=(600, len(retrain_model.all_features)))
+        y = (X[:, 0] > 0).astype(int)
+        X_val = rng.normal(size=(200, len(retrain_model.all_features)))
+        y_val = (X_val[:, 0] > 0).astype(int)
+        features = {'close': 2.0}
+        
+        retrain_model.train(X, y, X_val, y_val)
+        retrain_model = QuickModelV4(model_path)  # Loaded (and compiled) from disk
+        before = retrain_model.predict(features)['probability']
+        
+        retrain_model.train(X, 1 - y, X_val, 1 - y_val)  # Inverted target
+        after = retrain_model.predict(features)['probability']
+        
+        assert (before - 0.5) * (after - 0.5) < 0, "Retrained model should flip the direction"
+        assert QuickModelV4(model_path).predict(features)['probability'] == pytest.approx(after)
+
+
+class TestKernelCompilation:
+    """Tests for the lazily compiled scoring kernels"""
+    
+    def test_one_shot_cli_predict_does_not_import_numba(self):
+        """
+        A single CLI prediction should run the kernels as plain Python
+        instead of paying for importing numba
+        """
+        models_dir = str(Path(__file__).parent.parent / 'models')
+        code = (
+            "import runpy, sys\n"
+            "sys.path.insert(0, sys.argv[1])\n"
+            "sys.argv = sys.argv[2:]\n"
+            "try:\n"
+            "    runpy.run_path(sys.argv[0], run_name='__main__')\n"
+            "finally:\n"
+            "    sys.stderr.write('numba imported: %s' % ('numba' in sys.modules))\n"
+        )
+        run = subprocess.run([sys.executable, '-c', code, models_dir,
+                              str(Path(models_dir) / 'quick_model_v4.py'),
+                              'predict', '--features', '{"close": 150.0, "rsi_14": 45}'],
+                             capture_output=True, text=True)
+        
+        assert run.returncode == 0, run.stdout + run.stderr
+        assert run.stderr.endswith('numba imported: False')
+    
+    def test_plain_python_kernels_match_compiled(self, random_indicator_features):
+        """
+        Single predictions before warm_up() (plain Python kernels) should
+        equal those after it (compiled kernels)
+        """
+        code = (
+            "import json, sys\n"
+            "sys.path.insert(0, sys.argv[1])\n"
+            "from models.quick_model_v4 import QuickModelV4\n"
+            "model = QuickModelV4()\n"
+            "rows = json.load(sys.stdin)\n"
+            "before = [model.predict(row) for row in rows]\n"
+            "model.warm_up()\n"
+            "model.clear_prediction_cache()\n"
+            "after = [model.predict(row) for row in rows]\n"
+            "json.dump([before, after], sys.stdout)\n"
+        )
+        run = subprocess.run([sys.executable, '-c', code, str(Path(__file__).parent.parent)],
+                             input=json.dumps(random_indicator_features(1000)), capture_output=True,
+                             text=True, timeout=120)
+        
+        assert run.returncode == 0, run.stderr
+        before, after = json.loads(run.stdout)
+        assert [_without_timestamp(result) for result in before] == [
+            _without_timestamp(result) for result in after
+        ]
+
+
+class TestCommandLine:
+    """Tests for the quick_model_v4.py command line"""
+    
+    def test_cli_after_import_under_package_name(self, tmp_path):
+        """
+        numba cache entries written while the module was imported under a
+        package name must not break a later CLI run of the same file (and
+        vice versa)
+        """
+        script = str(Path(__file__).parent.parent / 'models' / 'quick_model_v4.py')
+        repo_root = str(Path(__file__).resolve().parents[3])
+        env = dict(os.environ, NUMBA_CACHE_DIR=str(tmp_path / 'numba_cache'))
+        
+        importer = (
+            "import sys\n"
+            "sys.path.insert(0, sys.argv[1])\n"
+            "from backend.python.models import quick_model_v4\n"
+            "quick_model_v4.QuickModelV4().predict_batch([{'close': 150.0}] * 3)\n"
+        )
+        subprocess.run([sys.executable, '-c', importer, repo_root], env=env, check=True,
+                       capture_output=True, cwd=tmp_path)
+        
+        for features in ('{"close": 150.0}', '[{"close": 150.0}, {"close": 98.0}]'):
+            run = subprocess.run([sys.executable, script, 'predict', '--features', features],
+                                 env=env, capture_output=True, text=True, cwd=tmp_path)
+            
+            assert run.returncode == 0, run.stderr
+            result = json.loads(run.stdout)
+            assert 'error' not in (result[0] if isinstance(result, list) else result), run.stdout
+        
+        subprocess.run([sys.executable, '-c', importer, repo_root], env=env, check=True,
+                       capture_output=True, cwd=tmp_path)
+    
+    def test_daemon_answers_one_line_per_request(self, model):
+        """
+        --daemon should answer single, batch and malformed requests with one
+        JSON line each, matching in-process predictions
+        """
+        script = str(Path(__file__).parent.parent / 'models' / 'quick_model_v4.py')
+        features = BATCH_FEATURES[0]
+        requests = [features, BATCH_FEATURES]
+        stdin = ''.join(json.dumps(request) + '\n\n' for request in requests) + '{not json\n'
+        
+        run = subprocess.run([sys.executable, script, 'predict', '--daemon'], input=stdin,
+                             capture_output=True, text=True, timeout=120)
+        
+        assert run.returncode == 0, run.stderr
+        single, batch, error = [json.loads(line) for line in run.stdout.splitlines()]
+        expected = [_without_timestamp(model.predict(features)) for features in BATCH_FEATURES]
+        assert _without_timestamp(single) == expected[0]
+        assert [_without_timestamp(result) for result in batch] == expected
+        assert error['error'].startswith('Invalid JSON')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
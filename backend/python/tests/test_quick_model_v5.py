@@ -0,0 +1,206 @@
+"""
+Test Suite for quick_model_v5
+==============================
+
+Tests batch prediction, kernel compilation and the command line
+"""
+
+import pytest
+import sys
+import os
+import json
+import subprocess
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models.quick_model_v5 import QuickModelV5
+
+
+@pytest.fixture(scope="module")
+def model():
+    """One QuickModelV5 shared by every test in this module"""
+    return QuickModelV5()
+
+
+def _without_timestamp(result):
+    """Copy of a prediction dict without its timestamp"""
+    result = dict(result)
+    result.pop('timestamp', None)
+    return result
+
+
+class TestBatchPrediction:
+    """Tests for predict_batch"""
+    
+    def test_batch_matches_single_predictions(self, model, random_features):
+        """
+        predict_batch should return exactly the per-row predict results,
+        including 3-decimal roundings of near-tie scores
+        """
+        features_list = random_features(5000)
+        
+        batch = model.predict_batch(features_list)
+        
+        assert len(batch) == len(features_list)
+        mismatched = [
+            i for i, (features, result) in enumerate(zip(features_list, batch))
+            if _without_timestamp(result) != _without_timestamp(model.predict(features))
+        ]
+        assert mismatched == []
+    
+    def test_near_tie_composite_rounds_like_predict(self, model):
+        """
+        A row whose weighted composite lands next to a 3-decimal rounding
+        boundary should round the same way in batch and single predictions
+        """
+        features = {
+            'current_price': 325.255367639604, 'macd_histogram': -1.9874023816345188,
+            'bollinger_position': 0.2816176778772822, 'price_change_1d': -1.5968589144645264,
+            'news_count': 9.84807811552572, 'volume_ratio': 1.656776909167296,
+            'volatility': 2.7609241366953268, 'sma_50': 350.99815427113975,
+            'near_resistance': False, 'has_surge_keywords': True,
+            'futures_sentiment': 'negative', 'insider_activity': 'buying',
+        }
+        
+        batch = model.predict_batch([features])
+        
+        assert _without_timestamp(batch[0]) == _without_timestamp(model.predict(features))
+    
+    def test_unusual_rows_match_single_predictions(self, model):
+        """
+        Invalid prices, None indicators and non-numeric values should be
+        handled like predict handles them
+        """
+        features_list = [
+            {'current_price': 150.0, 'rsi': 28, 'news_sentiment_score': 0.7},
+            {'current_price': 0},
+            {'current_price': 150.0, 'rsi': None, 'sma_20': None},
+            {'current_price': 150.0, 'news_count': '12'},
+            {'current_price': 150.0, 'volume_ratio': np.float64(2.5), 'news_count': np.int64(4)},
+        ]
+        
+        batch = model.predict_batch(features_list)
+        
+        assert [_without_timestamp(result) for result in batch] == [
+            _without_timestamp(model.predict(features)) for features in features_list
+        ]
+    
+    def test_empty_batch(self, model):
+        """
+        Empty input should return an empty list
+        """
+        assert model.predict_batch([]) == []
+
+
+class TestKernelCompilation:
+    """Tests for the lazily compiled scoring kernels"""
+    
+    def test_one_shot_cli_predict_does_not_import_numba(self):
+        """
+        A single CLI prediction should run the kernels as plain Python
+        instead of paying for importing numba
+        """
+        models_dir = str(Path(__file__).parent.parent / 'models')
+        code = (
+            "import runpy, sys\n"
+            "sys.path.insert(0, sys.argv[1])\n"
+            "sys.argv = sys.argv[2:]\n"
+            "try:\n"
+            "    runpy.run_path(sys.argv[0], run_name='__main__')\n"
+            "finally:\n"
+            "    sys.stderr.write('numba imported: %s' % ('numba' in sys.modules))\n"
+        )
+        run = subprocess.run([sys.executable, '-c', code, models_dir,
+                              str(Path(models_dir) / 'quick_model_v5.py'),
+                              'predict', '--features', '{"current_price": 150.0, "rsi": 45}'],
+                             capture_output=True, text=True)
+        
+        assert run.returncode == 0, run.stdout + run.stderr
+        assert run.stderr.endswith('numba imported: False')
+    
+    def test_plain_python_kernels_match_compiled(self, random_features):
+        """
+        Single predictions before warm_up() (plain Python kernels) should
+        equal those after it (compiled kernels)
+        """
+        code = (
+            "import json, sys\n"
+            "sys.path.insert(0, sys.argv[1])\n"
+            "from models.quick_model_v5 import QuickModelV5\n"
+            "model = QuickModelV5()\n"
+            "rows = json.load(sys.stdin)\n"
+            "before = [model.predict(row) for row in rows]\n"
+            "model.warm_up()\n"
+            "after = [model.predict(row) for row in rows]\n"
+            "json.dump([before, after], sys.stdout)\n"
+        )
+        run = subprocess.run([sys.executable, '-c', code, str(Path(__file__).parent.parent)],
+                             input=json.dumps(random_features(1000)), capture_output=True,
+                             text=True, timeout=120)
+        
+        assert run.returncode == 0, run.stderr
+        before, after = json.loads(run.stdout)
+        assert [_without_timestamp(result) for result in before] == [
+            _without_timestamp(result) for result in after
+        ]
+
+
+class TestCommandLine:
+    """Tests for the quick_model_v5.py command line"""
+    
+    def test_cli_after_import_under_package_name(self, tmp_path):
+        """
+        numba cache entries written while the module was imported under a
+        package name must not break a later CLI run of the same file (and
+        vice versa)
+        """
+        script = str(Path(__file__).parent.parent / 'models' / 'quick_model_v5.py')
+        repo_root = str(Path(__file__).resolve().parents[3])
+        env = dict(os.environ, NUMBA_CACHE_DIR=str(tmp_path / 'numba_cache'))
+        
+        importer = (
+            "import sys\n"
+            "sys.path.insert(0, sys.argv[1])\n"
+            "from backend.python.models import quick_model_v5\n"
+            "quick_model_v5.QuickModelV5().predict_batch([{'current_price': 150.0}] * 3)\n"
+        )
+        subprocess.run([sys.executable, '-c', importer, repo_root], env=env, check=True,
+                       capture_output=True, cwd=tmp_path)
+        
+        run = subprocess.run([sys.executable, script, 'predict', '--features', '{"current_price": 150.0}'],
+                             env=env, capture_output=True, text=True, cwd=tmp_path)
+        
+        assert run.returncode == 0, run.stdout + run.stderr
+        assert json.loads(run.stdout)['success'] is True
+        
+        subprocess.run([sys.executable, '-c', importer, repo_root], env=env, check=True,
+                       capture_output=True, cwd=tmp_path)
+    
+    def test_server_answers_one_line_per_request(self, model):
+        """
+        --server should answer single, batch and malformed requests with one
+        JSON line each, matching in-process predictions
+        """
+        script = str(Path(__file__).parent.parent / 'models' / 'quick_model_v5.py')
+        features_list = [{'current_price': 150.0, 'rsi': 28, 'news_sentiment_score': 0.7},
+                         {'current_price': 98.0, 'asian_market_sentiment': 'negative'}]
+        requests = [features_list[0], features_list]
+        stdin = ''.join(json.dumps(request) + '\n\n' for request in requests) + '{not json\n'
+        
+        run = subprocess.run([sys.executable, script, '--server'], input=stdin,
+                             capture_output=True, text=True, timeout=120)
+        
+        assert run.returncode == 0, run.stderr
+        single, batch, error = [json.loads(line) for line in run.stdout.splitlines()]
+        expected = [_without_timestamp(model.predict(features)) for features in features_list]
+        assert _without_timestamp(single) == expected[0]
+        assert [_without_timestamp(result) for result in batch] == expected
+        assert error['error'].startswith('Invalid JSON')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
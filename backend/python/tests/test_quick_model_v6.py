@@ -0,0 +1,243 @@
+"""
+Test Suite for quick_model_v6
+==============================
+
+Tests batch prediction, the prediction cache, kernel compilation and the
+command line
+"""
+
+import pytest
+import sys
+import os
+import json
+import subprocess
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models.quick_model_v6 import QuickModelV6
+
+
+@pytest.fixture(scope="module")
+def model():
+    """One QuickModelV6 shared by every test in this module"""
+    return QuickModelV6()
+
+
+TIMESTAMP = '2026-01-02T03:04:05'
+
+
+def _without_timestamp(result):
+    """Copy of a prediction dict (JSON-normalised) without its timestamp"""
+    result = json.loads(json.dumps(result))
+    result.pop('timestamp', None)
+    return result
+
+
+class TestBatchPrediction:
+    """Tests for predict_many"""
+    
+    def test_batch_matches_single_predictions(self, model, random_features):
+        """
+        predict_many should return exactly the per-row predict results
+        """
+        features_list = random_features(2000)
+        
+        batch = model.predict_many(features_list, timestamp=TIMESTAMP)
+        
+        assert len(batch) == len(features_list)
+        mismatched = [
+            i for i, (features, result) in enumerate(zip(features_list, batch))
+            if result != model._predict_uncached(features, TIMESTAMP)
+        ]
+        assert mismatched == []
+    
+    def test_unusual_rows_match_single_predictions(self, model):
+        """
+        Invalid prices, None indicators and non-numeric values should be
+        handled like predict handles them
+        """
+        features_list = [
+            {'current_price': 150.0, 'rsi': 28, 'news_sentiment_score': 0.7},
+            {'current_price': 0},
+            {'current_price': 150.0, 'rsi': None, 'sma_20': None, 'volume_ratio': None},
+            {'current_price': 150.0, 'news_count': '12'},
+            {'current_price': 150.0, 'volume_ratio': np.float64(2.5), 'news_count': np.int64(4)},
+        ]
+        
+        batch = model.predict_many(features_list, timestamp=TIMESTAMP)
+        
+        assert batch == [model._predict_uncached(features, TIMESTAMP) for features in features_list]
+    
+    def test_empty_batch(self, model):
+        """
+        Empty input should return an empty list
+        """
+        assert model.predict_many([]) == []
+
+
+class TestPredictionCache:
+    """Tests for the predict() LRU cache"""
+    
+    def test_repeat_call_is_served_from_cache(self, model):
+        """
+        An equal feature dict should hit the cache; a different one should not
+        """
+        model.clear_prediction_cache()
+        features = {'current_price': 150.0, 'rsi': 60, 'news_sentiment_score': 0.4}
+        
+        first = model.predict(features, timestamp=TIMESTAMP)
+        assert len(model._predict_cache) == 1
+        assert model.predict(dict(features), timestamp=TIMESTAMP) == first
+        assert len(model._predict_cache) == 1
+        
+        model.predict({**features, 'rsi': 61})
+        assert len(model._predict_cache) == 2
+    
+    def test_cache_hit_gets_a_fresh_timestamp(self, model):
+        """
+        A cached result should be stamped with the timestamp of the new call
+        """
+        features = {'current_price': 150.0, 'rsi': 45}
+        model.predict(features, timestamp=TIMESTAMP)
+        
+        assert model.predict(features, timestamp='2026-05-06T07:08:09')['timestamp'] == '2026-05-06T07:08:09'
+    
+    def test_least_recently_used_entry_is_evicted(self, model, monkeypatch):
+        """
+        The cache should stay within predict_cache_size, dropping the entry
+        used longest ago
+        """
+        monkeypatch.setattr(model, 'predict_cache_size', 2)
+        model.clear_prediction_cache()
+        
+        model.predict({'current_price': 1.0})
+        model.predict({'current_price': 2.0})
+        model.predict({'current_price': 1.0})  # Now the most recently used
+        model.predict({'current_price': 3.0})
+        
+        assert [dict(key)['current_price'] for key in model._predict_cache] == [1.0, 3.0]
+    
+    def test_unhashable_features_are_not_cached(self, model):
+        """
+        Features holding lists should be predicted without touching the cache
+        """
+        model.clear_prediction_cache()
+        features = {'current_price': 150.0, 'headlines': ['beat', 'upgrade']}
+        
+        assert model.predict(features, timestamp=TIMESTAMP) == model._predict_uncached(features, TIMESTAMP)
+        assert len(model._predict_cache) == 0
+
+
+class TestKernelCompilation:
+    """Tests for the lazily compiled scoring kernels"""
+    
+    def test_one_shot_cli_predict_does_not_import_numba(self):
+        """
+        A single CLI prediction should run the kernels as plain Python
+        instead of paying for importing numba
+        """
+        models_dir = str(Path(__file__).parent.parent / 'models')
+        code = (
+            "import runpy, sys\n"
+            "sys.path.insert(0, sys.argv[1])\n"
+            "sys.argv = sys.argv[2:]\n"
+            "try:\n"
+            "    runpy.run_path(sys.argv[0], run_name='__main__')\n"
+            "finally:\n"
+            "    sys.stderr.write('numba imported: %s' % ('numba' in sys.modules))\n"
+        )
+        run = subprocess.run([sys.executable, '-c', code, models_dir,
+                              str(Path(models_dir) / 'quick_model_v6.py'),
+                              'predict', '--features', '{"current_price": 150.0, "rsi": 45}'],
+                             capture_output=True, text=True)
+        
+        assert run.returncode == 0, run.stdout + run.stderr
+        assert run.stderr.endswith('numba imported: False')
+    
+    def test_plain_python_kernels_match_compiled(self, random_features):
+        """
+        Single predictions before warm_up() (plain Python kernels) should
+        equal those after it (compiled kernels)
+        """
+        code = (
+            "import json, sys\n"
+            "sys.path.insert(0, sys.argv[1])\n"
+            "from models.quick_model_v6 import QuickModelV6\n"
+            "model = QuickModelV6()\n"
+            "rows = json.load(sys.stdin)\n"
+            "before = [model.predict(row) for row in rows]\n"
+            "model.warm_up()\n"
+            "model.clear_prediction_cache()\n"
+            "after = [model.predict(row) for row in rows]\n"
+            "json.dump([before, after], sys.stdout)\n"
+        )
+        run = subprocess.run([sys.executable, '-c', code, str(Path(__file__).parent.parent)],
+                             input=json.dumps(random_features(1000)), capture_output=True,
+                             text=True, timeout=120)
+        
+        assert run.returncode == 0, run.stderr
+        before, after = json.loads(run.stdout)
+        assert [_without_timestamp(result) for result in before] == [
+            _without_timestamp(result) for result in after
+        ]
+
+
+class TestCommandLine:
+    """Tests for the quick_model_v6.py command line"""
+    
+    def test_cli_after_import_under_package_name(self, tmp_path):
+        """
+        numba cache entries written while the module was imported under a
+        package name must not break a later CLI run of the same file (and
+        vice versa)
+        """
+        script = str(Path(__file__).parent.parent / 'models' / 'quick_model_v6.py')
+        repo_root = str(Path(__file__).resolve().parents[3])
+        env = dict(os.environ, NUMBA_CACHE_DIR=str(tmp_path / 'numba_cache'))
+        
+        importer = (
+            "import sys\n"
+            "sys.path.insert(0, sys.argv[1])\n"
+            "from backend.python.models import quick_model_v6\n"
+            "quick_model_v6.QuickModelV6().predict_many([{'current_price': 150.0}] * 3)\n"
+        )
+        subprocess.run([sys.executable, '-c', importer, repo_root], env=env, check=True,
+                       capture_output=True, cwd=tmp_path)
+        
+        run = subprocess.run([sys.executable, script, 'predict', '--features', '{"current_price": 150.0}'],
+                             env=env, capture_output=True, text=True, cwd=tmp_path)
+        
+        assert run.returncode == 0, run.stdout + run.stderr
+        assert json.loads(run.stdout)['success'] is True
+        
+        subprocess.run([sys.executable, '-c', importer, repo_root], env=env, check=True,
+                       capture_output=True, cwd=tmp_path)
+    
+    def test_serve_answers_one_line_per_request(self, model):
+        """
+        --serve should answer single, batch and malformed requests with one
+        JSON line each, matching in-process predictions
+        """
+        script = str(Path(__file__).parent.parent / 'models' / 'quick_model_v6.py')
+        features_list = [{'current_price': 150.0, 'rsi': 28, 'news_sentiment_score': 0.7},
+                         {'current_price': 98.0, 'asian_market_sentiment': 'negative'}]
+        requests = [features_list[0], features_list]
+        stdin = ''.join(json.dumps(request) + '\n\n' for request in requests) + '{not json\n'
+        
+        run = subprocess.run([sys.executable, script, '--serve'], input=stdin,
+                             capture_output=True, text=True, timeout=120)
+        
+        assert run.returncode == 0, run.stderr
+        single, batch, error = [json.loads(line) for line in run.stdout.splitlines()]
+        expected = [_without_timestamp(model.predict(features)) for features in features_list]
+        assert _without_timestamp(single) == expected[0]
+        assert [_without_timestamp(result) for result in batch] == expected
+        assert error['error'].startswith('Invalid JSON')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])